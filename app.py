@@ -24,12 +24,14 @@ import pandas as pd
 import numpy as np
 import plotly.graph_objects as go
 from plotly.subplots import make_subplots
-from typing import Dict, Tuple, List, Optional, Any
+from typing import Dict, Tuple, List, Optional, Any, Sequence
 import inspect
 from datetime import datetime
 import warnings
+import hashlib
 import json
-import re
+import math
+from functools import lru_cache
 
 # Black-box import from domain layer
 from src.calculator import (
@@ -51,6 +53,9 @@ from src.simulation_models import (
     backtest_rolling_windows,
     load_historical_annual_returns,
     load_historical_annual_series,
+    normal_return_matrix,
+    simulate_nominal_paths,
+    summarize_simulation_paths,
 )
 from src.real_estate_model import compute_effective_housing_and_rental_flows
 from src.retirement_models import (
@@ -62,8 +67,15 @@ from src.retirement_models import (
     build_decumulation_table_two_phase_net_withdrawal as build_decumulation_table_two_phase_net_withdrawal_core,
     DECUM_BACKTEST_WINDOW_TEMPLATES,
     DECUM_BACKTEST_PERCENTILES,
+    DECUM_TRAMO_LABELS,
     build_template_window_indices,
     build_manual_window_indices,
+    build_inflation_factors,
+    build_padded_schedule,
+    build_property_sale_column,
+    build_decumulation_frame,
+    simulate_capital_paths,
+    simulate_two_stage_columns,
 )
 from src.profile_io import (
     serialize_profile,
@@ -115,6 +127,207 @@ WEB_PROFILES = {
     "UCITS Tax Efficient": {"gastos_anuales": 45_000, "rentabilidad_esperada": 0.06, "inflacion": 0.02, "safe_withdrawal_rate": 0.04},
     "Spain FIT": {"gastos_anuales": 40_000, "rentabilidad_esperada": 0.065, "inflacion": 0.02, "safe_withdrawal_rate": 0.04},
 }
+# Widget defaults when no FIRE profile template applies (read-only, shared across reruns).
+CUSTOM_PROFILE_DEFAULTS = {"gastos_anuales": 30_000, "rentabilidad_esperada": 0.07, "inflacion": 0.025, "safe_withdrawal_rate": 0.04}
+
+AB_PRETTY_NAMES = {
+    "gastos_anuales": "Gasto anual objetivo",
+    "safe_withdrawal_rate": "SWR",
+    "patrimonio_actual": "Patrimonio actual",
+    "aportacion_mensual": "Aportación mensual",
+    "edad_actual": "Edad actual",
+    "edad_objetivo": "Edad objetivo",
+    "inflacion_anual": "Inflación",
+    "rentabilidad_anual": "Rentabilidad esperada",
+    "volatilidad_anual": "Volatilidad",
+    "region": "CCAA fiscal",
+    "tax_year": "Año fiscal",
+    "fiscal_mode": "Modo fiscal",
+    "taxable_withdrawal_ratio": "Retirada sujeta a impuesto",
+}
+
+AB_IMPACT_GROUPS = {
+    "objetivo": frozenset({
+        "gastos_anuales",
+        "safe_withdrawal_rate",
+        "taxable_withdrawal_ratio",
+        "coste_pre_pension_anual",
+    }),
+    "acumulacion": frozenset({
+        "patrimonio_actual",
+        "aportacion_mensual",
+        "edad_actual",
+        "edad_objetivo",
+        "rentabilidad_anual",
+        "volatilidad_anual",
+        "inflacion_anual",
+        "has_propiedad_principal",
+        "valor_vivienda_principal",
+        "deuda_vivienda_principal",
+        "cuota_hipoteca_vivienda",
+        "meses_hipoteca_vivienda_restantes",
+        "valor_inmuebles_invertibles",
+        "deuda_inmuebles_invertibles",
+        "cuota_hipoteca_inmuebles",
+        "meses_hipoteca_inmuebles_restantes",
+        "renta_bruta_alquiler_anual",
+    }),
+    "fiscal": frozenset({
+        "fiscal_mode",
+        "region",
+        "tax_year",
+        "retirement_tax_regime",
+        "taxable_withdrawal_ratio",
+        "intl_tax_rate_gains",
+        "intl_tax_rate_dividends",
+        "intl_tax_rate_interest",
+        "intl_tax_rate_wealth",
+    }),
+}
+
+AB_IMPACT_ALL_KNOWN = (
+    AB_IMPACT_GROUPS["objetivo"] | AB_IMPACT_GROUPS["acumulacion"] | AB_IMPACT_GROUPS["fiscal"]
+)
+
+# Decumulation table columns formatted as whole euros / with cents.
+DECUM_EUR_COLUMNS = frozenset({
+    "Capital inicial (€)",
+    "Retirada anual (€)",
+    "Crecimiento neto (€)",
+    "Capital final (€)",
+    "Necesidad base cartera (€)",
+    "Ingreso no cartera implícito (€)",
+    "Ingreso alquileres (€)",
+    "Ingreso pensión pública (€)",
+    "Ingreso plan privado (€)",
+    "Otras rentas (€)",
+    "Ingresos totales (€)",
+    "Coste extra pre-pensión (€)",
+    "Ajuste venta/alquiler (€)",
+    "Venta inmueble (€)",
+    "Cuota hipoteca pendiente (€)",
+})
+DECUM_EUR_CENTS_COLUMNS = frozenset({
+    "Chequeo flujo (€)",
+    "Chequeo retirada (€)",
+    "Déficit no cubierto (€)",
+})
+
+# Main Monte Carlo runs stop sampling early once success rate and final P5/P50/P95
+# are known within this tolerance (percentage points / percent); 10k paths stays the cap.
+MC_CONVERGENCE_TOLERANCE = 1.0
+
+# Per-path matrices in Monte Carlo results that the UI never reads; dropped before caching.
+MC_RAW_PATH_KEYS = frozenset({
+    "paths",
+    "real_paths",
+    "final_values",
+    "final_values_real",
+    "path_geom_returns",
+})
+
+# Profile JSON keys -> sidebar widget keys; ratios in PROFILE_PERCENT_KEYS are shown as percentages.
+PROFILE_WIDGET_KEYS = {
+    "modo_guiado": "modo_guiado_key",
+    "setup_mode": "setup_mode_key",
+    "profile_name": "profile_name_key",
+    "apply_profile_defaults": "apply_profile_defaults_key",
+    "gastos_anuales": "gastos_anuales_key",
+    "safe_withdrawal_rate": "safe_withdrawal_rate_key",
+    "edad_actual": "edad_actual_key",
+    "edad_objetivo": "edad_objetivo_key",
+    "vivienda_habitual_valor": "vivienda_habitual_valor_key",
+    "vivienda_habitual_hipoteca": "vivienda_habitual_hipoteca_key",
+    "incluir_cuota_vivienda_en_simulacion": "incluir_cuota_vivienda_en_simulacion_key",
+    "aplicar_ajuste_vivienda_habitual": "aplicar_ajuste_vivienda_habitual_key",
+    "ahorro_vivienda_habitual_anual": "ahorro_vivienda_habitual_anual_key",
+    "inmuebles_invertibles_valor": "inmuebles_invertibles_valor_key",
+    "inmuebles_invertibles_hipoteca": "inmuebles_invertibles_hipoteca_key",
+    "incluir_cuota_inmuebles_en_simulacion": "incluir_cuota_inmuebles_en_simulacion_key",
+    "otras_deudas": "otras_deudas_key",
+    "usar_capital_invertible_ampliado": "usar_capital_invertible_ampliado_key",
+    "renta_bruta_alquiler_anual": "renta_bruta_alquiler_anual_key",
+    "usar_modelo_avanzado_alquiler": "usar_modelo_avanzado_alquiler_key",
+    "alquiler_costes_vacancia_pct": "alquiler_costes_vacancia_pct_key",
+    "alquiler_irpf_efectivo_pct": "alquiler_irpf_efectivo_pct_key",
+    "incluir_rentas_alquiler_en_simulacion": "incluir_rentas_alquiler_en_simulacion_key",
+    "property_sale_enabled": "property_sale_enabled_key",
+    "property_sale_phase": "property_sale_phase_key",
+    "property_sale_year_accumulation": "property_sale_year_accumulation_key",
+    "property_sale_year_retirement": "property_sale_year_retirement_key",
+    "property_sale_amount": "property_sale_amount_key",
+    "property_sale_tax_calc_mode": "property_sale_tax_calc_mode_key",
+    "property_sale_capital_gain_pct": "property_sale_capital_gain_pct_key",
+    "property_sale_rent_drop_pct": "property_sale_rent_drop_pct_key",
+    "property_sale_remove_home_savings": "property_sale_remove_home_savings_key",
+    "property_sale_purchase_year": "property_sale_purchase_year_key",
+    "property_sale_purchase_price": "property_sale_purchase_price_key",
+    "property_sale_purchase_costs": "property_sale_purchase_costs_key",
+    "property_sale_improvement_costs": "property_sale_improvement_costs_key",
+    "property_sale_selling_costs": "property_sale_selling_costs_key",
+    "include_pension_in_simulation": "include_pension_in_simulation_key",
+    "two_stage_retirement_model": "two_stage_retirement_model_key",
+    "two_phase_switch_age": "two_phase_switch_age_key",
+    "two_phase_withdrawal_stage1_net_annual": "two_phase_withdrawal_stage1_net_annual_key",
+    "two_phase_withdrawal_stage2_net_annual": "two_phase_withdrawal_stage2_net_annual_key",
+    "two_phase_post_pension_income_annual": "two_phase_post_pension_income_annual_key",
+    "edad_pension_oficial": "edad_pension_oficial_key",
+    "edad_inicio_pension_publica": "edad_inicio_pension_publica_key",
+    "bonificacion_demora_pct": "bonificacion_demora_pct_key",
+    "pension_publica_neta_anual": "pension_publica_neta_anual_key",
+    "edad_inicio_plan_privado": "edad_inicio_plan_privado_key",
+    "duracion_plan_privado_anos": "duracion_plan_privado_anos_key",
+    "plan_pensiones_privado_neto_anual": "plan_pensiones_privado_neto_anual_key",
+    "otras_rentas_post_jubilacion_netas": "otras_rentas_post_jubilacion_netas_key",
+    "coste_pre_pension_anual": "coste_pre_pension_anual_key",
+    "rentabilidad_esperada": "rentabilidad_esperada_key",
+    "volatilidad": "volatilidad_key",
+    "inflacion": "inflacion_key",
+    "inflacionar_aportacion": "inflacionar_aportacion_key",
+    "fiscal_priority": "fiscal_priority_key",
+    "regimen_fiscal": "regimen_fiscal_key",
+    "include_optimización": "include_optimizacion_key",
+    "taxable_withdrawal_ratio_mode": "taxable_withdrawal_ratio_mode_key",
+    "taxable_withdrawal_ratio": "taxable_withdrawal_ratio_key",
+    "tax_year": "tax_year_key",
+}
+PROFILE_PERCENT_KEYS = frozenset({
+    "safe_withdrawal_rate",
+    "rentabilidad_esperada",
+    "volatilidad",
+    "inflacion",
+    "bonificacion_demora_pct",
+    "taxable_withdrawal_ratio",
+    "property_sale_capital_gain_pct",
+    "property_sale_rent_drop_pct",
+})
+# Sidebar selectbox labels per fiscal / retirement mode (option order = display order).
+FISCAL_MODE_LABELS = {
+    FISCAL_MODE_ES_TAXPACK: "España (Tax Pack)",
+    FISCAL_MODE_INTL_BASIC: "Internacional básico",
+}
+FISCAL_MODE_BY_LABEL = {label: mode for mode, label in FISCAL_MODE_LABELS.items()}
+RETIREMENT_MODE_LABELS = {
+    "SIMPLE_TWO_PHASE": "Simple (recomendado)",
+    "ADVANCED_INCOME_BREAKDOWN": "Avanzado (desglose de ingresos)",
+}
+RETIREMENT_MODE_BY_LABEL = {label: mode for mode, label in RETIREMENT_MODE_LABELS.items()}
+# Two-phase autosync trackers, reset whenever a profile is loaded or cleared.
+TWO_PHASE_SYNC_STATE_KEYS = (
+    "two_phase_switch_age_last_suggested_key",
+    "two_phase_stage1_last_suggested_key",
+    "two_phase_post_income_last_suggested_key",
+    "two_phase_switch_age_manual_override_key",
+    "two_phase_stage1_manual_override_key",
+    "two_phase_post_income_manual_override_key",
+)
+# Amount fields restored as (config key, exact-mode config key, widget state prefix).
+PROFILE_EXACT_AMOUNT_KEYS = (
+    ("patrimonio_inicial", "patrimonio_exact_mode", "patrimonio"),
+    ("aportacion_mensual", "aportacion_exact_mode", "aportacion"),
+    ("cuota_hipoteca_vivienda_mensual", "cuota_hipoteca_vivienda_mensual_exact_mode", "primary_mortgage_payment"),
+    ("cuota_hipoteca_inmuebles_mensual", "cuota_hipoteca_inmuebles_mensual_exact_mode", "investment_mortgage_payment"),
+)
 
 # =====================================================================
 # 1. PAGE SETUP & INITIALIZATION
@@ -336,19 +549,55 @@ if "initial_load" not in st.session_state:
     st.session_state.cached_results = None
 
 
+@lru_cache(maxsize=4096)
+def _fmt_num_es_cached(number: float, sign: float, decimals: int, signed: bool) -> str:
+    # `sign` is only part of the key: 0.0 and -0.0 hash alike but format differently.
+    pattern = f"{number:+,.{decimals}f}" if signed else f"{number:,.{decimals}f}"
+    return pattern.replace(",", "_").replace(".", ",").replace("_", ".")
+
+
+@lru_cache(maxsize=4096)
+def _fmt_eur_cached(number: float, sign: float, decimals: int, signed: bool) -> str:
+    return f"€{_fmt_num_es_cached(number, sign, decimals, signed)}"
+
+
 def fmt_num_es(value: Any, decimals: int = 0, signed: bool = False) -> str:
     """Format number using Spanish separators: 1.234.567,89."""
     try:
         number = float(value)
     except (TypeError, ValueError):
         return str(value)
-    pattern = f"{number:+,.{decimals}f}" if signed else f"{number:,.{decimals}f}"
-    return pattern.replace(",", "_").replace(".", ",").replace("_", ".")
+    return _fmt_num_es_cached(number, math.copysign(1.0, number), decimals, signed)
 
 
 def fmt_eur(value: Any, decimals: int = 0, signed: bool = False) -> str:
     """Format currency using Spanish separators."""
-    return f"€{fmt_num_es(value, decimals=decimals, signed=signed)}"
+    try:
+        number = float(value)
+    except (TypeError, ValueError):
+        return f"€{value}"
+    return _fmt_eur_cached(number, math.copysign(1.0, number), decimals, signed)
+
+
+def fmt_eur_cents(value: Any) -> str:
+    """Format currency with two decimals; a plain callable for Styler format maps."""
+    return fmt_eur(value, 2)
+
+
+def fmt_param_value(value: Any) -> str:
+    """Format a raw profile config value for the A/B change list."""
+    if isinstance(value, bool):
+        return "Sí" if value else "No"
+    if isinstance(value, (int, float)):
+        abs_value = abs(float(value))
+        if abs_value >= 1000:
+            return fmt_num_es(value, 0)
+        if abs_value >= 1:
+            return fmt_num_es(value, 2)
+        return fmt_num_es(value, 4)
+    if value is None:
+        return "n/d"
+    return str(value)
 
 
 def render_print_friendly_table(df: pd.DataFrame, table_title: str = "") -> None:
@@ -383,6 +632,21 @@ def render_plotly_chart(fig, key: Optional[str] = None) -> None:
     else:
         st.plotly_chart(fig, use_container_width=True, config={"responsive": True}, key=key)
 
+
+def streamlit_fragment(func):
+    """Run `func` as a Streamlit fragment when supported (reruns only on its own widgets)."""
+    fragment = getattr(st, "fragment", None) or getattr(st, "experimental_fragment", None)
+    return fragment(func) if fragment is not None else func
+
+
+def rerun_app() -> None:
+    """Rerun the whole app, also when called from inside a fragment."""
+    if "scope" in inspect.signature(st.rerun).parameters:
+        st.rerun(scope="app")
+    else:
+        st.rerun()
+
+
 # =====================================================================
 # 2. VALIDATION & ERROR HANDLING
 # =====================================================================
@@ -932,7 +1196,7 @@ def render_final_narrative_summary(simulation_results: Dict, params: Dict) -> No
 
 def build_ab_summary(simulation_results: Dict, params: Dict, model_label: str) -> Dict[str, Any]:
     """Build a compact, comparable snapshot for A/B comparison."""
-    fire_target = float(get_display_fire_target(simulation_results, params))
+    fire_target = get_display_fire_target(simulation_results, params)
     years_horizon = int(params["edad_objetivo"] - params["edad_actual"])
     years_to_fire = find_years_to_fire(simulation_results["real_percentile_50"], fire_target)
     return {
@@ -946,6 +1210,20 @@ def build_ab_summary(simulation_results: Dict, params: Dict, model_label: str) -
     }
 
 
+def diff_config_keys(baseline_cfg: Dict[str, Any], current_cfg: Dict[str, Any]) -> List[str]:
+    """Return sorted config keys whose values differ between A and B (missing == None)."""
+    # Profile configs carry dict values (intl_tax_rates), so an items() set
+    # difference is not an option; walk the larger dict once instead.
+    small, big = (
+        (baseline_cfg, current_cfg) if len(baseline_cfg) < len(current_cfg) else (current_cfg, baseline_cfg)
+    )
+    changed = [k for k, v in big.items() if v != small.get(k)]
+    changed += [k for k, v in small.items() if v is not None and k not in big]
+    changed.sort()
+    return changed
+
+
+@streamlit_fragment
 def render_ab_comparator(simulation_results_by_model: Dict[str, Dict], params: Dict) -> None:
     """Render A/B comparator: baseline scenario A vs current scenario B."""
     st.markdown("### 🆚 Comparador A/B (escenario guardado vs actual)")
@@ -1014,7 +1292,7 @@ def render_ab_comparator(simulation_results_by_model: Dict[str, Dict], params: D
             # Defer widget-state mutation to next rerun (Streamlit widget-state rule).
             st.session_state["ab_pending_lock_model"] = selected_b_model
             st.success("Escenario A guardado para comparación.")
-            st.rerun()
+            rerun_app()
     with controls_col2:
         if st.button("Limpiar base A", key="ab_clear_baseline", width="stretch"):
             st.session_state.pop("ab_baseline_params", None)
@@ -1039,9 +1317,9 @@ def render_ab_comparator(simulation_results_by_model: Dict[str, Dict], params: D
         with preview_cols[1]:
             st.metric("📈 Éxito final (B)", f"{current_summary['success_rate_final']:.0f}%")
         with preview_cols[2]:
-            st.metric("💰 P50 poder adquisitivo (B)", f"{fmt_eur(current_summary['final_real_p50'])}")
+            st.metric("💰 P50 poder adquisitivo (B)", fmt_eur(current_summary['final_real_p50']))
         with preview_cols[3]:
-            st.metric("🎯 Objetivo FIRE (B, € hoy)", f"{fmt_eur(current_summary['fire_target'])}")
+            st.metric("🎯 Objetivo FIRE (B, € hoy)", fmt_eur(current_summary['fire_target']))
         st.caption(
             "Estos indicadores corresponden al modelo B seleccionado. "
             "Guarda el escenario como A para ver deltas y lectura comparativa."
@@ -1061,14 +1339,13 @@ def render_ab_comparator(simulation_results_by_model: Dict[str, Dict], params: D
 
     baseline_cfg = baseline_payload.get("config", {}) if isinstance(baseline_payload, dict) else {}
     current_cfg = current_payload.get("config", {}) if isinstance(current_payload, dict) else {}
-    changed_keys = sorted(
-        k for k in set(baseline_cfg.keys()).union(current_cfg.keys())
-        if baseline_cfg.get(k) != current_cfg.get(k)
-    )
+    changed_keys = diff_config_keys(baseline_cfg, current_cfg)
+    top_changed = changed_keys[:8]
+    rest_count = len(changed_keys) - len(top_changed)
     st.caption(f"Parámetros distintos vs A: {len(changed_keys)}")
     if changed_keys:
-        preview = ", ".join(changed_keys[:8])
-        extra = f" (+{len(changed_keys)-8} más)" if len(changed_keys) > 8 else ""
+        preview = ", ".join(top_changed)
+        extra = f" (+{rest_count} más)" if rest_count else ""
         st.caption(f"Cambios detectados: {preview}{extra}")
     elif baseline_model != selected_b_model:
         st.caption("Misma configuración de perfil; la comparación refleja únicamente cambio de modelo.")
@@ -1078,9 +1355,6 @@ def render_ab_comparator(simulation_results_by_model: Dict[str, Dict], params: D
     baseline_horizon = int(baseline_summary.get("years_horizon", current_summary["years_horizon"]))
     current_horizon = int(current_summary["years_horizon"])
 
-    def _format_years(value: Optional[int], horizon: int) -> str:
-        return f"{value} años" if value is not None else f"No alcanzable (> {horizon} años)"
-
     if baseline_years is not None and current_years is not None:
         delta_years = current_years - baseline_years
         if delta_years == 0:
@@ -1099,129 +1373,67 @@ def render_ab_comparator(simulation_results_by_model: Dict[str, Dict], params: D
         years_delta_text = "Sin cambio (no alcanzable)"
         years_delta_color = "off"
 
-    success_delta = float(current_summary["success_rate_final"]) - float(baseline_summary.get("success_rate_final", 0.0))
-    real_delta = float(current_summary["final_real_p50"]) - float(baseline_summary.get("final_real_p50", 0.0))
-    target_delta = float(current_summary["fire_target"]) - float(baseline_summary.get("fire_target", 0.0))
-
-    success_delta_text = "Sin cambio vs A" if abs(success_delta) < 0.05 else f"{success_delta:+.1f} pp vs A"
-    success_delta_color = "off" if abs(success_delta) < 0.05 else "normal"
-    real_delta_text = "Sin cambio vs A" if abs(real_delta) < 1.0 else f"{fmt_num_es(real_delta, signed=True)} € vs A"
-    real_delta_color = "off" if abs(real_delta) < 1.0 else "normal"
-    target_delta_text = "Sin cambio vs A" if abs(target_delta) < 1.0 else f"{fmt_num_es(target_delta, signed=True)} € vs A"
-    target_delta_color = "off" if abs(target_delta) < 1.0 else "inverse"
-
-    def _fmt_param_value(value: Any) -> str:
-        if isinstance(value, bool):
-            return "Sí" if value else "No"
-        if isinstance(value, (int, float)):
-            abs_value = abs(float(value))
-            if abs_value >= 1000:
-                return fmt_num_es(float(value), 0)
-            if abs_value >= 1:
-                return fmt_num_es(float(value), 2)
-            return fmt_num_es(float(value), 4)
-        if value is None:
-            return "n/d"
-        return str(value)
-
-    pretty_names = {
-        "gastos_anuales": "Gasto anual objetivo",
-        "safe_withdrawal_rate": "SWR",
-        "patrimonio_actual": "Patrimonio actual",
-        "aportacion_mensual": "Aportación mensual",
-        "edad_actual": "Edad actual",
-        "edad_objetivo": "Edad objetivo",
-        "inflacion_anual": "Inflación",
-        "rentabilidad_anual": "Rentabilidad esperada",
-        "volatilidad_anual": "Volatilidad",
-        "region": "CCAA fiscal",
-        "tax_year": "Año fiscal",
-        "fiscal_mode": "Modo fiscal",
-        "taxable_withdrawal_ratio": "Retirada sujeta a impuesto",
-    }
-
-    impact_groups = {
-        "objetivo": {
-            "gastos_anuales",
-            "safe_withdrawal_rate",
-            "taxable_withdrawal_ratio",
-            "coste_pre_pension_anual",
-        },
-        "acumulacion": {
-            "patrimonio_actual",
-            "aportacion_mensual",
-            "edad_actual",
-            "edad_objetivo",
-            "rentabilidad_anual",
-            "volatilidad_anual",
-            "inflacion_anual",
-            "has_propiedad_principal",
-            "valor_vivienda_principal",
-            "deuda_vivienda_principal",
-            "cuota_hipoteca_vivienda",
-            "meses_hipoteca_vivienda_restantes",
-            "valor_inmuebles_invertibles",
-            "deuda_inmuebles_invertibles",
-            "cuota_hipoteca_inmuebles",
-            "meses_hipoteca_inmuebles_restantes",
-            "renta_bruta_alquiler_anual",
-        },
-        "fiscal": {
-            "fiscal_mode",
-            "region",
-            "tax_year",
-            "retirement_tax_regime",
-            "taxable_withdrawal_ratio",
-            "intl_tax_rate_gains",
-            "intl_tax_rate_dividends",
-            "intl_tax_rate_interest",
-            "intl_tax_rate_wealth",
-        },
-    }
+    # Both snapshots come from build_ab_summary, which already stores floats.
+    success_delta = current_summary["success_rate_final"] - baseline_summary.get("success_rate_final", 0.0)
+    real_delta = current_summary["final_real_p50"] - baseline_summary.get("final_real_p50", 0.0)
+    target_delta = current_summary["fire_target"] - baseline_summary.get("fire_target", 0.0)
+
+    abs_success_delta = abs(success_delta)
+    abs_real_delta = abs(real_delta)
+    abs_target_delta = abs(target_delta)
+    success_small = abs_success_delta < 0.05
+    real_small = abs_real_delta < 1.0
+    target_small = abs_target_delta < 1.0
+
+    success_delta_text = "Sin cambio vs A" if success_small else f"{success_delta:+.1f} pp vs A"
+    success_delta_color = "off" if success_small else "normal"
+    real_delta_text = "Sin cambio vs A" if real_small else f"{fmt_num_es(real_delta, signed=True)} € vs A"
+    real_delta_color = "off" if real_small else "normal"
+    target_delta_text = "Sin cambio vs A" if target_small else f"{fmt_num_es(target_delta, signed=True)} € vs A"
+    target_delta_color = "off" if target_small else "inverse"
 
     if changed_keys:
         st.markdown("**Qué cambió exactamente (A → B)**")
-        for key in changed_keys[:8]:
-            label = pretty_names.get(key, key)
-            left = _fmt_param_value(baseline_cfg.get(key))
-            right = _fmt_param_value(current_cfg.get(key))
-            st.markdown(f"- `{label}`: `{left}` → `{right}`")
-        if len(changed_keys) > 8:
-            st.markdown(f"- `...` y {len(changed_keys) - 8} cambios adicionales.")
+        change_lines = [
+            f"- `{AB_PRETTY_NAMES.get(key, key)}`: "
+            f"`{fmt_param_value(baseline_cfg.get(key))}` → `{fmt_param_value(current_cfg.get(key))}`"
+            for key in top_changed
+        ]
+        if rest_count:
+            change_lines.append(f"- `...` y {rest_count} cambios adicionales.")
+        st.markdown("\n".join(change_lines))
 
         changed_set = set(changed_keys)
-        changed_objetivo = sorted(changed_set.intersection(impact_groups["objetivo"]))
-        changed_acumulacion = sorted(changed_set.intersection(impact_groups["acumulacion"]))
-        changed_fiscal = sorted(changed_set.intersection(impact_groups["fiscal"]))
-        changed_other = sorted(
-            changed_set.difference(
-                impact_groups["objetivo"].union(impact_groups["acumulacion"]).union(impact_groups["fiscal"])
-            )
-        )
+        changed_objetivo = sorted(changed_set & AB_IMPACT_GROUPS["objetivo"])
+        changed_acumulacion = sorted(changed_set & AB_IMPACT_GROUPS["acumulacion"])
+        changed_fiscal = sorted(changed_set & AB_IMPACT_GROUPS["fiscal"])
+        changed_other = sorted(changed_set - AB_IMPACT_ALL_KNOWN)
 
         st.markdown("**Cómo impactan estos cambios**")
+        impact_lines = []
         if changed_objetivo:
-            st.markdown(
+            impact_lines.append(
                 f"- `Objetivo FIRE` ({len(changed_objetivo)} cambio/s): mueve el umbral de capital necesario."
             )
         if changed_acumulacion:
-            st.markdown(
+            impact_lines.append(
                 f"- `Trayectoria de cartera` ({len(changed_acumulacion)} cambio/s): afecta años hasta FIRE, probabilidad y P50 final."
             )
         if changed_fiscal:
-            st.markdown(
+            impact_lines.append(
                 f"- `Fiscalidad` ({len(changed_fiscal)} cambio/s): puede alterar rendimiento neto y necesidades de retirada."
             )
         if changed_other:
-            st.markdown(
+            impact_lines.append(
                 f"- `Otros` ({len(changed_other)} cambio/s): impacto indirecto según el modelo activo."
             )
+        st.markdown("\n".join(impact_lines))
 
     m1, m2, m3, m4 = st.columns(4)
     with m1:
         st.metric(
             "⏱️ Años hasta FIRE (B)",
-            _format_years(current_years, current_horizon),
+            f"{current_years} años" if current_years is not None else f"No alcanzable (> {current_horizon} años)",
             delta=years_delta_text,
             delta_color=years_delta_color,
         )
@@ -1235,14 +1447,14 @@ def render_ab_comparator(simulation_results_by_model: Dict[str, Dict], params: D
     with m3:
         st.metric(
             "💰 P50 poder adquisitivo (B)",
-            f"{fmt_eur(current_summary['final_real_p50'])}",
+            fmt_eur(current_summary['final_real_p50']),
             delta=real_delta_text,
             delta_color=real_delta_color,
         )
     with m4:
         st.metric(
             "🎯 Objetivo FIRE (B, € hoy)",
-            f"{fmt_eur(current_summary['fire_target'])}",
+            fmt_eur(current_summary['fire_target']),
             delta=target_delta_text,
             delta_color=target_delta_color,
         )
@@ -1268,37 +1480,14 @@ def render_ab_comparator(simulation_results_by_model: Dict[str, Dict], params: D
     elif real_delta <= -10_000:
         score -= 1
 
-    no_changes_same_model = (
-        not changed_keys
-        and baseline_model == selected_b_model
-        and (
-            (baseline_years is None and current_years is None)
-            or (baseline_years == current_years)
-        )
-        and abs(success_delta) < 0.05
-        and abs(real_delta) < 1.0
-        and abs(target_delta) < 1.0
-    )
-
-    no_changes_different_model = (
-        not changed_keys
-        and baseline_model != selected_b_model
-        and (
-            (baseline_years is None and current_years is None)
-            or (baseline_years == current_years)
-        )
-        and abs(success_delta) < 0.05
-        and abs(real_delta) < 1.0
-        and abs(target_delta) < 1.0
-    )
-
-    path_stable = (
-        (
-            baseline_years is None and current_years is None
-        ) or (
-            baseline_years is not None and current_years is not None and baseline_years == current_years
-        )
-    ) and abs(success_delta) < 0.2 and abs(real_delta) < 1_000
+    # `None == None` covers "unreachable in both", so plain equality is enough.
+    years_equal = baseline_years == current_years
+    model_same = baseline_model == selected_b_model
+    no_cfg_changes = not changed_keys
+    results_unchanged = no_cfg_changes and years_equal and success_small and real_small and target_small
+    no_changes_same_model = results_unchanged and model_same
+    no_changes_different_model = results_unchanged and not model_same
+    path_stable = years_equal and abs_success_delta < 0.2 and abs_real_delta < 1_000
 
     if no_changes_same_model:
         insight_cls = ""
@@ -1309,14 +1498,14 @@ def render_ab_comparator(simulation_results_by_model: Dict[str, Dict], params: D
             "Lectura rápida: has comparado modelos distintos con el mismo perfil y, en este caso, "
             "el resultado agregado es prácticamente igual."
         )
-    elif path_stable and abs(target_delta) >= 1_000:
+    elif path_stable and abs_target_delta >= 1_000:
         insight_cls = "warn"
         insight_text = (
             "Lectura rápida: cambió el objetivo FIRE, pero casi no cambió la trayectoria simulada "
             "(años, éxito y P50 real). Esto suele pasar cuando modificas gasto/SWR o supuestos que "
             "mueven el umbral objetivo más que el comportamiento de la cartera."
         )
-    elif not changed_keys and baseline_model != selected_b_model:
+    elif no_cfg_changes and not model_same:
         insight_cls = "warn"
         insight_text = (
             "Lectura rápida: perfil idéntico, resultado distinto por método de simulación. "
@@ -1336,7 +1525,7 @@ def render_ab_comparator(simulation_results_by_model: Dict[str, Dict], params: D
         f"<div class='ab-compare-insight {insight_cls}'>{insight_text}</div>",
         unsafe_allow_html=True,
     )
-    if path_stable and len(changed_keys) > 0:
+    if path_stable and not no_cfg_changes:
         st.caption(
             "Si quieres comparar impacto real en la trayectoria, cambia variables de acumulación "
             "(patrimonio inicial, aportación, horizonte, rentabilidad, inflación o volatilidad)."
@@ -1377,7 +1566,47 @@ def estimate_retirement_tax_context_intl_basic(
     )
     wealth_rate = max(0.0, min(1.0, float(intl_tax_rates.get("wealth", 0.0))))
 
-    portfolio_target = base_target
+    # Flat effective rates make both fixed points affine: the savings tax is
+    # gross * ratio * savings_rate and the wealth tax is target * wealth_rate,
+    # so target = net / (swr * (1 - ratio * savings_rate) - wealth_rate).
+    savings_denominator = 1.0 - ratio * savings_rate
+    target_denominator = safe_withdrawal_rate * savings_denominator - wealth_rate
+    if net_spending >= 0 and savings_denominator > 1e-9 and target_denominator > 1e-9:
+        portfolio_target = net_spending / target_denominator
+        annual_wealth_tax = portfolio_target * wealth_rate
+        gross_withdrawal = (net_spending + annual_wealth_tax) / savings_denominator
+        annual_savings_tax = gross_withdrawal * ratio * savings_rate
+        converged = True
+        iterations = 0
+    else:
+        # Divergent or degenerate rates: keep the bounded fixed-point iteration.
+        portfolio_target, annual_savings_tax, annual_wealth_tax, gross_withdrawal, converged, iterations = (
+            _intl_retirement_fixed_point(net_spending, safe_withdrawal_rate, ratio, savings_rate, wealth_rate)
+        )
+
+    # Same mapping shape as the Spain tax-pack context, so every consumer of
+    # params["retirement_tax_context"] reads both modes the same way.
+    return {
+        "base_target": base_target,
+        "gross_withdrawal_required": gross_withdrawal,
+        "annual_savings_tax_retirement": annual_savings_tax,
+        "annual_wealth_tax_retirement": annual_wealth_tax,
+        "total_annual_tax_retirement": annual_savings_tax + annual_wealth_tax,
+        "target_portfolio_gross": portfolio_target,
+        "converged": converged,
+        "iterations": iterations,
+    }
+
+
+def _intl_retirement_fixed_point(
+    net_spending: float,
+    safe_withdrawal_rate: float,
+    ratio: float,
+    savings_rate: float,
+    wealth_rate: float,
+) -> Tuple[float, float, float, float, bool, int]:
+    """Bounded fixed-point fallback for rates where the closed form does not apply."""
+    portfolio_target = net_spending / safe_withdrawal_rate
     annual_savings_tax = 0.0
     annual_wealth_tax = 0.0
     gross_withdrawal = net_spending
@@ -1406,16 +1635,7 @@ def estimate_retirement_tax_context_intl_basic(
         portfolio_target = new_target
         gross_withdrawal = gross_candidate
 
-    return {
-        "base_target": base_target,
-        "gross_withdrawal_required": gross_withdrawal,
-        "annual_savings_tax_retirement": annual_savings_tax,
-        "annual_wealth_tax_retirement": annual_wealth_tax,
-        "total_annual_tax_retirement": annual_savings_tax + annual_wealth_tax,
-        "target_portfolio_gross": portfolio_target,
-        "converged": converged,
-        "iterations": iterations,
-    }
+    return portfolio_target, annual_savings_tax, annual_wealth_tax, gross_withdrawal, converged, iterations
 
 
 def estimate_auto_taxable_withdrawal_ratio(
@@ -1435,17 +1655,30 @@ def estimate_auto_taxable_withdrawal_ratio(
     )
 
 
+@lru_cache(maxsize=256)
+def _display_fire_target(
+    fiscal_priority: Optional[str],
+    retirement_target: Optional[float],
+    fire_target_real: Optional[float],
+    annual_spending: Optional[float],
+    safe_withdrawal_rate: Optional[float],
+) -> float:
+    if fiscal_priority in ("Jubilación", "Mixta (acumulación + jubilación)") and retirement_target is not None:
+        return float(retirement_target)
+    if fire_target_real is not None:
+        return float(fire_target_real)
+    return float(annual_spending / safe_withdrawal_rate)
+
+
 def get_display_fire_target(simulation_results: Dict, params: Dict) -> float:
     """Use a single FIRE target source for UI consistency."""
-    if params.get("fiscal_priority") in ("Jubilación", "Mixta (acumulación + jubilación)"):
-        ctx = params.get("retirement_tax_context")
-        if ctx and ctx.get("target_portfolio_gross") is not None:
-            return float(ctx["target_portfolio_gross"])
-    return float(
-        simulation_results.get(
-            "fire_target_real",
-            params["gastos_anuales"] / params["safe_withdrawal_rate"],
-        )
+    ctx = params.get("retirement_tax_context")
+    return _display_fire_target(
+        params.get("fiscal_priority"),
+        ctx.get("target_portfolio_gross") if ctx else None,
+        simulation_results.get("fire_target_real"),
+        params.get("gastos_anuales"),
+        params.get("safe_withdrawal_rate"),
     )
 
 
@@ -1469,10 +1702,10 @@ def render_retirement_tax_focus_summary(params: Dict) -> None:
         params.get("gasto_anual_neto_cartera", params["gastos_anuales"]),
     )
     col1, col2, col3, col4 = st.columns(4)
-    col1.metric("Gasto neto deseado", f"{fmt_eur(net_spending_for_portfolio)}")
-    col2.metric("Retirada bruta estimada", f"{fmt_eur(ctx['gross_withdrawal_required'])}")
-    col3.metric("Impuestos anuales estimados", f"{fmt_eur(ctx['total_annual_tax_retirement'])}")
-    col4.metric("Objetivo FIRE ajustado", f"{fmt_eur(ctx['target_portfolio_gross'])}")
+    col1.metric("Gasto neto deseado", fmt_eur(net_spending_for_portfolio))
+    col2.metric("Retirada bruta estimada", fmt_eur(ctx['gross_withdrawal_required']))
+    col3.metric("Impuestos anuales estimados", fmt_eur(ctx['total_annual_tax_retirement']))
+    col4.metric("Objetivo FIRE ajustado", fmt_eur(ctx['target_portfolio_gross']))
     st.caption(
         f"Supuesto clave: {params.get('taxable_withdrawal_ratio_effective', params.get('taxable_withdrawal_ratio', 0.4))*100:.0f}% "
         "de la retirada anual tributa "
@@ -1502,6 +1735,144 @@ def render_retirement_tax_focus_summary(params: Dict) -> None:
             )
 
 
+def _stable_rank_indices(values: np.ndarray, ranks: np.ndarray) -> np.ndarray:
+    """Column index holding rank ranks[i] of row i, as a stable argsort would pick it.
+
+    Selection runs in O(W) per row with np.partition instead of a full sort;
+    ties resolve to the lowest column, matching argsort(kind="stable").
+    """
+    rows = np.arange(values.shape[0])
+    kth_values = np.partition(values, np.unique(ranks), axis=1)[rows, ranks][:, None]
+    tie_offset = ranks - np.count_nonzero(values < kth_values, axis=1)
+    tie_position = np.cumsum(values == kth_values, axis=1)
+    return np.argmax(tie_position > tie_offset[:, None], axis=1)
+
+
+def _decumulation_tables_from_schedule(
+    schedule_table: pd.DataFrame,
+    starting_portfolios: np.ndarray,
+    annual_returns: np.ndarray,
+    tax_rate: float,
+) -> List[pd.DataFrame]:
+    """One decumulation table per starting portfolio, reusing the schedule columns.
+
+    Withdrawals, incomes and sale inflows do not depend on the capital or the
+    return path, so only the capital columns are recomputed, in one batched pass.
+    """
+    if schedule_table.empty:
+        return [schedule_table.copy() for _ in range(len(starting_portfolios))]
+    capital_inicial, growth_net, capital_final = simulate_capital_paths(
+        starting_portfolios,
+        annual_returns,
+        schedule_table["Retirada anual (€)"].to_numpy(dtype=np.float64),
+        schedule_table["Venta inmueble (€)"].to_numpy(dtype=np.float64),
+        tax_rate,
+    )
+    return [
+        schedule_table.assign(
+            **{
+                "Capital inicial (€)": capital_inicial[row],
+                "Crecimiento neto (€)": growth_net[row],
+                "Capital final (€)": capital_final[row],
+                "Capital agotado": capital_final[row] <= 0,
+            }
+        )
+        for row in range(len(starting_portfolios))
+    ]
+
+
+def _simulate_withdrawal_path(
+    starting_portfolio: float,
+    annual_withdrawal_base: float,
+    annual_returns_sequence: np.ndarray,
+    inflation_rate: float,
+    tax_rate_on_gains: float,
+    annual_mortgage_schedule: Optional[List[float]] = None,
+    pending_installments_end_schedule: Optional[List[int]] = None,
+    property_sale_enabled: bool = False,
+    property_sale_year: int = 0,
+    property_sale_amount: float = 0.0,
+    annual_extra_withdrawal_schedule: Optional[List[float]] = None,
+) -> Dict[str, np.ndarray]:
+    """Run the single-need yearly recurrence into preallocated column arrays."""
+    years_in_retirement = int(len(annual_returns_sequence))
+    inflation = build_inflation_factors(inflation_rate, years_in_retirement)
+    need_base = annual_withdrawal_base * inflation
+    sale_col = build_property_sale_column(property_sale_enabled, property_sale_year, property_sale_amount, inflation)
+    mortgage_col = build_padded_schedule(annual_mortgage_schedule, years_in_retirement)
+    extra_withdrawal_col = build_padded_schedule(annual_extra_withdrawal_schedule, years_in_retirement)
+    pending_col = build_padded_schedule(pending_installments_end_schedule, years_in_retirement, np.int64)
+    retirada_col = need_base + mortgage_col + extra_withdrawal_col
+
+    capital_inicial_col, growth_net_col, capital_final_col = (
+        path[0]
+        for path in simulate_capital_paths(
+            [starting_portfolio],
+            np.asarray(annual_returns_sequence, dtype=np.float64)[None, :],
+            retirada_col,
+            sale_col,
+            tax_rate_on_gains,
+        )
+    )
+
+    return {
+        "Año jubilación": np.arange(1, years_in_retirement + 1, dtype=np.int64),
+        "Necesidad base cartera (€)": need_base,
+        "Ajuste venta/alquiler (€)": extra_withdrawal_col,
+        "Venta inmueble (€)": sale_col,
+        "Cuota hipoteca pendiente (€)": mortgage_col,
+        "Cuotas pendientes fin año": pending_col,
+        "Capital inicial (€)": capital_inicial_col,
+        "Retirada anual (€)": retirada_col,
+        "Crecimiento neto (€)": growth_net_col,
+        "Capital final (€)": capital_final_col,
+    }
+
+
+def _withdrawal_path_frame(columns: Dict[str, np.ndarray]) -> pd.DataFrame:
+    """Assemble the single-need decumulation table from kernel column arrays."""
+    if len(columns["Año jubilación"]) == 0:
+        return pd.DataFrame()
+    return pd.DataFrame(
+        {
+            "Año jubilación": columns["Año jubilación"],
+            "Necesidad base cartera (€)": columns["Necesidad base cartera (€)"],
+            "Ingresos totales (€)": np.zeros(len(columns["Año jubilación"]), dtype=np.float64),
+            "Ajuste venta/alquiler (€)": columns["Ajuste venta/alquiler (€)"],
+            "Capital inicial (€)": columns["Capital inicial (€)"],
+            "Venta inmueble (€)": columns["Venta inmueble (€)"],
+            "Cuota hipoteca pendiente (€)": columns["Cuota hipoteca pendiente (€)"],
+            "Cuotas pendientes fin año": columns["Cuotas pendientes fin año"],
+            "Retirada anual (€)": columns["Retirada anual (€)"],
+            "Crecimiento neto (€)": columns["Crecimiento neto (€)"],
+            "Capital final (€)": columns["Capital final (€)"],
+            "Capital agotado": columns["Capital final (€)"] <= 0,
+        }
+    )
+
+
+def _split_flow_check(
+    capital_inicial: np.ndarray,
+    growth_net: np.ndarray,
+    withdrawals: np.ndarray,
+    capital_final: np.ndarray,
+    exhausted: np.ndarray,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Yearly flow residual split into (modeling check, unmet withdrawal).
+
+    Once capital is exhausted and clamped to 0, a negative residual is unmet
+    withdrawal rather than a modeling mismatch, so it moves to the deficit
+    column instead of raising a false "descuadre" alarm.
+    """
+    flow_check = capital_inicial + growth_net
+    flow_check -= withdrawals
+    flow_check -= capital_final
+    deficit = np.zeros_like(flow_check)
+    np.copyto(deficit, flow_check, where=exhausted)
+    np.copyto(flow_check, 0.0, where=exhausted)
+    return flow_check, deficit
+
+
 def build_decumulation_table(
     starting_portfolio: float,
     annual_withdrawal_base: float,
@@ -1517,53 +1888,20 @@ def build_decumulation_table(
     annual_extra_withdrawal_schedule: Optional[List[float]] = None,
 ) -> pd.DataFrame:
     """Build a year-by-year decumulation table for retirement."""
-    rows: List[Dict[str, float]] = []
-    portfolio = float(max(0.0, starting_portfolio))
-    inflation_factor = 1.0
-
-    for year in range(1, years_in_retirement + 1):
-        sale_nominal = (
-            max(0.0, float(property_sale_amount)) * inflation_factor
-            if property_sale_enabled and int(property_sale_year) == year
-            else 0.0
-        )
-        capital_inicial = portfolio + sale_nominal
-        annual_mortgage_cost = 0.0
-        if annual_mortgage_schedule and year - 1 < len(annual_mortgage_schedule):
-            annual_mortgage_cost = max(0.0, float(annual_mortgage_schedule[year - 1]))
-        annual_extra_withdrawal = 0.0
-        if annual_extra_withdrawal_schedule and year - 1 < len(annual_extra_withdrawal_schedule):
-            annual_extra_withdrawal = max(0.0, float(annual_extra_withdrawal_schedule[year - 1]))
-        pending_installments_end_year = 0
-        if pending_installments_end_schedule and year - 1 < len(pending_installments_end_schedule):
-            pending_installments_end_year = max(0, int(pending_installments_end_schedule[year - 1]))
-        retirada = (annual_withdrawal_base * inflation_factor) + annual_mortgage_cost + annual_extra_withdrawal
-        growth_gross = capital_inicial * expected_return
-        tax_growth = max(0.0, growth_gross) * max(0.0, tax_rate_on_gains)
-        growth_net = growth_gross - tax_growth
-        capital_final = max(0.0, capital_inicial + growth_net - retirada)
-
-        rows.append(
-            {
-                "Año jubilación": year,
-                "Necesidad base cartera (€)": annual_withdrawal_base * inflation_factor,
-                "Ingresos totales (€)": 0.0,
-                "Ajuste venta/alquiler (€)": annual_extra_withdrawal,
-                "Capital inicial (€)": capital_inicial,
-                "Venta inmueble (€)": sale_nominal,
-                "Cuota hipoteca pendiente (€)": annual_mortgage_cost,
-                "Cuotas pendientes fin año": pending_installments_end_year,
-                "Retirada anual (€)": retirada,
-                "Crecimiento neto (€)": growth_net,
-                "Capital final (€)": capital_final,
-                "Capital agotado": capital_final <= 0,
-            }
-        )
-
-        portfolio = capital_final
-        inflation_factor *= (1 + inflation_rate)
-
-    return pd.DataFrame(rows)
+    columns = _simulate_withdrawal_path(
+        starting_portfolio=starting_portfolio,
+        annual_withdrawal_base=annual_withdrawal_base,
+        annual_returns_sequence=np.full(max(0, int(years_in_retirement)), expected_return, dtype=np.float64),
+        inflation_rate=inflation_rate,
+        tax_rate_on_gains=tax_rate_on_gains,
+        annual_mortgage_schedule=annual_mortgage_schedule,
+        pending_installments_end_schedule=pending_installments_end_schedule,
+        property_sale_enabled=property_sale_enabled,
+        property_sale_year=property_sale_year,
+        property_sale_amount=property_sale_amount,
+        annual_extra_withdrawal_schedule=annual_extra_withdrawal_schedule,
+    )
+    return _withdrawal_path_frame(columns)
 
 
 def build_decumulation_table_with_return_path(
@@ -1580,55 +1918,20 @@ def build_decumulation_table_with_return_path(
     annual_extra_withdrawal_schedule: Optional[List[float]] = None,
 ) -> pd.DataFrame:
     """Decumulation table using a full annual return path (sequential backtesting)."""
-    rows: List[Dict[str, float]] = []
-    portfolio = float(max(0.0, starting_portfolio))
-    inflation_factor = 1.0
-    years_in_retirement = int(len(annual_returns_sequence))
-
-    for year in range(1, years_in_retirement + 1):
-        annual_return = float(annual_returns_sequence[year - 1])
-        sale_nominal = (
-            max(0.0, float(property_sale_amount)) * inflation_factor
-            if property_sale_enabled and int(property_sale_year) == year
-            else 0.0
-        )
-        capital_inicial = portfolio + sale_nominal
-        annual_mortgage_cost = 0.0
-        if annual_mortgage_schedule and year - 1 < len(annual_mortgage_schedule):
-            annual_mortgage_cost = max(0.0, float(annual_mortgage_schedule[year - 1]))
-        annual_extra_withdrawal = 0.0
-        if annual_extra_withdrawal_schedule and year - 1 < len(annual_extra_withdrawal_schedule):
-            annual_extra_withdrawal = max(0.0, float(annual_extra_withdrawal_schedule[year - 1]))
-        pending_installments_end_year = 0
-        if pending_installments_end_schedule and year - 1 < len(pending_installments_end_schedule):
-            pending_installments_end_year = max(0, int(pending_installments_end_schedule[year - 1]))
-
-        retirada = (annual_withdrawal_base * inflation_factor) + annual_mortgage_cost + annual_extra_withdrawal
-        growth_gross = capital_inicial * annual_return
-        tax_growth = max(0.0, growth_gross) * max(0.0, tax_rate_on_gains)
-        growth_net = growth_gross - tax_growth
-        capital_final = max(0.0, capital_inicial + growth_net - retirada)
-
-        rows.append(
-            {
-                "Año jubilación": year,
-                "Necesidad base cartera (€)": annual_withdrawal_base * inflation_factor,
-                "Ingresos totales (€)": 0.0,
-                "Ajuste venta/alquiler (€)": annual_extra_withdrawal,
-                "Capital inicial (€)": capital_inicial,
-                "Venta inmueble (€)": sale_nominal,
-                "Cuota hipoteca pendiente (€)": annual_mortgage_cost,
-                "Cuotas pendientes fin año": pending_installments_end_year,
-                "Retirada anual (€)": retirada,
-                "Crecimiento neto (€)": growth_net,
-                "Capital final (€)": capital_final,
-                "Capital agotado": capital_final <= 0,
-            }
-        )
-        portfolio = capital_final
-        inflation_factor *= (1 + inflation_rate)
-
-    return pd.DataFrame(rows)
+    columns = _simulate_withdrawal_path(
+        starting_portfolio=starting_portfolio,
+        annual_withdrawal_base=annual_withdrawal_base,
+        annual_returns_sequence=annual_returns_sequence,
+        inflation_rate=inflation_rate,
+        tax_rate_on_gains=tax_rate_on_gains,
+        annual_mortgage_schedule=annual_mortgage_schedule,
+        pending_installments_end_schedule=pending_installments_end_schedule,
+        property_sale_enabled=property_sale_enabled,
+        property_sale_year=property_sale_year,
+        property_sale_amount=property_sale_amount,
+        annual_extra_withdrawal_schedule=annual_extra_withdrawal_schedule,
+    )
+    return _withdrawal_path_frame(columns)
 
 
 def build_decumulation_table_two_stage_schedule_with_return_path(
@@ -1653,78 +1956,28 @@ def build_decumulation_table_two_stage_schedule_with_return_path(
     annual_extra_withdrawal_schedule: Optional[List[float]] = None,
 ) -> pd.DataFrame:
     """Two-stage decumulation table using yearly return path (sequential backtesting)."""
-    rows: List[Dict[str, float]] = []
-    portfolio = float(max(0.0, starting_portfolio))
-    inflation_factor = 1.0
-    years_in_retirement = int(len(annual_returns_sequence))
-    plan_private_end_age = plan_private_start_age + max(0, plan_private_duration_years) - 1
-
-    for year in range(1, years_in_retirement + 1):
-        annual_return = float(annual_returns_sequence[year - 1])
-        age = fire_age + year - 1
-        tramo = "Pre-pensión" if age < pension_public_start_age else "Post-pensión"
-
-        income_public = pension_public_net_annual if age >= pension_public_start_age else 0.0
-        income_private = (
-            plan_private_net_annual
-            if plan_private_duration_years > 0 and plan_private_start_age <= age <= plan_private_end_age
-            else 0.0
-        )
-        income_other = other_income_post_pension_annual if age >= pension_public_start_age else 0.0
-        extra_cost = pre_pension_extra_cost_annual if age < pension_public_start_age else 0.0
-
-        annual_need_from_portfolio = max(
-            0.0,
-            annual_spending_base + extra_cost - income_public - income_private - income_other,
-        )
-        annual_mortgage_cost = 0.0
-        if annual_mortgage_schedule and year - 1 < len(annual_mortgage_schedule):
-            annual_mortgage_cost = max(0.0, float(annual_mortgage_schedule[year - 1]))
-        annual_extra_withdrawal = 0.0
-        if annual_extra_withdrawal_schedule and year - 1 < len(annual_extra_withdrawal_schedule):
-            annual_extra_withdrawal = max(0.0, float(annual_extra_withdrawal_schedule[year - 1]))
-        pending_installments_end_year = 0
-        if pending_installments_end_schedule and year - 1 < len(pending_installments_end_schedule):
-            pending_installments_end_year = max(0, int(pending_installments_end_schedule[year - 1]))
-
-        sale_nominal = (
-            max(0.0, float(property_sale_amount)) * inflation_factor
-            if property_sale_enabled and int(property_sale_year) == year
-            else 0.0
-        )
-        capital_inicial = portfolio + sale_nominal
-        retirada = (annual_need_from_portfolio * inflation_factor) + annual_mortgage_cost + annual_extra_withdrawal
-        growth_gross = capital_inicial * annual_return
-        tax_growth = max(0.0, growth_gross) * max(0.0, tax_rate_on_gains)
-        growth_net = growth_gross - tax_growth
-        capital_final = max(0.0, capital_inicial + growth_net - retirada)
-
-        rows.append(
-            {
-                "Año jubilación": year,
-                "Edad": age,
-                "Tramo": tramo,
-                "Necesidad base cartera (€)": annual_spending_base * inflation_factor,
-                "Ingreso pensión pública (€)": income_public * inflation_factor,
-                "Ingreso plan privado (€)": income_private * inflation_factor,
-                "Otras rentas (€)": income_other * inflation_factor,
-                "Ingresos totales (€)": (income_public + income_private + income_other) * inflation_factor,
-                "Coste extra pre-pensión (€)": extra_cost * inflation_factor,
-                "Ajuste venta/alquiler (€)": annual_extra_withdrawal,
-                "Venta inmueble (€)": sale_nominal,
-                "Cuota hipoteca pendiente (€)": annual_mortgage_cost,
-                "Cuotas pendientes fin año": pending_installments_end_year,
-                "Capital inicial (€)": capital_inicial,
-                "Retirada anual (€)": retirada,
-                "Crecimiento neto (€)": growth_net,
-                "Capital final (€)": capital_final,
-                "Capital agotado": capital_final <= 0,
-            }
-        )
-        portfolio = capital_final
-        inflation_factor *= (1 + inflation_rate)
-
-    return pd.DataFrame(rows)
+    columns = simulate_two_stage_columns(
+        starting_portfolio=starting_portfolio,
+        fire_age=fire_age,
+        annual_spending_base=annual_spending_base,
+        pension_public_start_age=pension_public_start_age,
+        pension_public_net_annual=pension_public_net_annual,
+        plan_private_start_age=plan_private_start_age,
+        plan_private_duration_years=plan_private_duration_years,
+        plan_private_net_annual=plan_private_net_annual,
+        other_income_post_pension_annual=other_income_post_pension_annual,
+        pre_pension_extra_cost_annual=pre_pension_extra_cost_annual,
+        annual_returns_sequence=annual_returns_sequence,
+        inflation_rate=inflation_rate,
+        tax_rate_on_gains=tax_rate_on_gains,
+        annual_mortgage_schedule=annual_mortgage_schedule,
+        pending_installments_end_schedule=pending_installments_end_schedule,
+        property_sale_enabled=property_sale_enabled,
+        property_sale_year=property_sale_year,
+        property_sale_amount=property_sale_amount,
+        annual_extra_withdrawal_schedule=annual_extra_withdrawal_schedule,
+    )
+    return build_decumulation_frame(columns)
 
 
 def build_decumulation_table_two_stage(
@@ -1742,36 +1995,39 @@ def build_decumulation_table_two_stage(
     Stage 1: pre-pension withdrawals (typically higher).
     Stage 2: post-pension net withdrawals from portfolio (typically lower).
     """
-    rows: List[Dict[str, float]] = []
-    portfolio = float(max(0.0, starting_portfolio))
-    inflation_factor = 1.0
-
-    for year in range(1, years_in_retirement + 1):
-        tramo = "Pre-pensión" if year <= stage1_years else "Post-pensión"
-        retirada_base = annual_withdrawal_stage1 if year <= stage1_years else annual_withdrawal_stage2
-        capital_inicial = portfolio
-        retirada = retirada_base * inflation_factor
-        growth_gross = capital_inicial * expected_return
-        tax_growth = max(0.0, growth_gross) * max(0.0, tax_rate_on_gains)
-        growth_net = growth_gross - tax_growth
-        capital_final = max(0.0, capital_inicial + growth_net - retirada)
-
-        rows.append(
-            {
-                "Año jubilación": year,
-                "Tramo": tramo,
-                "Capital inicial (€)": capital_inicial,
-                "Retirada anual (€)": retirada,
-                "Crecimiento neto (€)": growth_net,
-                "Capital final (€)": capital_final,
-                "Capital agotado": capital_final <= 0,
-            }
+    years_in_retirement = max(0, int(years_in_retirement))
+    if years_in_retirement == 0:
+        return pd.DataFrame()
+    years = np.arange(1, years_in_retirement + 1, dtype=np.int64)
+    retirada_col = (
+        np.where(years <= stage1_years, annual_withdrawal_stage1, annual_withdrawal_stage2)
+        * build_inflation_factors(inflation_rate, years_in_retirement)
+    )
+    capital_inicial_col, growth_net_col, capital_final_col = (
+        path[0]
+        for path in simulate_capital_paths(
+            [starting_portfolio],
+            np.full((1, years_in_retirement), expected_return, dtype=np.float64),
+            retirada_col,
+            np.zeros(years_in_retirement, dtype=np.float64),
+            tax_rate_on_gains,
         )
+    )
 
-        portfolio = capital_final
-        inflation_factor *= (1 + inflation_rate)
-
-    return pd.DataFrame(rows)
+    return pd.DataFrame(
+        {
+            "Año jubilación": years,
+            "Tramo": pd.Categorical.from_codes(
+                (years > stage1_years).astype(np.int8),
+                categories=list(DECUM_TRAMO_LABELS),
+            ),
+            "Capital inicial (€)": capital_inicial_col,
+            "Retirada anual (€)": retirada_col,
+            "Crecimiento neto (€)": growth_net_col,
+            "Capital final (€)": capital_final_col,
+            "Capital agotado": capital_final_col <= 0,
+        }
+    )
 
 
 def build_decumulation_table_two_stage_schedule(
@@ -1862,6 +2118,25 @@ def build_decumulation_table_two_phase_net_withdrawal(
     )
 
 
+@lru_cache(maxsize=256)
+def _retirement_mortgage_schedule(
+    primary_pending_at_fire: int,
+    investment_pending_at_fire: int,
+    primary_payment: float,
+    investment_payment: float,
+    years_in_retirement: int,
+) -> Tuple[Tuple[float, ...], Tuple[int, ...]]:
+    months_end_of_year = np.arange(1, max(0, years_in_retirement) + 1, dtype=np.int64) * 12
+    months_before_year = months_end_of_year - 12
+    months_primary = np.clip(primary_pending_at_fire - months_before_year, 0, 12)
+    months_investment = np.clip(investment_pending_at_fire - months_before_year, 0, 12)
+    annual_schedule = np.maximum(months_primary * primary_payment + months_investment * investment_payment, 0.0)
+    installments_end_schedule = np.maximum(primary_pending_at_fire - months_end_of_year, 0) + np.maximum(
+        investment_pending_at_fire - months_end_of_year, 0
+    )
+    return tuple(annual_schedule.tolist()), tuple(installments_end_schedule.tolist())
+
+
 def build_retirement_mortgage_schedule(params: Dict[str, Any], years_in_retirement: int) -> Tuple[List[float], List[int]]:
     """Build annual mortgage outflow schedule during retirement.
 
@@ -1899,18 +2174,14 @@ def build_retirement_mortgage_schedule(params: Dict[str, Any], years_in_retireme
         else 0.0
     )
 
-    annual_schedule: List[float] = []
-    installments_end_schedule: List[int] = []
-    for year in range(1, years_in_retirement + 1):
-        months_before_year = (year - 1) * 12
-        months_primary_this_year = max(0, min(12, primary_pending_at_fire - months_before_year))
-        months_investment_this_year = max(0, min(12, investment_pending_at_fire - months_before_year))
-        annual_cost = (months_primary_this_year * primary_payment) + (months_investment_this_year * investment_payment)
-        remaining_end = max(0, primary_pending_at_fire - (year * 12)) + max(0, investment_pending_at_fire - (year * 12))
-        annual_schedule.append(float(max(0.0, annual_cost)))
-        installments_end_schedule.append(int(remaining_end))
-
-    return annual_schedule, installments_end_schedule
+    annual_schedule, installments_end_schedule = _retirement_mortgage_schedule(
+        primary_pending_at_fire,
+        investment_pending_at_fire,
+        primary_payment,
+        investment_payment,
+        int(years_in_retirement),
+    )
+    return list(annual_schedule), list(installments_end_schedule)
 
 
 def render_decumulation_chart(
@@ -1921,41 +2192,38 @@ def render_decumulation_chart(
     backtesting_window_mode: str = "auto",
 ) -> None:
     """Render retirement decumulation chart with percentile cones and P50 cashflow context."""
-    required = {"P5", "P25", "P50", "P75", "P95"}
-    if not required.issubset(dec_tables.keys()):
-        return
-    if any(dec_tables[k].empty for k in required):
+    percentile_tables = [dec_tables.get(label) for label in DECUM_BACKTEST_PERCENTILES]
+    if any(df is None or len(df) == 0 for df in percentile_tables):
         return
 
-    def _capital_path(df: pd.DataFrame) -> np.ndarray:
-        start_cap = float(df.iloc[0]["Capital inicial (€)"])
-        end_caps = df["Capital final (€)"].astype(float).to_numpy()
-        return np.concatenate(([start_cap], end_caps))
-
     years = np.arange(0, years_in_retirement + 1)
-    p5 = _capital_path(dec_tables["P5"])
-    p25 = _capital_path(dec_tables["P25"])
-    p50 = _capital_path(dec_tables["P50"])
-    p75 = _capital_path(dec_tables["P75"])
-    p95 = _capital_path(dec_tables["P95"])
+    # One (percentile, year) matrix: starting capital followed by each year-end capital.
+    capital_paths = np.empty((len(DECUM_BACKTEST_PERCENTILES), years_in_retirement + 1), dtype=np.float64)
+    for row, df in enumerate(percentile_tables):
+        capital_paths[row, 0] = df["Capital inicial (€)"].iat[0]
+        capital_paths[row, 1:] = df["Capital final (€)"].to_numpy(dtype=np.float64, copy=False)
+    p5, p25, p50, p75, p95 = capital_paths
     # Interpolated central third around median (P33-P67) for tighter readability.
-    p33 = p25 + 0.16 * (p75 - p25)
-    p67 = p25 + 0.84 * (p75 - p25)
-
-    p50_df = dec_tables["P50"]
-    retirada_p50 = np.concatenate(
-        ([np.nan], p50_df["Retirada anual (€)"].astype(float).to_numpy())
+    central_spread = p75 - p25
+    p33 = p25 + 0.16 * central_spread
+    p67 = p25 + 0.84 * central_spread
+    # The band edges have no hover, so float32 (exact to the euro only below
+    # 2^24 ≈ 16.7 M€) is enough there and halves the typed-array payload
+    # Plotly sends to the browser. Traces with a €%{y:,.0f} hover stay float64.
+    p5, p25, p75, p95, p33, p67 = (
+        series.astype(np.float32) for series in (p5, p25, p75, p95, p33, p67)
     )
-    ingresos_p50 = (
-        p50_df["Ingreso no cartera implícito (€)"].astype(float).to_numpy()
-        if "Ingreso no cartera implícito (€)" in p50_df.columns
-        else (
-            p50_df["Ingresos totales (€)"].astype(float).to_numpy()
-            if "Ingresos totales (€)" in p50_df.columns
-            else np.zeros(len(p50_df), dtype=float)
-        )
+
+    p50_df = percentile_tables[DECUM_BACKTEST_PERCENTILES.index("P50")]
+    # Year 0 has no flow; the buffers are filled straight from the columns.
+    retirada_p50 = np.full(len(p50_df) + 1, np.nan, dtype=np.float64)
+    ingresos_p50 = np.full(len(p50_df) + 1, np.nan, dtype=np.float64)
+    retirada_p50[1:] = p50_df["Retirada anual (€)"].to_numpy(dtype=np.float64, copy=False)
+    income_column = next(
+        (col for col in ("Ingreso no cartera implícito (€)", "Ingresos totales (€)") if col in p50_df.columns),
+        None,
     )
-    ingresos_p50 = np.concatenate(([np.nan], ingresos_p50))
+    ingresos_p50[1:] = p50_df[income_column].to_numpy(dtype=np.float64, copy=False) if income_column else 0.0
 
     central_view = st.checkbox(
         "Vista centrada (banda P33-P67)",
@@ -1983,150 +2251,87 @@ def render_decumulation_chart(
     else:
         fig = make_subplots(specs=[[{"secondary_y": True}]])
 
-    if not central_view:
-        fig.add_trace(
-            go.Scatter(
+    def _band_traces(upper: np.ndarray, lower: np.ndarray, name: str, fillcolor: str) -> List[Dict[str, Any]]:
+        return [
+            dict(
+                type="scatter",
                 x=years,
-                y=p95,
+                y=upper,
                 fill=None,
                 mode="lines",
                 line_color="rgba(0,0,0,0)",
                 showlegend=False,
                 hoverinfo="skip",
             ),
-            row=1,
-            col=1,
-        )
-        fig.add_trace(
-            go.Scatter(
+            dict(
+                type="scatter",
                 x=years,
-                y=p5,
+                y=lower,
                 fill="tonexty",
                 mode="lines",
                 line_color="rgba(0,0,0,0)",
-                name="Capital P5-P95",
-                fillcolor="rgba(31, 119, 180, 0.15)",
+                name=name,
+                fillcolor=fillcolor,
                 hoverinfo="skip",
             ),
-            row=1,
-            col=1,
-        )
+        ]
+
+    # Collect every trace first and hand them to Plotly in a single add_traces call.
+    capital_traces: List[Dict[str, Any]] = []
+    if not central_view:
+        capital_traces += _band_traces(p95, p5, "Capital P5-P95", "rgba(31, 119, 180, 0.15)")
     if central_view:
-        fig.add_trace(
-            go.Scatter(
-                x=years,
-                y=p67,
-                fill=None,
-                mode="lines",
-                line_color="rgba(0,0,0,0)",
-                showlegend=False,
-                hoverinfo="skip",
-            ),
-            row=1,
-            col=1,
-        )
-        fig.add_trace(
-            go.Scatter(
-                x=years,
-                y=p33,
-                fill="tonexty",
-                mode="lines",
-                line_color="rgba(0,0,0,0)",
-                name="Capital P33-P67",
-                fillcolor="rgba(31, 119, 180, 0.30)",
-                hoverinfo="skip",
-            ),
-            row=1,
-            col=1,
-        )
+        capital_traces += _band_traces(p67, p33, "Capital P33-P67", "rgba(31, 119, 180, 0.30)")
     else:
-        fig.add_trace(
-            go.Scatter(
-                x=years,
-                y=p75,
-                fill=None,
-                mode="lines",
-                line_color="rgba(0,0,0,0)",
-                showlegend=False,
-                hoverinfo="skip",
-            ),
-            row=1,
-            col=1,
-        )
-        fig.add_trace(
-            go.Scatter(
-                x=years,
-                y=p25,
-                fill="tonexty",
-                mode="lines",
-                line_color="rgba(0,0,0,0)",
-                name="Capital P25-P75",
-                fillcolor="rgba(31, 119, 180, 0.30)",
-                hoverinfo="skip",
-            ),
-            row=1,
-            col=1,
-        )
-    fig.add_trace(
-        go.Scatter(
+        capital_traces += _band_traces(p75, p25, "Capital P25-P75", "rgba(31, 119, 180, 0.30)")
+    capital_traces.append(
+        dict(
+            type="scatter",
             x=years,
             y=p50,
             mode="lines",
             name="Capital mediano (P50)",
             line=dict(color="rgb(31, 119, 180)", width=3),
             hovertemplate="<b>Año %{x}</b><br>Capital P50: €%{y:,.0f}<extra></extra>",
-        ),
-        row=1,
-        col=1,
+        )
     )
 
-    if chart_mode == "Separado (recomendado)":
-        fig.add_trace(
-            go.Scatter(
-                x=years,
-                y=retirada_p50,
-                mode="lines",
-                name="Retirada anual P50",
-                line=dict(color="rgba(231, 76, 60, 0.95)", width=2.5, dash="dot"),
-                hovertemplate="<b>Año %{x}</b><br>Retirada: €%{y:,.0f}<extra></extra>",
-            ),
-            row=2,
-            col=1,
-        )
-        fig.add_trace(
-            go.Scatter(
-                x=years,
-                y=ingresos_p50,
-                mode="lines",
-                name="Ingresos no cartera P50",
-                line=dict(color="rgba(46, 204, 113, 0.95)", width=2.5, dash="dot"),
-                hovertemplate="<b>Año %{x}</b><br>Ingresos: €%{y:,.0f}<extra></extra>",
-            ),
-            row=2,
-            col=1,
+    separated = chart_mode == "Separado (recomendado)"
+    flow_width = 2.5 if separated else 2
+    flow_traces = [
+        dict(
+            type="scatter",
+            x=years,
+            y=retirada_p50,
+            mode="lines",
+            name="Retirada anual P50",
+            line=dict(color="rgba(231, 76, 60, 0.95)", width=flow_width, dash="dot"),
+            hovertemplate="<b>Año %{x}</b><br>Retirada: €%{y:,.0f}<extra></extra>",
+        ),
+        dict(
+            type="scatter",
+            x=years,
+            y=ingresos_p50,
+            mode="lines",
+            name="Ingresos no cartera P50",
+            line=dict(color="rgba(46, 204, 113, 0.95)", width=flow_width, dash="dot"),
+            hovertemplate="<b>Año %{x}</b><br>Ingresos: €%{y:,.0f}<extra></extra>",
+        ),
+    ]
+
+    all_traces = capital_traces + flow_traces
+    if separated:
+        fig.add_traces(
+            all_traces,
+            rows=[1] * len(capital_traces) + [2] * len(flow_traces),
+            cols=[1] * len(all_traces),
         )
     else:
-        fig.add_trace(
-            go.Scatter(
-                x=years,
-                y=retirada_p50,
-                mode="lines",
-                name="Retirada anual P50",
-                line=dict(color="rgba(231, 76, 60, 0.95)", width=2, dash="dot"),
-                hovertemplate="<b>Año %{x}</b><br>Retirada: €%{y:,.0f}<extra></extra>",
-            ),
-            secondary_y=True,
-        )
-        fig.add_trace(
-            go.Scatter(
-                x=years,
-                y=ingresos_p50,
-                mode="lines",
-                name="Ingresos no cartera P50",
-                line=dict(color="rgba(46, 204, 113, 0.95)", width=2, dash="dot"),
-                hovertemplate="<b>Año %{x}</b><br>Ingresos: €%{y:,.0f}<extra></extra>",
-            ),
-            secondary_y=True,
+        fig.add_traces(
+            all_traces,
+            rows=[1] * len(all_traces),
+            cols=[1] * len(all_traces),
+            secondary_ys=[False] * len(capital_traces) + [True] * len(flow_traces),
         )
 
     if "Tramo" in p50_df.columns:
@@ -2165,14 +2370,16 @@ def render_decumulation_chart(
     fig.update_xaxes(title_text="" if chart_mode == "Separado (recomendado)" else "Años desde FIRE", row=1, col=1)
     if chart_mode == "Separado (recomendado)":
         fig.update_xaxes(title_text="Años desde FIRE", row=2, col=1)
+    p67_max = float(np.nanmax(p67))
     if central_view:
-        central_max = float(np.nanmax(p67)) if np.isfinite(np.nanmax(p67)) else 0.0
+        central_max = p67_max if np.isfinite(p67_max) else 0.0
         central_max = max(1.0, central_max * 1.15)
         fig.update_yaxes(title_text="Capital (€, nominal)", tickformat=",.0f", range=[0.0, central_max], row=1, col=1)
     else:
         fig.update_yaxes(title_text="Capital (€, nominal)", tickformat=",.0f", row=1, col=1)
     if chart_mode == "Separado (recomendado)":
-        flow_max = float(np.nanmax(np.nan_to_num(np.concatenate([retirada_p50, ingresos_p50]), nan=0.0)))
+        flows = np.concatenate([retirada_p50, ingresos_p50])
+        flow_max = float(np.nanmax(np.nan_to_num(flows, copy=False, nan=0.0)))
         fig.update_yaxes(
             title_text="Flujo anual (€, nominal)",
             tickformat=",.0f",
@@ -2184,7 +2391,7 @@ def render_decumulation_chart(
         fig.update_yaxes(title_text="Flujo anual (€, nominal)", tickformat=",.0f", secondary_y=True)
 
     render_plotly_chart(fig, key=f"decumulation_chart_{years_in_retirement}")
-    if central_view and float(np.nanmax(p95)) > float(np.nanmax(p67)) * 2.0:
+    if central_view and float(np.nanmax(p95)) > p67_max * 2.0:
         st.caption(
             "Vista P33-P67 activa: se prioriza lectura de mediana y banda central. "
             "El escenario extremo P95 sigue disponible desactivando esta opción."
@@ -2263,16 +2470,10 @@ def render_decumulation_box(simulation_results: Dict, params: Dict) -> None:
     if not isinstance(raw_return_map, dict):
         raw_return_map = {k: default_ret for k in percentile_labels}
 
-    raw_returns = [raw_return_map[label] for label in percentile_labels]
+    raw_returns = np.asarray([raw_return_map[label] for label in percentile_labels], dtype=float)
     # Enforce coherence: favorable percentiles cannot have lower expected return than adverse ones.
-    coherent_returns: List[float] = []
-    current_floor = -1.0
-    for r in raw_returns:
-        current_floor = max(current_floor, r)
-        coherent_returns.append(float(min(0.60, max(-0.60, current_floor))))
-    scenario_expected_return = {
-        label: coherent_returns[idx] for idx, label in enumerate(percentile_labels)
-    }
+    coherent_returns = np.clip(np.maximum.accumulate(raw_returns), -0.60, 0.60)
+    scenario_expected_return = dict(zip(percentile_labels, coherent_returns.tolist()))
     decumulation_backtesting_effective = False
     backtesting_strategy = str(params.get("historical_strategy", "sp500_us_total_return"))
     backtesting_strategy_label = str(
@@ -2302,16 +2503,22 @@ def render_decumulation_box(simulation_results: Dict, params: Dict) -> None:
     )
     retirement_sale_year = int(params.get("property_sale_year_retirement", 0))
     retirement_sale_amount = float(params.get("property_sale_amount_net", 0.0))
-    drop_factor = 1.0 + float(params.get("inflacion", 0.0))
-    annual_extra_withdrawal_schedule: List[float] = []
-    for year in range(1, years_in_retirement + 1):
-        extra_today = 0.0
-        if accumulation_sale_enabled:
-            # Sale happened before FIRE, so rental/home-savings drop applies from first retirement year.
-            extra_today += rental_drop_annual_today + home_savings_drop_annual_today
-        elif retirement_sale_enabled and year >= retirement_sale_year:
-            extra_today += rental_drop_annual_today + home_savings_drop_annual_today
-        annual_extra_withdrawal_schedule.append(extra_today * (drop_factor ** (year - 1)))
+    retirement_years = np.arange(1, max(0, years_in_retirement) + 1)
+    # (1 + inflation) ** (year - 1) for every retirement year, shared by the
+    # extra-withdrawal schedule, the bridge estimate and the rental income below.
+    retirement_inflation = build_inflation_factors(float(params.get("inflacion", 0.0)), len(retirement_years))
+    if accumulation_sale_enabled:
+        # Sale happened before FIRE, so rental/home-savings drop applies from first retirement year.
+        extra_active = np.ones(len(retirement_years))
+    elif retirement_sale_enabled:
+        extra_active = (retirement_years >= retirement_sale_year).astype(float)
+    else:
+        extra_active = np.zeros(len(retirement_years))
+    annual_extra_withdrawal_schedule: List[float] = (
+        extra_active
+        * (rental_drop_annual_today + home_savings_drop_annual_today)
+        * retirement_inflation
+    ).tolist()
     fire_age = int(params["edad_objetivo"])
     use_simple_two_phase = retirement_model_mode == "SIMPLE_TWO_PHASE"
     use_advanced_two_stage = bool(
@@ -2426,6 +2633,64 @@ def render_decumulation_box(simulation_results: Dict, params: Dict) -> None:
             annual_extra_withdrawal_schedule=annual_extra_withdrawal_schedule,
         )
 
+    def _build_dec_table_constant_return(start_portfolio: float, expected_return: float) -> pd.DataFrame:
+        if use_simple_two_phase:
+            return build_decumulation_table_two_phase_net_withdrawal(
+                starting_portfolio=start_portfolio,
+                fire_age=fire_age,
+                years_in_retirement=years_in_retirement,
+                phase2_start_age=pension_public_start_age,
+                stage1_net_withdrawal_annual=annual_withdrawal_stage1,
+                stage2_net_withdrawal_annual=annual_withdrawal_stage2,
+                inflation_rate=params["inflacion"],
+                tax_rate_on_gains=tax_rate_hint,
+                expected_return=expected_return,
+                annual_mortgage_schedule=annual_mortgage_schedule,
+                pending_installments_end_schedule=pending_installments_end_schedule,
+                property_sale_enabled=retirement_sale_enabled,
+                property_sale_year=retirement_sale_year,
+                property_sale_amount=retirement_sale_amount,
+                annual_extra_withdrawal_schedule=annual_extra_withdrawal_schedule,
+                stage2_non_portfolio_income_annual=annual_post_pension_income_simple,
+            )
+        if use_advanced_two_stage:
+            return build_decumulation_table_two_stage_schedule(
+                starting_portfolio=start_portfolio,
+                fire_age=fire_age,
+                years_in_retirement=years_in_retirement,
+                annual_spending_base=annual_withdrawal_base,
+                pension_public_start_age=pension_public_start_age,
+                pension_public_net_annual=pension_public_net_annual,
+                plan_private_start_age=plan_private_start_age,
+                plan_private_duration_years=plan_private_duration_years,
+                plan_private_net_annual=plan_private_net_annual,
+                other_income_post_pension_annual=other_income_post,
+                pre_pension_extra_cost_annual=float(params.get("coste_pre_pension_anual", 0.0)),
+                expected_return=expected_return,
+                inflation_rate=params["inflacion"],
+                tax_rate_on_gains=tax_rate_hint,
+                annual_mortgage_schedule=annual_mortgage_schedule,
+                pending_installments_end_schedule=pending_installments_end_schedule,
+                property_sale_enabled=retirement_sale_enabled,
+                property_sale_year=retirement_sale_year,
+                property_sale_amount=retirement_sale_amount,
+                annual_extra_withdrawal_schedule=annual_extra_withdrawal_schedule,
+            )
+        return build_decumulation_table(
+            starting_portfolio=start_portfolio,
+            annual_withdrawal_base=annual_withdrawal_base,
+            years_in_retirement=years_in_retirement,
+            expected_return=expected_return,
+            inflation_rate=params["inflacion"],
+            tax_rate_on_gains=tax_rate_hint,
+            annual_mortgage_schedule=annual_mortgage_schedule,
+            pending_installments_end_schedule=pending_installments_end_schedule,
+            property_sale_enabled=retirement_sale_enabled,
+            property_sale_year=retirement_sale_year,
+            property_sale_amount=retirement_sale_amount,
+            annual_extra_withdrawal_schedule=annual_extra_withdrawal_schedule,
+        )
+
     dec_tables: Dict[str, pd.DataFrame] = {}
     decumulation_backtesting_returns_are_ordered = False
     decumulation_backtesting_window_mode = "auto"
@@ -2433,10 +2698,10 @@ def render_decumulation_box(simulation_results: Dict, params: Dict) -> None:
         historical_returns = None
         historical_years = None
         try:
-            historical_years, historical_returns, _ = load_historical_annual_series(strategy=backtesting_strategy)
+            historical_years, historical_returns, _ = load_cached_historical_series(backtesting_strategy)
         except Exception:
             try:
-                historical_returns = load_historical_annual_returns(strategy=backtesting_strategy)
+                historical_returns = load_cached_historical_returns(backtesting_strategy)
                 historical_years = np.arange(1, len(historical_returns) + 1)
             except Exception as exc:
                 st.warning(
@@ -2463,68 +2728,60 @@ def render_decumulation_box(simulation_results: Dict, params: Dict) -> None:
                 key="decumulation_window_selection_mode_key",
             )
 
-            def _compute_auto_selection_maps() -> Tuple[
-                Dict[str, pd.DataFrame],
-                Dict[str, float],
-                Dict[str, Dict[str, float]],
-            ]:
-                auto_tables: Dict[str, pd.DataFrame] = {}
-                auto_returns: Dict[str, float] = {}
-                auto_meta: Dict[str, Dict[str, float]] = {}
-                for pct_label, start_portfolio in starting_portfolios.items():
-                    candidates: List[Tuple[float, float, int, pd.DataFrame]] = []
-                    for idx in range(windows_total):
-                        annual_seq = np.asarray(
-                            historical_returns[idx : idx + years_in_retirement],
-                            dtype=float,
-                        )
-                        table = _build_dec_table_from_sequence(start_portfolio, annual_seq)
-                        final_cap = float(table.iloc[-1]["Capital final (€)"]) if not table.empty else 0.0
-                        total_growth = float(np.prod(1.0 + annual_seq))
-                        cagr = (
-                            float(total_growth ** (1.0 / years_in_retirement) - 1.0)
-                            if years_in_retirement > 0 and total_growth > 0.0
-                            else -1.0
-                        )
-                        candidates.append((final_cap, cagr, idx, table))
-                    candidates.sort(key=lambda x: x[0])
-                    q = target_pct.get(pct_label, 0.5)
-                    rank = int(round((len(candidates) - 1) * q))
-                    rank = max(0, min(len(candidates) - 1, rank))
-                    _, cagr_sel, window_idx, table_sel = candidates[rank]
-                    auto_tables[pct_label] = table_sel
-                    auto_returns[pct_label] = cagr_sel
-                    start_year = int(valid_start_years[window_idx])
-                    end_year = int(start_year + years_in_retirement - 1)
-                    auto_meta[pct_label] = {
-                        "window_index": float(window_idx + 1),
-                        "windows_total": float(windows_total),
-                        "start_year": float(start_year),
-                        "end_year": float(end_year),
-                    }
-                return auto_tables, auto_returns, auto_meta
+            # One float64 cast of the history; every window below is a zero-copy row view.
+            return_windows = np.lib.stride_tricks.sliding_window_view(
+                np.ascontiguousarray(historical_returns, dtype=np.float64),
+                years_in_retirement,
+            )
+            # Annualized return of every window in one pass; a window that loses
+            # everything (some return <= -100%) keeps the -1.0 sentinel.
+            window_survives = np.all(return_windows > -1.0, axis=1)
+            window_cagrs = np.where(
+                window_survives,
+                np.expm1(
+                    np.log1p(np.where(return_windows > -1.0, return_windows, 0.0)).sum(axis=1)
+                    / years_in_retirement
+                ),
+                -1.0,
+            )
+
+            # Withdrawals and sale inflows do not depend on the return path; one
+            # table supplies that schedule to the ranking pass and to every
+            # materialized window below.
+            schedule_table = _build_dec_table_from_sequence(0.0, return_windows[0])
+            window_withdrawals = schedule_table["Retirada anual (€)"].to_numpy(dtype=float)
+            window_inflows = schedule_table["Venta inmueble (€)"].to_numpy(dtype=float)
+
+            # Auto, template, comparison and active selections often land on the
+            # same (percentile, window) pair; each table is built once per render.
+            window_tables: Dict[Tuple[str, int], pd.DataFrame] = {}
 
             def _compute_from_window_indices(
                 window_indices: Dict[str, int],
             ) -> Tuple[Dict[str, pd.DataFrame], Dict[str, float], Dict[str, Dict[str, float]]]:
+                selected = {
+                    pct_label: max(0, min(windows_total - 1, int(window_indices.get(pct_label, 0))))
+                    for pct_label in starting_portfolios
+                }
+                missing = [(lbl, idx) for lbl, idx in selected.items() if (lbl, idx) not in window_tables]
+                if missing:
+                    window_tables.update(
+                        zip(
+                            missing,
+                            _decumulation_tables_from_schedule(
+                                schedule_table,
+                                np.array([starting_portfolios[lbl] for lbl, _ in missing]),
+                                return_windows[[idx for _, idx in missing]],
+                                max(0.0, tax_rate_hint),
+                            ),
+                        )
+                    )
                 tables_local: Dict[str, pd.DataFrame] = {}
                 returns_local: Dict[str, float] = {}
                 meta_local: Dict[str, Dict[str, float]] = {}
-                for pct_label, start_portfolio in starting_portfolios.items():
-                    idx = int(window_indices.get(pct_label, 0))
-                    idx = max(0, min(windows_total - 1, idx))
-                    annual_seq = np.asarray(
-                        historical_returns[idx : idx + years_in_retirement],
-                        dtype=float,
-                    )
-                    table = _build_dec_table_from_sequence(start_portfolio, annual_seq)
-                    tables_local[pct_label] = table
-                    total_growth = float(np.prod(1.0 + annual_seq))
-                    returns_local[pct_label] = (
-                        float(total_growth ** (1.0 / years_in_retirement) - 1.0)
-                        if years_in_retirement > 0 and total_growth > 0.0
-                        else -1.0
-                    )
+                for pct_label, idx in selected.items():
+                    tables_local[pct_label] = window_tables[(pct_label, idx)]
+                    returns_local[pct_label] = float(window_cagrs[idx])
                     start_year = int(valid_start_years[idx])
                     end_year = int(start_year + years_in_retirement - 1)
                     meta_local[pct_label] = {
@@ -2535,40 +2792,35 @@ def render_decumulation_box(simulation_results: Dict, params: Dict) -> None:
                     }
                 return tables_local, returns_local, meta_local
 
+            # Rank every window by final capital without building a table per window;
+            # only the selected windows are materialized.
+            pct_order = list(starting_portfolios)
+            final_caps = simulate_capital_paths(
+                np.array([starting_portfolios[lbl] for lbl in pct_order])[:, None],
+                return_windows,
+                window_withdrawals,
+                window_inflows,
+                tax_rate_hint,
+            )[2][:, :, -1]
+            # Each percentile only needs its own rank from its row, so select
+            # instead of sorting every window.
+            pct_ranks = np.clip(
+                np.round(
+                    (windows_total - 1) * np.array([target_pct.get(lbl, 0.5) for lbl in pct_order])
+                ).astype(np.intp),
+                0,
+                windows_total - 1,
+            )
+            auto_window_indices: Dict[str, int] = dict(
+                zip(pct_order, _stable_rank_indices(final_caps, pct_ranks).tolist())
+            )
+            auto_tables_cmp, auto_returns_cmp, auto_meta_cmp = _compute_from_window_indices(auto_window_indices)
+
             if window_selection_mode == "Automático (percentiles por capital final)":
                 decumulation_backtesting_window_mode = "auto"
-                for label, start_portfolio in starting_portfolios.items():
-                    candidates: List[Tuple[float, float, int, pd.DataFrame]] = []
-                    for idx in range(windows_total):
-                        annual_seq = np.asarray(
-                            historical_returns[idx : idx + years_in_retirement],
-                            dtype=float,
-                        )
-                        table = _build_dec_table_from_sequence(start_portfolio, annual_seq)
-                        final_cap = float(table.iloc[-1]["Capital final (€)"]) if not table.empty else 0.0
-                        total_growth = float(np.prod(1.0 + annual_seq))
-                        cagr = (
-                            float(total_growth ** (1.0 / years_in_retirement) - 1.0)
-                            if years_in_retirement > 0 and total_growth > 0.0
-                            else -1.0
-                        )
-                        candidates.append((final_cap, cagr, idx, table))
-
-                    candidates.sort(key=lambda x: x[0])
-                    q = target_pct.get(label, 0.5)
-                    rank = int(round((len(candidates) - 1) * q))
-                    rank = max(0, min(len(candidates) - 1, rank))
-                    _, cagr_sel, window_idx, table_sel = candidates[rank]
-                    dec_tables[label] = table_sel
-                    scenario_expected_return[label] = cagr_sel
-                    start_year = int(valid_start_years[window_idx])
-                    end_year = int(start_year + years_in_retirement - 1)
-                    scenario_window_meta[label] = {
-                        "window_index": float(window_idx + 1),
-                        "windows_total": float(windows_total),
-                        "start_year": float(start_year),
-                        "end_year": float(end_year),
-                    }
+                dec_tables.update(auto_tables_cmp)
+                scenario_expected_return.update(auto_returns_cmp)
+                scenario_window_meta.update(auto_meta_cmp)
                 sorted_returns = sorted(
                     float(scenario_expected_return.get(lbl, default_ret))
                     for lbl in percentile_labels
@@ -2630,40 +2882,27 @@ def render_decumulation_box(simulation_results: Dict, params: Dict) -> None:
                         start_year_by_percentile=manual_years,
                     )
 
-                for label, start_portfolio in starting_portfolios.items():
-                    idx = int(selected_window_indices.get(label, 0))
-                    idx = max(0, min(windows_total - 1, idx))
-                    annual_seq = np.asarray(
-                        historical_returns[idx : idx + years_in_retirement],
-                        dtype=float,
-                    )
-                    table = _build_dec_table_from_sequence(start_portfolio, annual_seq)
-                    dec_tables[label] = table
-                    total_growth = float(np.prod(1.0 + annual_seq))
-                    scenario_expected_return[label] = (
-                        float(total_growth ** (1.0 / years_in_retirement) - 1.0)
-                        if years_in_retirement > 0 and total_growth > 0.0
-                        else -1.0
-                    )
-                    start_year = int(valid_start_years[idx])
-                    end_year = int(start_year + years_in_retirement - 1)
-                    scenario_window_meta[label] = {
-                        "window_index": float(idx + 1),
-                        "windows_total": float(windows_total),
-                        "start_year": float(start_year),
-                        "end_year": float(end_year),
+                selected_tables, selected_returns, selected_meta = _compute_from_window_indices(
+                    selected_window_indices
+                )
+                dec_tables.update(selected_tables)
+                scenario_expected_return.update(selected_returns)
+                scenario_window_meta.update(selected_meta)
+                window_metas = [scenario_window_meta.get(label, {}) for label in percentile_labels]
+                window_table = pd.DataFrame(
+                    {
+                        "Escenario": percentile_labels,
+                        "Ventana": [
+                            f"{int(meta.get('start_year', 0))}-{int(meta.get('end_year', 0))}"
+                            for meta in window_metas
+                        ],
+                        "Índice": [
+                            f"#{int(meta.get('window_index', 0))}/{int(meta.get('windows_total', 0))}"
+                            for meta in window_metas
+                        ],
                     }
-                window_rows = []
-                for label in percentile_labels:
-                    meta = scenario_window_meta.get(label, {})
-                    window_rows.append(
-                        {
-                            "Escenario": label,
-                            "Ventana": f"{int(meta.get('start_year', 0))}-{int(meta.get('end_year', 0))}",
-                            "Índice": f"#{int(meta.get('window_index', 0))}/{int(meta.get('windows_total', 0))}",
-                        }
-                    )
-                st.dataframe(pd.DataFrame(window_rows), use_container_width=True, hide_index=True)
+                )
+                st.dataframe(window_table, use_container_width=True, hide_index=True)
 
             comparison_display_rows: List[Dict[str, Any]] = []
             comparison_rank_rows: List[Dict[str, Any]] = []
@@ -2688,9 +2927,9 @@ def render_decumulation_box(simulation_results: Dict, params: Dict) -> None:
                 returns_map: Dict[str, float],
                 meta_map: Dict[str, Dict[str, float]],
             ) -> None:
-                p5_final = float(tables_map["P5"].iloc[-1]["Capital final (€)"]) if not tables_map["P5"].empty else 0.0
-                p50_final = float(tables_map["P50"].iloc[-1]["Capital final (€)"]) if not tables_map["P50"].empty else 0.0
-                p95_final = float(tables_map["P95"].iloc[-1]["Capital final (€)"]) if not tables_map["P95"].empty else 0.0
+                p5_final = float(tables_map["P5"]["Capital final (€)"].iat[-1]) if not tables_map["P5"].empty else 0.0
+                p50_final = float(tables_map["P50"]["Capital final (€)"].iat[-1]) if not tables_map["P50"].empty else 0.0
+                p95_final = float(tables_map["P95"]["Capital final (€)"].iat[-1]) if not tables_map["P95"].empty else 0.0
                 spread = p95_final - p5_final
                 p5_depletion = _depletion_year(tables_map["P5"])
                 p50_depletion = _depletion_year(tables_map["P50"])
@@ -2724,7 +2963,6 @@ def render_decumulation_box(simulation_results: Dict, params: Dict) -> None:
                     }
                 )
 
-            auto_tables_cmp, auto_returns_cmp, auto_meta_cmp = _compute_auto_selection_maps()
             _append_comparison_row("Automático (percentiles por capital final)", auto_tables_cmp, auto_returns_cmp, auto_meta_cmp)
 
             for template_name in (
@@ -2781,78 +3019,38 @@ def render_decumulation_box(simulation_results: Dict, params: Dict) -> None:
             )
 
     if not dec_tables:
-        for label, start_portfolio in starting_portfolios.items():
-            expected_return_scenario = scenario_expected_return.get(label, default_ret)
-            if use_simple_two_phase:
-                dec_tables[label] = build_decumulation_table_two_phase_net_withdrawal(
-                    starting_portfolio=start_portfolio,
-                    fire_age=fire_age,
-                    years_in_retirement=years_in_retirement,
-                    phase2_start_age=pension_public_start_age,
-                    stage1_net_withdrawal_annual=annual_withdrawal_stage1,
-                    stage2_net_withdrawal_annual=annual_withdrawal_stage2,
-                    inflation_rate=params["inflacion"],
-                    tax_rate_on_gains=tax_rate_hint,
-                    expected_return=expected_return_scenario,
-                    annual_mortgage_schedule=annual_mortgage_schedule,
-                    pending_installments_end_schedule=pending_installments_end_schedule,
-                    property_sale_enabled=retirement_sale_enabled,
-                    property_sale_year=retirement_sale_year,
-                    property_sale_amount=retirement_sale_amount,
-                    annual_extra_withdrawal_schedule=annual_extra_withdrawal_schedule,
-                    stage2_non_portfolio_income_annual=annual_post_pension_income_simple,
-                )
-            elif use_advanced_two_stage:
-                dec_tables[label] = build_decumulation_table_two_stage_schedule(
-                    starting_portfolio=start_portfolio,
-                    fire_age=fire_age,
-                    years_in_retirement=years_in_retirement,
-                    annual_spending_base=annual_withdrawal_base,
-                    pension_public_start_age=pension_public_start_age,
-                    pension_public_net_annual=pension_public_net_annual,
-                    plan_private_start_age=plan_private_start_age,
-                    plan_private_duration_years=plan_private_duration_years,
-                    plan_private_net_annual=plan_private_net_annual,
-                    other_income_post_pension_annual=other_income_post,
-                    pre_pension_extra_cost_annual=float(params.get("coste_pre_pension_anual", 0.0)),
-                    expected_return=expected_return_scenario,
-                    inflation_rate=params["inflacion"],
-                    tax_rate_on_gains=tax_rate_hint,
-                    annual_mortgage_schedule=annual_mortgage_schedule,
-                    pending_installments_end_schedule=pending_installments_end_schedule,
-                    property_sale_enabled=retirement_sale_enabled,
-                    property_sale_year=retirement_sale_year,
-                    property_sale_amount=retirement_sale_amount,
-                    annual_extra_withdrawal_schedule=annual_extra_withdrawal_schedule,
-                )
-            else:
-                dec_tables[label] = build_decumulation_table(
-                    starting_portfolio=start_portfolio,
-                    annual_withdrawal_base=annual_withdrawal_base,
-                    years_in_retirement=years_in_retirement,
-                    expected_return=expected_return_scenario,
-                    inflation_rate=params["inflacion"],
-                    tax_rate_on_gains=tax_rate_hint,
-                    annual_mortgage_schedule=annual_mortgage_schedule,
-                    pending_installments_end_schedule=pending_installments_end_schedule,
-                    property_sale_enabled=retirement_sale_enabled,
-                    property_sale_year=retirement_sale_year,
-                    property_sale_amount=retirement_sale_amount,
-                    annual_extra_withdrawal_schedule=annual_extra_withdrawal_schedule,
-                )
+        # Withdrawal and sale schedules do not depend on the starting capital or
+        # the return, so one table supplies them and only the capital carry runs
+        # per percentile, all percentiles at once.
+        pct_order = list(starting_portfolios)
+        pct_returns = np.array([scenario_expected_return.get(lbl, default_ret) for lbl in pct_order])
+        schedule_table = _build_dec_table_constant_return(starting_portfolios[pct_order[0]], float(pct_returns[0]))
+        dec_tables.update(
+            zip(
+                pct_order,
+                _decumulation_tables_from_schedule(
+                    schedule_table,
+                    np.array([starting_portfolios[lbl] for lbl in pct_order]),
+                    np.repeat(pct_returns[:, None], len(schedule_table), axis=1),
+                    max(0.0, tax_rate_hint),
+                ),
+            )
+        )
 
     if use_simple_two_phase:
         bridge_years = max(0, pension_public_start_age - fire_age)
-        bridge_capital_required = 0.0
-        for year in range(1, bridge_years + 1):
-            base = annual_withdrawal_stage1 * ((1 + params["inflacion"]) ** (year - 1))
-            mortgage = annual_mortgage_schedule[year - 1] if year - 1 < len(annual_mortgage_schedule) else 0.0
-            extra = (
-                annual_extra_withdrawal_schedule[year - 1]
-                if year - 1 < len(annual_extra_withdrawal_schedule)
-                else 0.0
-            )
-            bridge_capital_required += float(base + mortgage + extra)
+        bridge_capital_required = float(
+            (
+                annual_withdrawal_stage1
+                * (
+                    retirement_inflation[:bridge_years]
+                    if bridge_years <= len(retirement_inflation)
+                    else build_inflation_factors(params["inflacion"], bridge_years)
+                )
+                + build_padded_schedule(annual_mortgage_schedule, bridge_years)
+                + build_padded_schedule(annual_extra_withdrawal_schedule, bridge_years)
+            ).sum()
+        )
         available_fire_p50 = float(starting_portfolios.get("P50", 0.0))
         bridge_delta = available_fire_p50 - bridge_capital_required
         stage1_rate = (
@@ -2888,25 +3086,32 @@ def render_decumulation_box(simulation_results: Dict, params: Dict) -> None:
         if params.get("incluir_rentas_alquiler_en_simulacion", False)
         else 0.0
     )
+    # Emptiness per percentile, resolved once; added columns never change it.
+    tables_empty = np.fromiter(
+        (dec_tables[label].empty for label in DECUM_BACKTEST_PERCENTILES),
+        dtype=bool,
+        count=len(DECUM_BACKTEST_PERCENTILES),
+    )
     if rental_income_base > 0:
-        for label, dec_df in dec_tables.items():
-            if dec_df.empty:
+        # The sale branch is resolved once for the whole horizon; every
+        # percentile table then just reads its years from the same column.
+        retained_ratio = max(0.0, min(1.0, 1.0 - rental_drop_ratio))
+        if accumulation_sale_enabled:
+            rental_ratio = np.full(len(retirement_years), retained_ratio)
+        elif retirement_sale_enabled:
+            rental_ratio = np.where(retirement_years >= retirement_sale_year, retained_ratio, 1.0)
+        else:
+            rental_ratio = np.ones(len(retirement_years))
+        rental_income_by_year = rental_income_base * rental_ratio * retirement_inflation
+        for label, is_empty in zip(DECUM_BACKTEST_PERCENTILES, tables_empty.tolist()):
+            if is_empty:
                 continue
-            def _rental_income_for_retirement_year(y: int) -> float:
-                if accumulation_sale_enabled:
-                    ratio = 1.0 - rental_drop_ratio
-                elif retirement_sale_enabled and int(y) >= retirement_sale_year:
-                    ratio = 1.0 - rental_drop_ratio
-                else:
-                    ratio = 1.0
-                ratio = max(0.0, min(1.0, ratio))
-                return rental_income_base * ratio * ((1 + params["inflacion"]) ** max(0, int(y) - 1))
-
+            dec_df = dec_tables[label]
             dec_tables[label] = dec_df.assign(
                 **{
-                    "Ingreso alquileres (€)": dec_df["Año jubilación"].apply(
-                        _rental_income_for_retirement_year
-                    )
+                    "Ingreso alquileres (€)": rental_income_by_year[
+                        dec_df["Año jubilación"].to_numpy(dtype=np.int64) - 1
+                    ]
                 }
             )
 
@@ -2919,36 +3124,50 @@ def render_decumulation_box(simulation_results: Dict, params: Dict) -> None:
             else "No se agota"
         )
 
+    # Start/end capital as arrays over the percentile axis; the deltas are one subtraction.
+    start_capitals = np.fromiter(
+        (starting_portfolios[label] for label in DECUM_BACKTEST_PERCENTILES),
+        dtype=np.float64,
+        count=len(DECUM_BACKTEST_PERCENTILES),
+    )
+    end_capitals = np.fromiter(
+        (
+            0.0 if is_empty else dec_tables[label]["Capital final (€)"].iat[-1]
+            for label, is_empty in zip(DECUM_BACKTEST_PERCENTILES, tables_empty.tolist())
+        ),
+        dtype=np.float64,
+        count=len(DECUM_BACKTEST_PERCENTILES),
+    )
+    deltas_vs_start = end_capitals - start_capitals
+
     start_cols = st.columns(5)
-    for col, label in zip(start_cols, percentile_series.keys()):
-        col.metric(f"Capital inicio ({label})", f"{fmt_eur(starting_portfolios[label])}")
+    for col, label, start_capital in zip(start_cols, DECUM_BACKTEST_PERCENTILES, start_capitals.tolist()):
+        col.metric(f"Capital inicio ({label})", fmt_eur(start_capital))
 
-    end_capitals = {
-        label: float(dec_tables[label].iloc[-1]["Capital final (€)"]) if not dec_tables[label].empty else 0.0
-        for label in percentile_series.keys()
-    }
     end_cols = st.columns(5)
-    for col, label in zip(end_cols, percentile_series.keys()):
-        delta_vs_start = end_capitals[label] - starting_portfolios[label]
+    for col, label, end_capital, delta_vs_start in zip(
+        end_cols, DECUM_BACKTEST_PERCENTILES, end_capitals.tolist(), deltas_vs_start.tolist()
+    ):
         col.metric(
             f"Capital final ({label})",
-            f"{fmt_eur(end_capitals[label])}",
+            fmt_eur(end_capital),
             delta=f"{fmt_num_es(delta_vs_start, signed=True)} € vs inicio",
             delta_color="normal",
         )
 
     col_e, col_f = st.columns(2)
-    retirada_inicial = float(dec_tables["P50"].iloc[0]["Retirada anual (€)"]) if not dec_tables["P50"].empty else 0.0
-    retirada_final = float(dec_tables["P50"].iloc[-1]["Retirada anual (€)"]) if not dec_tables["P50"].empty else 0.0
+    p50_empty = bool(tables_empty[DECUM_BACKTEST_PERCENTILES.index("P50")])
+    retirada_inicial = float(dec_tables["P50"]["Retirada anual (€)"].iat[0]) if not p50_empty else 0.0
+    retirada_final = float(dec_tables["P50"]["Retirada anual (€)"].iat[-1]) if not p50_empty else 0.0
     col_e.metric(
         "Retirada anual P50 (inicio → fin)",
-        f"{fmt_eur(retirada_inicial)}",
+        fmt_eur(retirada_inicial),
         delta=f"Fin: {fmt_eur(retirada_final)}",
         delta_color="off",
     )
     col_f.metric(
         "Diferencia capital final (P95 - P5)",
-        f"{fmt_eur((end_capitals['P95'] - end_capitals['P5']))}",
+        fmt_eur(end_capitals[-1] - end_capitals[0]),
     )
 
     depletion_cols = st.columns(5)
@@ -2971,28 +3190,34 @@ def render_decumulation_box(simulation_results: Dict, params: Dict) -> None:
         "Escenario muy favorable (P95)",
     ]
     tabs = st.tabs(tab_labels)
+    # Metric label and window captions are fixed for this render; resolve them
+    # before the tab loop so each tab only reads a prepared string.
+    implied_return_label = (
+        "📈 Retorno informativo de ventana (ordenado)"
+        if decumulation_backtesting_effective and decumulation_backtesting_returns_are_ordered
+        else "📈 Retorno informativo de ventana (seleccionada)"
+        if decumulation_backtesting_effective
+        else "📈 Retorno anual implícito usado"
+    )
+    implied_deltas = {label: "Aplicado a este escenario" for label in percentile_series}
+    if decumulation_backtesting_effective:
+        for label, meta in scenario_window_meta.items():
+            start_year = int(meta.get("start_year", 0))
+            end_year = int(meta.get("end_year", 0))
+            window_idx = int(meta.get("window_index", 0))
+            windows_total = int(meta.get("windows_total", 0))
+            if start_year > 0 and end_year > 0:
+                implied_deltas[label] = f"Ventana {start_year}-{end_year} (#{window_idx}/{windows_total})"
+            else:
+                implied_deltas[label] = f"Ventana histórica #{window_idx}/{windows_total}"
+
     for tab, label in zip(tabs, percentile_series.keys()):
         with tab:
             implied_return = float(scenario_expected_return.get(label, params["rentabilidad_neta_simulacion"]))
-            implied_delta = "Aplicado a este escenario"
-            if decumulation_backtesting_effective and label in scenario_window_meta:
-                meta = scenario_window_meta[label]
-                start_year = int(meta.get("start_year", 0))
-                end_year = int(meta.get("end_year", 0))
-                window_idx = int(meta.get("window_index", 0))
-                windows_total = int(meta.get("windows_total", 0))
-                if start_year > 0 and end_year > 0:
-                    implied_delta = f"Ventana {start_year}-{end_year} (#{window_idx}/{windows_total})"
-                else:
-                    implied_delta = f"Ventana histórica #{window_idx}/{windows_total}"
             st.metric(
-                "📈 Retorno informativo de ventana (ordenado)"
-                if decumulation_backtesting_effective and decumulation_backtesting_returns_are_ordered
-                else "📈 Retorno informativo de ventana (seleccionada)"
-                if decumulation_backtesting_effective
-                else "📈 Retorno anual implícito usado",
+                implied_return_label,
                 f"{implied_return*100:.2f}%",
-                delta=implied_delta,
+                delta=implied_deltas[label],
                 delta_color="off",
             )
             if decumulation_backtesting_effective and decumulation_backtesting_returns_are_ordered:
@@ -3001,60 +3226,40 @@ def render_decumulation_box(simulation_results: Dict, params: Dict) -> None:
                     "para mantener coherencia visual entre P5→P95."
                 )
 
-            dec_display_df = dec_tables[label].copy()
+            dec_table = dec_tables[label]
+            derived_cols: Dict[str, Any] = {}
             if {
                 "Capital inicial (€)",
                 "Crecimiento neto (€)",
                 "Retirada anual (€)",
                 "Capital final (€)",
-            }.issubset(dec_display_df.columns):
-                dec_display_df["Chequeo flujo (€)"] = (
-                    dec_display_df["Capital inicial (€)"]
-                    + dec_display_df["Crecimiento neto (€)"]
-                    - dec_display_df["Retirada anual (€)"]
-                    - dec_display_df["Capital final (€)"]
-                )
-                # If capital is exhausted and clamped to 0, negative residual is unmet withdrawal,
-                # not a modeling mismatch. Split it to avoid false "descuadre" alarms.
-                dec_display_df["Déficit no cubierto (€)"] = np.where(
-                    dec_display_df["Capital agotado"],
-                    dec_display_df["Chequeo flujo (€)"],
-                    0.0,
-                )
-                dec_display_df["Chequeo flujo (€)"] = np.where(
-                    dec_display_df["Capital agotado"],
-                    0.0,
-                    dec_display_df["Chequeo flujo (€)"],
+            }.issubset(dec_table.columns):
+                (
+                    derived_cols["Chequeo flujo (€)"],
+                    derived_cols["Déficit no cubierto (€)"],
+                ) = _split_flow_check(
+                    dec_table["Capital inicial (€)"].to_numpy(dtype=np.float64),
+                    dec_table["Crecimiento neto (€)"].to_numpy(dtype=np.float64),
+                    dec_table["Retirada anual (€)"].to_numpy(dtype=np.float64),
+                    dec_table["Capital final (€)"].to_numpy(dtype=np.float64),
+                    dec_table["Capital agotado"].to_numpy(dtype=bool),
                 )
             if {
                 "Necesidad base cartera (€)",
                 "Retirada anual (€)",
-            }.issubset(dec_display_df.columns):
-                ingresos_totales = (
-                    dec_display_df["Ingresos totales (€)"]
-                    if "Ingresos totales (€)" in dec_display_df.columns
-                    else 0.0
-                )
-                coste_extra = (
-                    dec_display_df["Coste extra pre-pensión (€)"]
-                    if "Coste extra pre-pensión (€)" in dec_display_df.columns
-                    else 0.0
-                )
-                ajuste_venta = (
-                    dec_display_df["Ajuste venta/alquiler (€)"]
-                    if "Ajuste venta/alquiler (€)" in dec_display_df.columns
-                    else 0.0
-                )
-                cuota_hip = (
-                    dec_display_df["Cuota hipoteca pendiente (€)"]
-                    if "Cuota hipoteca pendiente (€)" in dec_display_df.columns
-                    else 0.0
-                )
+            }.issubset(dec_table.columns):
+                table_cols = dec_table.columns
+
+                def _column_or_zero(name: str) -> Any:
+                    return dec_table[name].to_numpy(dtype=np.float64) if name in table_cols else 0.0
+
                 esperada = np.maximum(
                     0.0,
-                    dec_display_df["Necesidad base cartera (€)"] + coste_extra - ingresos_totales,
-                ) + cuota_hip + ajuste_venta
-                dec_display_df["Chequeo retirada (€)"] = dec_display_df["Retirada anual (€)"] - esperada
+                    _column_or_zero("Necesidad base cartera (€)")
+                    + _column_or_zero("Coste extra pre-pensión (€)")
+                    - _column_or_zero("Ingresos totales (€)"),
+                ) + _column_or_zero("Cuota hipoteca pendiente (€)") + _column_or_zero("Ajuste venta/alquiler (€)")
+                derived_cols["Chequeo retirada (€)"] = _column_or_zero("Retirada anual (€)") - esperada
 
             base_order = [
                 "Año jubilación",
@@ -3081,33 +3286,16 @@ def render_decumulation_box(simulation_results: Dict, params: Dict) -> None:
                 "Déficit no cubierto (€)",
                 "Capital agotado",
             ]
-            ordered_cols = [c for c in base_order if c in dec_display_df.columns]
-            dec_display_df = dec_display_df[ordered_cols]
+            # Derived checks join the shared table in one assign + column selection,
+            # so no per-tab deep copy of the percentile frame is made.
+            ordered_cols = [c for c in base_order if c in dec_table.columns or c in derived_cols]
+            dec_display_df = dec_table.assign(**derived_cols)[ordered_cols]
 
             format_map = {
-                "Capital inicial (€)": lambda x: fmt_eur(x),
-                "Retirada anual (€)": lambda x: fmt_eur(x),
-                "Crecimiento neto (€)": lambda x: fmt_eur(x),
-                "Capital final (€)": lambda x: fmt_eur(x),
-                "Chequeo flujo (€)": lambda x: fmt_eur(x, 2),
-                "Chequeo retirada (€)": lambda x: fmt_eur(x, 2),
-                "Déficit no cubierto (€)": lambda x: fmt_eur(x, 2),
+                col: fmt_eur_cents if col in DECUM_EUR_CENTS_COLUMNS else fmt_eur
+                for col in dec_display_df.columns
+                if col in DECUM_EUR_COLUMNS or col in DECUM_EUR_CENTS_COLUMNS
             }
-            for optional_col in (
-                "Necesidad base cartera (€)",
-                "Ingreso no cartera implícito (€)",
-                "Ingreso alquileres (€)",
-                "Ingreso pensión pública (€)",
-                "Ingreso plan privado (€)",
-                "Otras rentas (€)",
-                "Ingresos totales (€)",
-                "Coste extra pre-pensión (€)",
-                "Ajuste venta/alquiler (€)",
-                "Venta inmueble (€)",
-                "Cuota hipoteca pendiente (€)",
-            ):
-                if optional_col in dec_display_df.columns:
-                    format_map[optional_col] = lambda x: fmt_eur(x)
             st.dataframe(
                 dec_display_df.style.format(format_map),
                 width="stretch",
@@ -3122,16 +3310,16 @@ def render_decumulation_box(simulation_results: Dict, params: Dict) -> None:
                 dec_display_df,
                 table_title=f"Tabla completa de jubilación ({label})",
             )
-            if "Chequeo flujo (€)" in dec_display_df.columns:
-                max_abs_check = float(dec_display_df["Chequeo flujo (€)"].abs().max())
+            if "Chequeo flujo (€)" in derived_cols:
+                max_abs_check = float(np.max(np.abs(derived_cols["Chequeo flujo (€)"]), initial=0.0))
                 if max_abs_check > 0.01:
                     st.warning(
                         f"Se detectó descuadre contable máximo de {fmt_eur(max_abs_check, 2)} en esta tabla."
                     )
                 else:
                     st.caption("Chequeo de flujo OK: columnas de capital/retiro/cuadre son coherentes.")
-            if "Chequeo retirada (€)" in dec_display_df.columns:
-                max_abs_withdraw = float(dec_display_df["Chequeo retirada (€)"].abs().max())
+            if "Chequeo retirada (€)" in derived_cols:
+                max_abs_withdraw = float(np.max(np.abs(derived_cols["Chequeo retirada (€)"]), initial=0.0))
                 if max_abs_withdraw > 0.01:
                     st.warning(
                         f"Se detectó desajuste máximo de {fmt_eur(max_abs_withdraw, 2)} entre retirada esperada y retirada calculada."
@@ -3257,6 +3445,7 @@ def monte_carlo_simulation(
     rental_drop_enabled: bool = False,
     rental_drop_year: int = 0,
     rental_drop_annual_amount: float = 0.0,
+    convergence_tolerance: Optional[float] = None,
 ) -> Dict:
     """
     Run Monte Carlo simulation with geometric Brownian motion.
@@ -3271,13 +3460,14 @@ def monte_carlo_simulation(
     inflation_rate: Annual inflation (decimal)
     annual_spending: Annual FIRE spending threshold (EUR)
     num_simulations: Number of paths (default 10,000)
+    convergence_tolerance: Optional early-stop tolerance for sampled models (upper bound stays num_simulations)
     
     Returns
     -------
     Dictionary with simulation results including percentiles, success rate, etc.
     """
     if model_type == "bootstrap":
-        historical = load_historical_annual_returns(strategy=historical_strategy)
+        historical = load_cached_historical_returns(historical_strategy)
         result = monte_carlo_bootstrap(
             initial_wealth=initial_wealth,
             monthly_contribution=monthly_contribution,
@@ -3297,13 +3487,14 @@ def monte_carlo_simulation(
             rental_drop_annual_amount=rental_drop_annual_amount,
             tax_pack=tax_pack,
             region=region,
+            convergence_tolerance=convergence_tolerance,
         )
         result["model_name"] = "Monte Carlo (Bootstrap histórico)"
         return result
 
     if model_type == "backtest":
-        historical_years, historical_returns, historical_months = load_historical_annual_series(
-            strategy=historical_strategy
+        historical_years, historical_returns, historical_months = load_cached_historical_series(
+            historical_strategy
         )
         result = backtest_rolling_windows(
             initial_wealth=initial_wealth,
@@ -3348,6 +3539,7 @@ def monte_carlo_simulation(
         rental_drop_annual_amount=rental_drop_annual_amount,
         tax_pack=tax_pack,
         region=region,
+        convergence_tolerance=convergence_tolerance,
     )
     result["model_name"] = "Monte Carlo (Normal)"
     return result
@@ -3385,6 +3577,34 @@ def estimate_property_sale_tax_rate(
     return 0.15
 
 
+@lru_cache(maxsize=256)
+def _property_sale_event(
+    sale_price: float,
+    tax_rate: float,
+    advanced_mode: bool,
+    capital_gain_pct: float,
+    purchase_price: float,
+    purchase_costs: float,
+    improvement_costs: float,
+    selling_costs: float,
+) -> Tuple[float, float, float, float, float, float]:
+    """(basis, net_before_tax, taxable_gain, gain_ratio, tax, net_after_tax) for clamped inputs."""
+    if advanced_mode:
+        net_sale_before_tax = max(0.0, sale_price - max(0.0, selling_costs))
+        basis = max(0.0, purchase_price) + max(0.0, purchase_costs) + max(0.0, improvement_costs)
+        taxable_gain = max(0.0, net_sale_before_tax - basis)
+        gain_ratio_effective = (taxable_gain / sale_price) if sale_price > 0 else 0.0
+    else:
+        gain_ratio_effective = max(0.0, min(1.0, capital_gain_pct))
+        net_sale_before_tax = sale_price
+        taxable_gain = sale_price * gain_ratio_effective
+        basis = max(0.0, sale_price - taxable_gain)
+
+    tax_estimated = taxable_gain * tax_rate
+    net_sale_after_tax = max(0.0, net_sale_before_tax - tax_estimated)
+    return basis, net_sale_before_tax, taxable_gain, gain_ratio_effective, tax_estimated, net_sale_after_tax
+
+
 def estimate_property_sale_event(
     *,
     sale_price: float,
@@ -3399,24 +3619,23 @@ def estimate_property_sale_event(
     """Estimate net proceeds from a real-estate sale for simulation input."""
     sale_price = max(0.0, float(sale_price))
     tax_rate = max(0.0, min(0.60, float(tax_rate)))
-
-    if mode == "Avanzado (precio/año compra)":
-        net_sale_before_tax = max(0.0, sale_price - max(0.0, float(selling_costs)))
-        basis = (
-            max(0.0, float(purchase_price))
-            + max(0.0, float(purchase_costs))
-            + max(0.0, float(improvement_costs))
-        )
-        taxable_gain = max(0.0, net_sale_before_tax - basis)
-        gain_ratio_effective = (taxable_gain / sale_price) if sale_price > 0 else 0.0
-    else:
-        gain_ratio_effective = max(0.0, min(1.0, float(capital_gain_pct)))
-        net_sale_before_tax = sale_price
-        taxable_gain = sale_price * gain_ratio_effective
-        basis = max(0.0, sale_price - taxable_gain)
-
-    tax_estimated = taxable_gain * tax_rate
-    net_sale_after_tax = max(0.0, net_sale_before_tax - tax_estimated)
+    (
+        basis,
+        net_sale_before_tax,
+        taxable_gain,
+        gain_ratio_effective,
+        tax_estimated,
+        net_sale_after_tax,
+    ) = _property_sale_event(
+        sale_price,
+        tax_rate,
+        mode == "Avanzado (precio/año compra)",
+        float(capital_gain_pct),
+        float(purchase_price),
+        float(purchase_costs),
+        float(improvement_costs),
+        float(selling_costs),
+    )
 
     return {
         "sale_price": sale_price,
@@ -3433,10 +3652,10 @@ def estimate_property_sale_event(
 
 def find_years_to_fire(median_real_path: np.ndarray, fire_target: float) -> Optional[int]:
     """Return first year reaching FIRE target in real terms, or None if not reached."""
-    for year, value in enumerate(median_real_path):
-        if value >= fire_target:
-            return year
-    return None
+    reached = np.asarray(median_real_path) >= fire_target
+    if not reached.any():
+        return None
+    return int(reached.argmax())
 
 
 # =====================================================================
@@ -3444,6 +3663,48 @@ def find_years_to_fire(median_real_path: np.ndarray, fire_target: float) -> Opti
 # =====================================================================
 
 @st.cache_data(ttl=3600, show_spinner=False)
+def load_cached_historical_returns(strategy: str) -> np.ndarray:
+    """Cached bundled annual returns; avoids re-reading the CSV on every rerun."""
+    return load_historical_annual_returns(strategy=strategy)
+
+
+@st.cache_data(ttl=3600, show_spinner=False)
+def load_cached_historical_series(strategy: str) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Cached (years, returns, months_observed) series for a historical strategy."""
+    return load_historical_annual_series(strategy=strategy)
+
+
+def tax_pack_digest(tax_pack: Optional[Dict]) -> str:
+    """Short content digest identifying a tax pack in cache keys."""
+    if not tax_pack:
+        return ""
+    payload = json.dumps(tax_pack, sort_keys=True, default=str).encode("utf-8")
+    return hashlib.blake2b(payload, digest_size=8).hexdigest()
+
+
+@st.cache_resource(ttl=3600, show_spinner=False)
+def load_cached_tax_pack(year: int) -> Tuple[Dict, str]:
+    """Shared read-only tax pack for a year, with its cache-key digest.
+
+    Returned by reference so reruns skip the JSON read, and the digest is
+    computed once per load instead of once per render.
+    """
+    tax_pack = load_tax_pack(year, "es")
+    return tax_pack, tax_pack_digest(tax_pack)
+
+
+@st.cache_data(ttl=3600, show_spinner=False, max_entries=16)
+def parse_cached_profile(raw: bytes) -> Tuple[Dict[str, Any], List[str]]:
+    """Parsed and validated profile JSON (config, warnings), keyed by the uploaded bytes."""
+    return deserialize_profile(json.loads(raw.decode("utf-8")))
+
+
+def _summarize_simulation_result(result: Dict) -> Dict:
+    """Drop the raw per-path matrices, keeping percentile bands and summaries."""
+    return {key: value for key, value in result.items() if key not in MC_RAW_PATH_KEYS}
+
+
+@st.cache_data(ttl=3600, show_spinner=False, max_entries=32)
 def run_cached_simulation(
     params_key: str,
     initial_wealth: float,
@@ -3463,14 +3724,18 @@ def run_cached_simulation(
     rental_drop_enabled: bool = False,
     rental_drop_year: int = 0,
     rental_drop_annual_amount: float = 0.0,
-    tax_pack: Optional[Dict] = None,
+    tax_pack_key: str = "",
+    _tax_pack: Optional[Dict] = None,
     region: Optional[str] = None,
 ) -> Dict:
     """
     Cached Monte Carlo simulation. Cache key invalidates if params change.
-    TTL: 1 hour
+    TTL: 1 hour; at most 32 results. Only percentile bands and summaries are
+    kept, so hits copy little data.
+    Sampled models stop before 10k paths once MC_CONVERGENCE_TOLERANCE is met.
+    The tax pack is identified by `tax_pack_key` rather than hashed per call.
     """
-    return monte_carlo_simulation(
+    return _summarize_simulation_result(monte_carlo_simulation(
         initial_wealth=initial_wealth,
         monthly_contribution=monthly_contribution,
         years=years,
@@ -3489,12 +3754,62 @@ def run_cached_simulation(
         rental_drop_year=rental_drop_year,
         rental_drop_annual_amount=rental_drop_annual_amount,
         num_simulations=10_000,
-        tax_pack=tax_pack,
+        tax_pack=_tax_pack,
+        region=region,
+        convergence_tolerance=MC_CONVERGENCE_TOLERANCE,
+    ))
+
+
+@st.cache_resource(ttl=3600, show_spinner=False, max_entries=64)
+def run_cached_nominal_paths(
+    initial_wealth: float,
+    monthly_contribution: float,
+    years: int,
+    mean_return: float,
+    volatility: float,
+    contribution_growth_rate: float,
+    property_sale_enabled: bool,
+    property_sale_year: int,
+    property_sale_amount: float,
+    rental_drop_enabled: bool,
+    rental_drop_year: int,
+    rental_drop_annual_amount: float,
+    tax_pack_key: str,
+    _tax_pack: Optional[Dict],
+    region: Optional[str],
+    num_simulations: int,
+    seed: int,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Shared (returns, nominal paths) for a normal Monte Carlo run.
+
+    Nominal paths do not depend on inflation or the FIRE target, so every
+    sensitivity cell with the same return reuses one simulation. Draws are
+    antithetic, and the fixed seed gives every cell the same shocks, so cell
+    differences reflect the parameter change rather than sampling noise.
+    """
+    annual_returns = normal_return_matrix(
+        mean_return, volatility, years, num_simulations, seed, antithetic=True
+    )
+    annual_paths = simulate_nominal_paths(
+        initial_wealth=initial_wealth,
+        annual_contribution=monthly_contribution * 12,
+        contribution_growth_rate=contribution_growth_rate,
+        annual_returns_matrix=annual_returns,
+        property_sale_enabled=property_sale_enabled,
+        property_sale_year=property_sale_year,
+        property_sale_amount=property_sale_amount,
+        rental_drop_enabled=rental_drop_enabled,
+        rental_drop_year=rental_drop_year,
+        rental_drop_annual_amount=rental_drop_annual_amount,
+        tax_pack=_tax_pack,
         region=region,
     )
+    annual_returns.setflags(write=False)
+    annual_paths.setflags(write=False)
+    return annual_returns, annual_paths
 
 
-@st.cache_data(ttl=3600, show_spinner=False)
+@st.cache_data(ttl=3600, show_spinner=False, max_entries=512)
 def run_cached_sensitivity_cell(
     params_key: str,
     initial_wealth: float,
@@ -3512,268 +3827,169 @@ def run_cached_sensitivity_cell(
     rental_drop_enabled: bool,
     rental_drop_year: int,
     rental_drop_annual_amount: float,
-    tax_pack: Optional[Dict],
+    tax_pack_key: str,
+    _tax_pack: Optional[Dict],
     region: Optional[str],
     num_simulations: int = 3000,
 ) -> Dict:
     """Cached Monte Carlo run for a single sensitivity matrix cell."""
-    return monte_carlo_simulation(
+    annual_returns, annual_paths = run_cached_nominal_paths(
         initial_wealth=initial_wealth,
         monthly_contribution=monthly_contribution,
         years=years,
         mean_return=mean_return,
         volatility=volatility,
-        inflation_rate=inflation_rate,
-        annual_spending=annual_spending,
-        safe_withdrawal_rate=safe_withdrawal_rate,
         contribution_growth_rate=contribution_growth_rate,
-        model_type="normal",
-        historical_strategy="sp500_us_total_return",
         property_sale_enabled=property_sale_enabled,
         property_sale_year=property_sale_year,
         property_sale_amount=property_sale_amount,
         rental_drop_enabled=rental_drop_enabled,
         rental_drop_year=rental_drop_year,
         rental_drop_annual_amount=rental_drop_annual_amount,
+        tax_pack_key=tax_pack_key,
+        _tax_pack=_tax_pack,
+        region=region,
         num_simulations=num_simulations,
         seed=42,
-        tax_pack=tax_pack,
-        region=region,
     )
+    result = _summarize_simulation_result(
+        summarize_simulation_paths(
+            annual_paths=annual_paths,
+            annual_returns_matrix=annual_returns,
+            inflation_rate=inflation_rate,
+            annual_spending=annual_spending,
+            safe_withdrawal_rate=safe_withdrawal_rate,
+        )
+    )
+    result["model_name"] = "Monte Carlo (Normal)"
+    return result
 
 
 # =====================================================================
 # 5. SIDEBAR - INPUT COLLECTION & PARAMETER PANEL
 # =====================================================================
 
-def render_sidebar() -> Dict:
-    """
-    Render sidebar with investor profile, market assumptions, & fiscal config.
-    Returns validated parameter dictionary.
-    """
-    st.sidebar.markdown("## ⚙️ Panel de Control")
-    st.sidebar.divider()
-
-    loaded_profile_config = st.session_state.get("loaded_profile_config", {})
-    loaded_profile_warnings = st.session_state.get("loaded_profile_warnings", [])
-    suggested_sync_keys = (
-        "two_phase_switch_age_last_suggested_key",
-        "two_phase_stage1_last_suggested_key",
-        "two_phase_post_income_last_suggested_key",
-        "two_phase_switch_age_manual_override_key",
-        "two_phase_stage1_manual_override_key",
-        "two_phase_post_income_manual_override_key",
-    )
-
-    def _clear_suggested_sync_state() -> None:
-        """Reset autosync trackers so they are re-based on next render."""
-        for key in suggested_sync_keys:
-            st.session_state.pop(key, None)
-
-    def _mark_manual_override(flag_key: str) -> None:
-        """Mark a simple two-phase control as user-locked (no autosync)."""
-        st.session_state[flag_key] = True
-
-    def _sync_suggested_state(
-        *,
-        widget_key: str,
-        suggested_key: str,
-        suggested_value: float,
-        manual_override_key: Optional[str] = None,
-        is_int: bool = False,
-        tolerance: float = 1e-6,
-    ) -> None:
-        """Keep derived field synced to suggestion unless user has manually overridden it."""
-        if is_int:
-            cast = lambda x: int(float(x))
-            equal = lambda a, b: int(a) == int(b)
-        else:
-            cast = float
-            equal = lambda a, b: abs(float(a) - float(b)) < tolerance
-
-        current_value = cast(st.session_state.get(widget_key, suggested_value))
-        if manual_override_key and bool(st.session_state.get(manual_override_key, False)):
-            st.session_state[suggested_key] = cast(suggested_value)
-            return
-        if suggested_key not in st.session_state:
-            # First render: establish baseline without forcing a write.
-            st.session_state[suggested_key] = current_value
-            return
-
-        prev_suggested = cast(st.session_state.get(suggested_key, suggested_value))
-        if equal(current_value, prev_suggested):
-            st.session_state[widget_key] = cast(suggested_value)
-        st.session_state[suggested_key] = cast(suggested_value)
-
-    def apply_loaded_profile_to_widget_state(config: Dict[str, Any]) -> None:
-        """Map profile config keys to widget state keys so controls reflect loaded JSON."""
-        key_map = {
-            "modo_guiado": "modo_guiado_key",
-            "setup_mode": "setup_mode_key",
-            "profile_name": "profile_name_key",
-            "apply_profile_defaults": "apply_profile_defaults_key",
-            "gastos_anuales": "gastos_anuales_key",
-            "safe_withdrawal_rate": "safe_withdrawal_rate_key",
-            "edad_actual": "edad_actual_key",
-            "edad_objetivo": "edad_objetivo_key",
-            "vivienda_habitual_valor": "vivienda_habitual_valor_key",
-            "vivienda_habitual_hipoteca": "vivienda_habitual_hipoteca_key",
-            "incluir_cuota_vivienda_en_simulacion": "incluir_cuota_vivienda_en_simulacion_key",
-            "aplicar_ajuste_vivienda_habitual": "aplicar_ajuste_vivienda_habitual_key",
-            "ahorro_vivienda_habitual_anual": "ahorro_vivienda_habitual_anual_key",
-            "inmuebles_invertibles_valor": "inmuebles_invertibles_valor_key",
-            "inmuebles_invertibles_hipoteca": "inmuebles_invertibles_hipoteca_key",
-            "incluir_cuota_inmuebles_en_simulacion": "incluir_cuota_inmuebles_en_simulacion_key",
-            "otras_deudas": "otras_deudas_key",
-            "usar_capital_invertible_ampliado": "usar_capital_invertible_ampliado_key",
-            "renta_bruta_alquiler_anual": "renta_bruta_alquiler_anual_key",
-            "usar_modelo_avanzado_alquiler": "usar_modelo_avanzado_alquiler_key",
-            "alquiler_costes_vacancia_pct": "alquiler_costes_vacancia_pct_key",
-            "alquiler_irpf_efectivo_pct": "alquiler_irpf_efectivo_pct_key",
-            "incluir_rentas_alquiler_en_simulacion": "incluir_rentas_alquiler_en_simulacion_key",
-            "property_sale_enabled": "property_sale_enabled_key",
-            "property_sale_phase": "property_sale_phase_key",
-            "property_sale_year_accumulation": "property_sale_year_accumulation_key",
-            "property_sale_year_retirement": "property_sale_year_retirement_key",
-            "property_sale_amount": "property_sale_amount_key",
-            "property_sale_tax_calc_mode": "property_sale_tax_calc_mode_key",
-            "property_sale_capital_gain_pct": "property_sale_capital_gain_pct_key",
-            "property_sale_rent_drop_pct": "property_sale_rent_drop_pct_key",
-            "property_sale_remove_home_savings": "property_sale_remove_home_savings_key",
-            "property_sale_purchase_year": "property_sale_purchase_year_key",
-            "property_sale_purchase_price": "property_sale_purchase_price_key",
-            "property_sale_purchase_costs": "property_sale_purchase_costs_key",
-            "property_sale_improvement_costs": "property_sale_improvement_costs_key",
-            "property_sale_selling_costs": "property_sale_selling_costs_key",
-            "include_pension_in_simulation": "include_pension_in_simulation_key",
-            "two_stage_retirement_model": "two_stage_retirement_model_key",
-            "two_phase_switch_age": "two_phase_switch_age_key",
-            "two_phase_withdrawal_stage1_net_annual": "two_phase_withdrawal_stage1_net_annual_key",
-            "two_phase_withdrawal_stage2_net_annual": "two_phase_withdrawal_stage2_net_annual_key",
-            "two_phase_post_pension_income_annual": "two_phase_post_pension_income_annual_key",
-            "edad_pension_oficial": "edad_pension_oficial_key",
-            "edad_inicio_pension_publica": "edad_inicio_pension_publica_key",
-            "bonificacion_demora_pct": "bonificacion_demora_pct_key",
-            "pension_publica_neta_anual": "pension_publica_neta_anual_key",
-            "edad_inicio_plan_privado": "edad_inicio_plan_privado_key",
-            "duracion_plan_privado_anos": "duracion_plan_privado_anos_key",
-            "plan_pensiones_privado_neto_anual": "plan_pensiones_privado_neto_anual_key",
-            "otras_rentas_post_jubilacion_netas": "otras_rentas_post_jubilacion_netas_key",
-            "coste_pre_pension_anual": "coste_pre_pension_anual_key",
-            "rentabilidad_esperada": "rentabilidad_esperada_key",
-            "volatilidad": "volatilidad_key",
-            "inflacion": "inflacion_key",
-            "inflacionar_aportacion": "inflacionar_aportacion_key",
-            "fiscal_priority": "fiscal_priority_key",
-            "regimen_fiscal": "regimen_fiscal_key",
-            "include_optimización": "include_optimizacion_key",
-            "taxable_withdrawal_ratio_mode": "taxable_withdrawal_ratio_mode_key",
-            "taxable_withdrawal_ratio": "taxable_withdrawal_ratio_key",
-            "tax_year": "tax_year_key",
-        }
-        for cfg_key, widget_key in key_map.items():
-            if cfg_key in config:
-                value = config[cfg_key]
-                if cfg_key == "safe_withdrawal_rate":
-                    value = float(value) * 100.0
-                elif cfg_key in ("rentabilidad_esperada", "volatilidad", "inflacion"):
-                    value = float(value) * 100.0
-                elif cfg_key == "bonificacion_demora_pct":
-                    value = float(value) * 100.0
-                elif cfg_key == "taxable_withdrawal_ratio":
-                    value = float(value) * 100.0
-                elif cfg_key == "property_sale_capital_gain_pct":
-                    value = float(value) * 100.0
-                elif cfg_key == "property_sale_rent_drop_pct":
-                    value = float(value) * 100.0
-                st.session_state[widget_key] = value
-
-        if "fiscal_mode" in config:
-            st.session_state["fiscal_mode_label_key"] = (
-                "Internacional básico"
-                if config["fiscal_mode"] == FISCAL_MODE_INTL_BASIC
-                else "España (Tax Pack)"
-            )
-        if "retirement_model_mode" in config:
-            st.session_state["retirement_model_mode_key"] = (
-                "Avanzado (desglose de ingresos)"
-                if config["retirement_model_mode"] == "ADVANCED_INCOME_BREAKDOWN"
-                else "Simple (recomendado)"
-            )
-            if config["retirement_model_mode"] == "SIMPLE_TWO_PHASE":
-                two_phase_defaults = derive_simple_two_phase_from_legacy(config)
-                if "two_phase_switch_age" not in config:
-                    st.session_state["two_phase_switch_age_key"] = int(two_phase_defaults["two_phase_switch_age"])
-                if "two_phase_withdrawal_stage1_net_annual" not in config:
-                    st.session_state["two_phase_withdrawal_stage1_net_annual_key"] = float(
-                        two_phase_defaults["two_phase_withdrawal_stage1_net_annual"]
-                    )
-                if "two_phase_withdrawal_stage2_net_annual" not in config:
-                    st.session_state["two_phase_withdrawal_stage2_net_annual_key"] = float(
-                        two_phase_defaults["two_phase_withdrawal_stage2_net_annual"]
-                    )
-                if "two_phase_post_pension_income_annual" not in config:
-                    st.session_state["two_phase_post_pension_income_annual_key"] = float(
-                        two_phase_defaults["two_phase_post_pension_income_annual"]
-                    )
-        else:
-            # Backward compatibility for legacy profiles without explicit retirement mode:
-            # default to simple mode and derive stage fields from legacy pension/income inputs.
-            st.session_state["retirement_model_mode_key"] = "Simple (recomendado)"
+def geometric_slider_options(min_nonzero: int, max_value: int, steps: int, round_step: int) -> Tuple[int, ...]:
+    """Slider options from 0 to max_value on a rounded geometric scale (denser at low amounts)."""
+    rounded = np.round(np.geomspace(min_nonzero, max_value, steps) / round_step).astype(np.int64) * round_step
+    rounded = np.unique(rounded[rounded > 0])
+    if rounded[-1] != max_value:
+        rounded = np.append(rounded, max_value)
+    return (0, *rounded.tolist())
+
+
+def nearest_slider_option(options: Sequence[int], target: int) -> int:
+    """Option closest to target in an ascending option list (lower one on ties)."""
+    idx = int(np.searchsorted(options, target))
+    if idx == 0:
+        return options[0]
+    if idx == len(options) or target - options[idx - 1] <= options[idx] - target:
+        return options[idx - 1]
+    return options[idx]
+
+
+# Static sidebar slider scales, built once per process instead of on every rerun.
+PATRIMONIO_SLIDER_OPTIONS = geometric_slider_options(1_000, 2_000_000, 120, 1_000)
+APORTACION_SLIDER_OPTIONS = geometric_slider_options(100, 50_000, 110, 50)
+CUOTA_SLIDER_OPTIONS = geometric_slider_options(50, 15_000, 120, 25)
+MONTHS_SLIDER_OPTIONS = tuple(range(0, 601))
+PATRIMONIO_SLIDER_DEFAULT = nearest_slider_option(PATRIMONIO_SLIDER_OPTIONS, 150_000)
+APORTACION_SLIDER_DEFAULT = nearest_slider_option(APORTACION_SLIDER_OPTIONS, 1_000)
+
+
+def apply_loaded_profile_to_widget_state(config: Dict[str, Any]) -> None:
+    """Map profile config keys to widget state keys so controls reflect loaded JSON."""
+    updates: Dict[str, Any] = {}
+    for cfg_key, value in config.items():
+        widget_key = PROFILE_WIDGET_KEYS.get(cfg_key)
+        if widget_key is not None:
+            updates[widget_key] = float(value) * 100.0 if cfg_key in PROFILE_PERCENT_KEYS else value
+
+    if "fiscal_mode" in config:
+        updates["fiscal_mode_label_key"] = FISCAL_MODE_LABELS.get(
+            config["fiscal_mode"], FISCAL_MODE_LABELS[FISCAL_MODE_ES_TAXPACK]
+        )
+    if "retirement_model_mode" in config:
+        updates["retirement_model_mode_key"] = RETIREMENT_MODE_LABELS.get(
+            config["retirement_model_mode"], RETIREMENT_MODE_LABELS["SIMPLE_TWO_PHASE"]
+        )
+        if config["retirement_model_mode"] == "SIMPLE_TWO_PHASE":
             two_phase_defaults = derive_simple_two_phase_from_legacy(config)
             if "two_phase_switch_age" not in config:
-                st.session_state["two_phase_switch_age_key"] = int(two_phase_defaults["two_phase_switch_age"])
+                updates["two_phase_switch_age_key"] = int(two_phase_defaults["two_phase_switch_age"])
             if "two_phase_withdrawal_stage1_net_annual" not in config:
-                st.session_state["two_phase_withdrawal_stage1_net_annual_key"] = float(
+                updates["two_phase_withdrawal_stage1_net_annual_key"] = float(
                     two_phase_defaults["two_phase_withdrawal_stage1_net_annual"]
                 )
             if "two_phase_withdrawal_stage2_net_annual" not in config:
-                st.session_state["two_phase_withdrawal_stage2_net_annual_key"] = float(
+                updates["two_phase_withdrawal_stage2_net_annual_key"] = float(
                     two_phase_defaults["two_phase_withdrawal_stage2_net_annual"]
                 )
             if "two_phase_post_pension_income_annual" not in config:
-                st.session_state["two_phase_post_pension_income_annual_key"] = float(
+                updates["two_phase_post_pension_income_annual_key"] = float(
                     two_phase_defaults["two_phase_post_pension_income_annual"]
                 )
-        if "region" in config:
-            st.session_state["loaded_profile_region_code"] = config["region"]
-        if "intl_tax_rates" in config and isinstance(config["intl_tax_rates"], dict):
-            rates = config["intl_tax_rates"]
-            st.session_state["intl_tax_gains_key"] = float(rates.get("gains", 0.10)) * 100.0
-            st.session_state["intl_tax_dividends_key"] = float(rates.get("dividends", 0.15)) * 100.0
-            st.session_state["intl_tax_interest_key"] = float(rates.get("interest", 0.20)) * 100.0
-            st.session_state["intl_tax_wealth_key"] = float(rates.get("wealth", 0.00)) * 100.0
-
-        if "patrimonio_inicial" in config:
-            st.session_state["patrimonio_exact_mode"] = bool(config.get("patrimonio_exact_mode", True))
-            st.session_state["patrimonio_exact_value"] = int(float(config["patrimonio_inicial"]))
-        if "aportacion_mensual" in config:
-            st.session_state["aportacion_exact_mode"] = bool(config.get("aportacion_exact_mode", True))
-            st.session_state["aportacion_exact_value"] = int(float(config["aportacion_mensual"]))
-        if "cuota_hipoteca_vivienda_mensual" in config:
-            st.session_state["primary_mortgage_payment_exact_mode"] = bool(
-                config.get("cuota_hipoteca_vivienda_mensual_exact_mode", True)
+    else:
+        # Backward compatibility for legacy profiles without explicit retirement mode:
+        # default to simple mode and derive stage fields from legacy pension/income inputs.
+        updates["retirement_model_mode_key"] = RETIREMENT_MODE_LABELS["SIMPLE_TWO_PHASE"]
+        two_phase_defaults = derive_simple_two_phase_from_legacy(config)
+        if "two_phase_switch_age" not in config:
+            updates["two_phase_switch_age_key"] = int(two_phase_defaults["two_phase_switch_age"])
+        if "two_phase_withdrawal_stage1_net_annual" not in config:
+            updates["two_phase_withdrawal_stage1_net_annual_key"] = float(
+                two_phase_defaults["two_phase_withdrawal_stage1_net_annual"]
+            )
+        if "two_phase_withdrawal_stage2_net_annual" not in config:
+            updates["two_phase_withdrawal_stage2_net_annual_key"] = float(
+                two_phase_defaults["two_phase_withdrawal_stage2_net_annual"]
             )
-            st.session_state["primary_mortgage_payment_exact_value"] = int(float(config["cuota_hipoteca_vivienda_mensual"]))
-        if "meses_hipoteca_vivienda_restantes_exact_mode" in config:
-            st.session_state["primary_mortgage_months_exact_mode"] = bool(config["meses_hipoteca_vivienda_restantes_exact_mode"])
-        if "meses_hipoteca_vivienda_restantes" in config:
-            st.session_state["primary_mortgage_months_exact_value"] = int(float(config["meses_hipoteca_vivienda_restantes"]))
-        if "cuota_hipoteca_inmuebles_mensual" in config:
-            st.session_state["investment_mortgage_payment_exact_mode"] = bool(
-                config.get("cuota_hipoteca_inmuebles_mensual_exact_mode", True)
+        if "two_phase_post_pension_income_annual" not in config:
+            updates["two_phase_post_pension_income_annual_key"] = float(
+                two_phase_defaults["two_phase_post_pension_income_annual"]
             )
-            st.session_state["investment_mortgage_payment_exact_value"] = int(float(config["cuota_hipoteca_inmuebles_mensual"]))
-        if "meses_hipoteca_inmuebles_restantes_exact_mode" in config:
-            st.session_state["investment_mortgage_months_exact_mode"] = bool(config["meses_hipoteca_inmuebles_restantes_exact_mode"])
-        if "meses_hipoteca_inmuebles_restantes" in config:
-            st.session_state["investment_mortgage_months_exact_value"] = int(float(config["meses_hipoteca_inmuebles_restantes"]))
-        if "bootstrap_historical_strategy_label" in config:
-            st.session_state["bootstrap_historical_strategy_label"] = str(config["bootstrap_historical_strategy_label"])
-        if "backtest_historical_strategy_label" in config:
-            st.session_state["backtest_historical_strategy_label"] = str(config["backtest_historical_strategy_label"])
-
-    with st.sidebar.expander("💾 Perfil (cargar JSON)", expanded=False):
+    if "region" in config:
+        updates["loaded_profile_region_code"] = config["region"]
+    if "intl_tax_rates" in config and isinstance(config["intl_tax_rates"], dict):
+        rates = config["intl_tax_rates"]
+        updates["intl_tax_gains_key"] = float(rates.get("gains", 0.10)) * 100.0
+        updates["intl_tax_dividends_key"] = float(rates.get("dividends", 0.15)) * 100.0
+        updates["intl_tax_interest_key"] = float(rates.get("interest", 0.20)) * 100.0
+        updates["intl_tax_wealth_key"] = float(rates.get("wealth", 0.00)) * 100.0
+
+    for cfg_key, exact_mode_key, state_prefix in PROFILE_EXACT_AMOUNT_KEYS:
+        amount = config.get(cfg_key)
+        if amount is not None:
+            updates[f"{state_prefix}_exact_mode"] = bool(config.get(exact_mode_key, True))
+            updates[f"{state_prefix}_exact_value"] = int(float(amount))
+    if "meses_hipoteca_vivienda_restantes_exact_mode" in config:
+        updates["primary_mortgage_months_exact_mode"] = bool(config["meses_hipoteca_vivienda_restantes_exact_mode"])
+    if "meses_hipoteca_vivienda_restantes" in config:
+        updates["primary_mortgage_months_exact_value"] = int(float(config["meses_hipoteca_vivienda_restantes"]))
+    if "meses_hipoteca_inmuebles_restantes_exact_mode" in config:
+        updates["investment_mortgage_months_exact_mode"] = bool(config["meses_hipoteca_inmuebles_restantes_exact_mode"])
+    if "meses_hipoteca_inmuebles_restantes" in config:
+        updates["investment_mortgage_months_exact_value"] = int(float(config["meses_hipoteca_inmuebles_restantes"]))
+    if "bootstrap_historical_strategy_label" in config:
+        updates["bootstrap_historical_strategy_label"] = str(config["bootstrap_historical_strategy_label"])
+    if "backtest_historical_strategy_label" in config:
+        updates["backtest_historical_strategy_label"] = str(config["backtest_historical_strategy_label"])
+
+    st.session_state.update(updates)
+
+
+def _clear_suggested_sync_state() -> None:
+    """Reset two-phase autosync trackers so they are re-based on next render."""
+    for key in TWO_PHASE_SYNC_STATE_KEYS:
+        st.session_state.pop(key, None)
+
+
+@streamlit_fragment
+def render_profile_loader() -> None:
+    """Profile JSON loader. Picking a file reruns only this block; applying or clearing reruns the app."""
+    loaded_profile_config = st.session_state.get("loaded_profile_config", {})
+    loaded_profile_warnings = st.session_state.get("loaded_profile_warnings", [])
+    with st.expander("💾 Perfil (cargar JSON)", expanded=False):
         profile_file = st.file_uploader(
             "Cargar JSON FIRE (perfil o escenario)",
             type=["json"],
@@ -3784,16 +4000,13 @@ def render_sidebar() -> Dict:
             if st.button("Aplicar perfil", key="apply_profile_button", width="stretch"):
                 if profile_file is not None:
                     try:
-                        payload = json.loads(profile_file.read().decode("utf-8"))
-                        safe_cfg, warnings_profile = deserialize_profile(payload)
+                        safe_cfg, warnings_profile = parse_cached_profile(profile_file.getvalue())
                         _clear_suggested_sync_state()
                         st.session_state["loaded_profile_config"] = safe_cfg
                         st.session_state["loaded_profile_warnings"] = warnings_profile
                         apply_loaded_profile_to_widget_state(safe_cfg)
                         st.success("Perfil cargado. Se aplicará en esta ejecución.")
-                        loaded_profile_config = safe_cfg
-                        loaded_profile_warnings = warnings_profile
-                        st.rerun()
+                        rerun_app()
                     except Exception as e:
                         st.error(f"No se pudo cargar el perfil: {e}")
                 else:
@@ -3803,8 +4016,9 @@ def render_sidebar() -> Dict:
                 _clear_suggested_sync_state()
                 st.session_state.pop("loaded_profile_config", None)
                 st.session_state.pop("loaded_profile_warnings", None)
-                loaded_profile_config = {}
-                loaded_profile_warnings = []
+                st.session_state["profile_cleared_notice"] = True
+                rerun_app()
+            if st.session_state.pop("profile_cleared_notice", False):
                 st.info("Perfil cargado eliminado.")
 
         if loaded_profile_config:
@@ -3816,6 +4030,55 @@ def render_sidebar() -> Dict:
             "Para exportar/guardar usa el bloque `📥 Exportar Resultados`."
         )
 
+
+def render_sidebar() -> Dict:
+    """
+    Render sidebar with investor profile, market assumptions, & fiscal config.
+    Returns validated parameter dictionary.
+    """
+    st.sidebar.markdown("## ⚙️ Panel de Control")
+    st.sidebar.divider()
+
+    def _mark_manual_override(flag_key: str) -> None:
+        """Mark a simple two-phase control as user-locked (no autosync)."""
+        st.session_state[flag_key] = True
+
+    def _sync_suggested_state(
+        *,
+        widget_key: str,
+        suggested_key: str,
+        suggested_value: float,
+        manual_override_key: Optional[str] = None,
+        is_int: bool = False,
+        tolerance: float = 1e-6,
+    ) -> None:
+        """Keep derived field synced to suggestion unless user has manually overridden it."""
+        if is_int:
+            cast = lambda x: int(float(x))
+            equal = lambda a, b: int(a) == int(b)
+        else:
+            cast = float
+            equal = lambda a, b: abs(float(a) - float(b)) < tolerance
+
+        current_value = cast(st.session_state.get(widget_key, suggested_value))
+        if manual_override_key and bool(st.session_state.get(manual_override_key, False)):
+            st.session_state[suggested_key] = cast(suggested_value)
+            return
+        if suggested_key not in st.session_state:
+            # First render: establish baseline without forcing a write.
+            st.session_state[suggested_key] = current_value
+            return
+
+        prev_suggested = cast(st.session_state.get(suggested_key, suggested_value))
+        if equal(current_value, prev_suggested):
+            st.session_state[widget_key] = cast(suggested_value)
+        st.session_state[suggested_key] = cast(suggested_value)
+
+    with st.sidebar:
+        render_profile_loader()
+    loaded_profile_config = st.session_state.get("loaded_profile_config", {})
+    loaded_profile_warnings = st.session_state.get("loaded_profile_warnings", [])
+
     # STEP 1: Experience and setup mode
     st.sidebar.markdown("### 1) Configuración inicial")
 
@@ -3868,12 +4131,7 @@ def render_sidebar() -> Dict:
 
     profile_name = "Personalizado"
     apply_profile_defaults = False
-    profile_defaults = {
-        "gastos_anuales": 30_000,
-        "rentabilidad_esperada": 0.07,
-        "inflacion": 0.025,
-        "safe_withdrawal_rate": 0.04,
-    }
+    profile_defaults = CUSTOM_PROFILE_DEFAULTS
     if setup_mode == PROFILE_MODE_LABEL:
         if st.session_state.get("profile_name_key") not in fire_profile_options:
             st.session_state["profile_name_key"] = fire_profile_fallback
@@ -3943,21 +4201,20 @@ def render_sidebar() -> Dict:
 
     def select_currency_with_exact_input(
         label: str,
-        options: List[int],
+        options: Sequence[int],
         default_value: int,
         exact_label: str,
         exact_input_label: str,
         max_exact: int,
         step_exact: int,
+        key_prefix: str,
         help_text: Optional[str] = None,
-        key_prefix: Optional[str] = None,
     ) -> float:
         """Render currency slider with optional exact input override."""
-        state_key = key_prefix or re.sub(r"[^a-z0-9_]+", "_", exact_input_label.lower())
         use_exact = st.sidebar.checkbox(
             exact_label,
-            value=bool(st.session_state.get(f"{state_key}_exact_mode", False)),
-            key=f"{state_key}_exact_mode",
+            value=bool(st.session_state.get(f"{key_prefix}_exact_mode", False)),
+            key=f"{key_prefix}_exact_mode",
             help="Permite fijar un importe exacto sin saltos de la barra.",
         )
         if use_exact:
@@ -3965,24 +4222,24 @@ def render_sidebar() -> Dict:
                 exact_input_label,
                 min_value=0,
                 max_value=max_exact,
-                value=int(st.session_state.get(f"{state_key}_exact_value", default_value)),
+                value=int(st.session_state.get(f"{key_prefix}_exact_value", default_value)),
                 step=step_exact,
-                key=f"{state_key}_exact_value",
+                key=f"{key_prefix}_exact_value",
             )
         else:
             selected_value = st.sidebar.select_slider(
                 label,
                 options=options,
-                value=int(st.session_state.get(f"{state_key}_slider_value", default_value)),
-                format_func=lambda x: f"{fmt_eur(x)}",
+                value=int(st.session_state.get(f"{key_prefix}_slider_value", default_value)),
+                format_func=fmt_eur,
                 help=help_text,
-                key=f"{state_key}_slider_value",
+                key=f"{key_prefix}_slider_value",
             )
         return float(selected_value)
 
     def select_int_with_exact_input(
         label: str,
-        options: List[int],
+        options: Sequence[int],
         default_value: int,
         exact_checkbox_label: str,
         exact_input_label: str,
@@ -4018,31 +4275,58 @@ def render_sidebar() -> Dict:
         )
         return selected, False
 
+    def select_mortgage_payment_and_months(
+        *,
+        mortgage_amount: float,
+        default_payment: int,
+        fallback_payment_idx: int,
+        payment_label: str,
+        exact_payment_label: str,
+        exact_payment_input_label: str,
+        payment_help: str,
+        months_label: str,
+        exact_months_label: str,
+        exact_months_input_label: str,
+        key_prefix: str,
+    ) -> Tuple[float, int, bool, int]:
+        """Render monthly payment + remaining months for a mortgage; zeros when there is no mortgage.
+
+        Returns (monthly payment, remaining months, months exact mode, pending payments).
+        """
+        if mortgage_amount <= 0:
+            return 0.0, 0, False, 0
+        payment = select_currency_with_exact_input(
+            payment_label,
+            options=CUOTA_SLIDER_OPTIONS,
+            default_value=(
+                default_payment
+                if default_payment in CUOTA_SLIDER_OPTIONS
+                else CUOTA_SLIDER_OPTIONS[min(len(CUOTA_SLIDER_OPTIONS) - 1, fallback_payment_idx)]
+            ),
+            exact_label=exact_payment_label,
+            exact_input_label=exact_payment_input_label,
+            max_exact=50_000,
+            step_exact=25,
+            help_text=payment_help,
+            key_prefix=f"{key_prefix}_payment",
+        )
+        months, months_exact_mode = select_int_with_exact_input(
+            label=months_label,
+            options=MONTHS_SLIDER_OPTIONS,
+            default_value=240,
+            exact_checkbox_label=exact_months_label,
+            exact_input_label=exact_months_input_label,
+            max_exact=600,
+            key_prefix=f"{key_prefix}_months",
+        )
+        return payment, months, months_exact_mode, int(months)
+
     # STEP 3: Current situation and horizon
     st.sidebar.markdown("### 3) Situación actual")
-    patrimonio_min_nonzero = 1_000
-    patrimonio_max = 2_000_000
-    patrimonio_default = 150_000
-    patrimonio_steps = 120
-    patrimonio_scale = np.geomspace(patrimonio_min_nonzero, patrimonio_max, patrimonio_steps)
-    patrimonio_options = [0]
-    for v in patrimonio_scale:
-        rounded = int(round(float(v) / 1_000) * 1_000)
-        if rounded > patrimonio_options[-1]:
-            patrimonio_options.append(rounded)
-    if patrimonio_options[-1] != patrimonio_max:
-        patrimonio_options.append(patrimonio_max)
-
-    default_idx = min(
-        range(len(patrimonio_options)),
-        key=lambda i: abs(patrimonio_options[i] - patrimonio_default),
-    )
-    patrimonio_default_value = patrimonio_options[default_idx]
-
     patrimonio_inicial = select_currency_with_exact_input(
         label="Patrimonio líquido actual (€)",
-        options=patrimonio_options,
-        default_value=patrimonio_default_value,
+        options=PATRIMONIO_SLIDER_OPTIONS,
+        default_value=PATRIMONIO_SLIDER_DEFAULT,
         exact_label="Introducir patrimonio exacto",
         exact_input_label="Patrimonio líquido actual exacto (€)",
         max_exact=20_000_000,
@@ -4055,29 +4339,10 @@ def render_sidebar() -> Dict:
         key_prefix="patrimonio",
     )
 
-    aportacion_min_nonzero = 100
-    aportacion_max = 50_000
-    aportacion_default = 1_000
-    aportacion_steps = 110
-    aportacion_scale = np.geomspace(aportacion_min_nonzero, aportacion_max, aportacion_steps)
-    aportacion_options = [0]
-    for v in aportacion_scale:
-        rounded = int(round(float(v) / 50) * 50)
-        if rounded > aportacion_options[-1]:
-            aportacion_options.append(rounded)
-    if aportacion_options[-1] != aportacion_max:
-        aportacion_options.append(aportacion_max)
-
-    aportacion_default_idx = min(
-        range(len(aportacion_options)),
-        key=lambda i: abs(aportacion_options[i] - aportacion_default),
-    )
-    aportacion_default_value = aportacion_options[aportacion_default_idx]
-
     aportacion_mensual = select_currency_with_exact_input(
         label="Aportación mensual (€)",
-        options=aportacion_options,
-        default_value=aportacion_default_value,
+        options=APORTACION_SLIDER_OPTIONS,
+        default_value=APORTACION_SLIDER_DEFAULT,
         exact_label="Introducir aportación exacta",
         exact_input_label="Aportación mensual exacta (€)",
         max_exact=200_000,
@@ -4123,20 +4388,6 @@ def render_sidebar() -> Dict:
             "Aportación = lo que añades cada mes."
         )
 
-    cuota_min_nonzero = 50
-    cuota_max = 15_000
-    cuota_steps = 120
-    cuota_scale = np.geomspace(cuota_min_nonzero, cuota_max, cuota_steps)
-    cuota_options = [0]
-    for v in cuota_scale:
-        rounded = int(round(float(v) / 25) * 25)
-        if rounded > cuota_options[-1]:
-            cuota_options.append(rounded)
-    if cuota_options[-1] != cuota_max:
-        cuota_options.append(cuota_max)
-
-    months_options = list(range(0, 601))
-
     with st.sidebar.expander("🏠 Patrimonio inmobiliario y deudas (opcional)", expanded=False):
         vivienda_habitual_valor = st.number_input(
             "Valor vivienda principal (€)",
@@ -4161,32 +4412,24 @@ def render_sidebar() -> Dict:
             disabled=vivienda_habitual_hipoteca <= 0,
             help="Resta esta cuota de tu capacidad de ahorro antes de FIRE y, si sigue pendiente en FIRE, la suma al gasto anual.",
         )
-        cuota_hipoteca_vivienda_mensual = 0.0
-        meses_hipoteca_vivienda_restantes = 0
-        meses_hipoteca_vivienda_restantes_exact_mode = False
-        cuotas_hipoteca_vivienda_pendientes = 0
-        if vivienda_habitual_hipoteca > 0:
-            cuota_hipoteca_vivienda_mensual = select_currency_with_exact_input(
-                "Cuota mensual hipoteca vivienda principal (€)",
-                options=cuota_options,
-                default_value=800 if 800 in cuota_options else cuota_options[min(len(cuota_options) - 1, 10)],
-                exact_label="Introducir cuota exacta vivienda",
-                exact_input_label="Cuota exacta hipoteca vivienda (€)",
-                max_exact=50_000,
-                step_exact=25,
-                help_text="Importe total mensual de la cuota actual de hipoteca.",
-                key_prefix="primary_mortgage_payment",
-            )
-            meses_hipoteca_vivienda_restantes, meses_hipoteca_vivienda_restantes_exact_mode = select_int_with_exact_input(
-                label="Meses pendientes hipoteca vivienda principal (nº)",
-                options=months_options,
-                default_value=240,
-                exact_checkbox_label="Introducir meses exactos vivienda",
-                exact_input_label="Meses exactos pendientes hipoteca vivienda principal",
-                max_exact=600,
-                key_prefix="primary_mortgage_months",
-            )
-            cuotas_hipoteca_vivienda_pendientes = int(meses_hipoteca_vivienda_restantes)
+        (
+            cuota_hipoteca_vivienda_mensual,
+            meses_hipoteca_vivienda_restantes,
+            meses_hipoteca_vivienda_restantes_exact_mode,
+            cuotas_hipoteca_vivienda_pendientes,
+        ) = select_mortgage_payment_and_months(
+            mortgage_amount=vivienda_habitual_hipoteca,
+            default_payment=800,
+            fallback_payment_idx=10,
+            payment_label="Cuota mensual hipoteca vivienda principal (€)",
+            exact_payment_label="Introducir cuota exacta vivienda",
+            exact_payment_input_label="Cuota exacta hipoteca vivienda (€)",
+            payment_help="Importe total mensual de la cuota actual de hipoteca.",
+            months_label="Meses pendientes hipoteca vivienda principal (nº)",
+            exact_months_label="Introducir meses exactos vivienda",
+            exact_months_input_label="Meses exactos pendientes hipoteca vivienda principal",
+            key_prefix="primary_mortgage",
+        )
         aplicar_ajuste_vivienda_habitual = st.checkbox(
             "Ajustar gasto de jubilación por vivienda habitual pagada",
             value=False,
@@ -4227,32 +4470,24 @@ def render_sidebar() -> Dict:
             disabled=inmuebles_invertibles_hipoteca <= 0,
             help="Aplica el mismo criterio de flujos: resta ahorro pre-FIRE y puede sumar gasto si sigue viva tras FIRE.",
         )
-        cuota_hipoteca_inmuebles_mensual = 0.0
-        meses_hipoteca_inmuebles_restantes = 0
-        meses_hipoteca_inmuebles_restantes_exact_mode = False
-        cuotas_hipoteca_inmuebles_pendientes = 0
-        if inmuebles_invertibles_hipoteca > 0:
-            cuota_hipoteca_inmuebles_mensual = select_currency_with_exact_input(
-                "Cuota mensual hipoteca inmuebles invertibles (€)",
-                options=cuota_options,
-                default_value=600 if 600 in cuota_options else cuota_options[min(len(cuota_options) - 1, 9)],
-                exact_label="Introducir cuota exacta inmuebles invertibles",
-                exact_input_label="Cuota exacta hipoteca inmuebles invertibles (€)",
-                max_exact=50_000,
-                step_exact=25,
-                help_text="Cuota mensual agregada de hipotecas en inmuebles alquilables/invertibles.",
-                key_prefix="investment_mortgage_payment",
-            )
-            meses_hipoteca_inmuebles_restantes, meses_hipoteca_inmuebles_restantes_exact_mode = select_int_with_exact_input(
-                label="Meses pendientes hipoteca inmuebles invertibles (nº)",
-                options=months_options,
-                default_value=240,
-                exact_checkbox_label="Introducir meses exactos inmuebles invertibles",
-                exact_input_label="Meses exactos pendientes hipoteca inmuebles invertibles",
-                max_exact=600,
-                key_prefix="investment_mortgage_months",
-            )
-            cuotas_hipoteca_inmuebles_pendientes = int(meses_hipoteca_inmuebles_restantes)
+        (
+            cuota_hipoteca_inmuebles_mensual,
+            meses_hipoteca_inmuebles_restantes,
+            meses_hipoteca_inmuebles_restantes_exact_mode,
+            cuotas_hipoteca_inmuebles_pendientes,
+        ) = select_mortgage_payment_and_months(
+            mortgage_amount=inmuebles_invertibles_hipoteca,
+            default_payment=600,
+            fallback_payment_idx=9,
+            payment_label="Cuota mensual hipoteca inmuebles invertibles (€)",
+            exact_payment_label="Introducir cuota exacta inmuebles invertibles",
+            exact_payment_input_label="Cuota exacta hipoteca inmuebles invertibles (€)",
+            payment_help="Cuota mensual agregada de hipotecas en inmuebles alquilables/invertibles.",
+            months_label="Meses pendientes hipoteca inmuebles invertibles (nº)",
+            exact_months_label="Introducir meses exactos inmuebles invertibles",
+            exact_months_input_label="Meses exactos pendientes hipoteca inmuebles invertibles",
+            key_prefix="investment_mortgage",
+        )
         otras_deudas = st.number_input(
             "Otras deudas (€)",
             min_value=0,
@@ -4484,7 +4719,7 @@ def render_sidebar() -> Dict:
     with st.sidebar.expander("🧓 Retiro en 2 fases", expanded=False):
         retirement_model_mode_label = st.selectbox(
             "Modelo de retiro",
-            options=["Simple (recomendado)", "Avanzado (desglose de ingresos)"],
+            options=list(RETIREMENT_MODE_LABELS.values()),
             index=0,
             key="retirement_model_mode_key",
             help=(
@@ -4492,11 +4727,7 @@ def render_sidebar() -> Dict:
                 "Avanzado: detallas pensión pública/plan privado/otras rentas."
             ),
         )
-        retirement_model_mode = (
-            "SIMPLE_TWO_PHASE"
-            if retirement_model_mode_label == "Simple (recomendado)"
-            else "ADVANCED_INCOME_BREAKDOWN"
-        )
+        retirement_model_mode = RETIREMENT_MODE_BY_LABEL[retirement_model_mode_label]
 
         # Defaults for backward-compatible simple-mode prefill.
         legacy_pre_extra = float(st.session_state.get("coste_pre_pension_anual_key", 0.0))
@@ -4866,7 +5097,7 @@ def render_sidebar() -> Dict:
     st.sidebar.markdown("### 5) Fiscalidad")
     fiscal_mode_label = st.sidebar.selectbox(
         "Modo fiscal",
-        options=["España (Tax Pack)", "Internacional básico"],
+        options=list(FISCAL_MODE_LABELS.values()),
         index=0,
         help=(
             "España (Tax Pack): fiscalidad regional española detallada. "
@@ -4874,11 +5105,7 @@ def render_sidebar() -> Dict:
         ),
         key="fiscal_mode_label_key",
     )
-    fiscal_mode = (
-        FISCAL_MODE_ES_TAXPACK
-        if fiscal_mode_label == "España (Tax Pack)"
-        else FISCAL_MODE_INTL_BASIC
-    )
+    fiscal_mode = FISCAL_MODE_BY_LABEL[fiscal_mode_label]
 
     fiscal_priority = st.sidebar.selectbox(
         "Prioridad fiscal del cálculo",
@@ -5015,7 +5242,7 @@ def render_sidebar() -> Dict:
                 key="tax_year_key",
             )
             try:
-                tax_pack = load_tax_pack(int(tax_year), "es")
+                tax_pack, _ = load_cached_tax_pack(int(tax_year))
                 tax_pack_meta = tax_pack.get("meta", {})
                 tax_pack_meta_errors = validate_tax_pack_metadata(tax_pack)
                 region_options = get_region_options(tax_pack)
@@ -5271,7 +5498,7 @@ def render_kpis(simulation_results: Dict, params: Dict) -> None:
     with col2:
         st.metric(
             label="💰 Poder adquisitivo final (P50, € de hoy)",
-            value=f"{fmt_eur(final_real)}",
+            value=fmt_eur(final_real),
             delta=f"{fmt_num_es(brecha_vs_objetivo, signed=True)} € vs objetivo FIRE",
             delta_color="normal",
         )
@@ -5298,7 +5525,7 @@ def render_kpis(simulation_results: Dict, params: Dict) -> None:
     with col5:
         st.metric(
             label="🧾 Patrimonio nominal final (P50)",
-            value=f"{fmt_eur(final_nominal)}",
+            value=fmt_eur(final_nominal),
             delta="Euros futuros al final del horizonte",
             delta_color="off",
         )
@@ -5336,10 +5563,10 @@ def render_tax_trace(params: Dict, tax_pack: Optional[Dict]) -> None:
                 "Estimación simplificada con tasas efectivas manuales para ahorradores con residencia fiscal fuera de España."
             )
             col_a, col_b, col_c, col_d = st.columns(4)
-            col_a.metric("Retirada bruta", f"{fmt_eur(ctx['gross_withdrawal_required'])}")
-            col_b.metric("Impuesto ahorro estimado", f"{fmt_eur(ctx['annual_savings_tax_retirement'])}")
-            col_c.metric("Impuesto patrimonio estimado", f"{fmt_eur(ctx['annual_wealth_tax_retirement'])}")
-            col_d.metric("Total fiscal anual", f"{fmt_eur(ctx['total_annual_tax_retirement'])}")
+            col_a.metric("Retirada bruta", fmt_eur(ctx['gross_withdrawal_required']))
+            col_b.metric("Impuesto ahorro estimado", fmt_eur(ctx['annual_savings_tax_retirement']))
+            col_c.metric("Impuesto patrimonio estimado", fmt_eur(ctx['annual_wealth_tax_retirement']))
+            col_d.metric("Total fiscal anual", fmt_eur(ctx['total_annual_tax_retirement']))
         else:
             st.subheader("🧾 Fiscalidad internacional (aproximación)")
             st.caption(
@@ -5364,10 +5591,10 @@ def render_tax_trace(params: Dict, tax_pack: Optional[Dict]) -> None:
         st.subheader("🧾 Resumen Fiscal en Jubilación (estimación anual)")
         st.caption("Estimación sobre retirada anual y cartera objetivo durante la jubilación.")
         col_a, col_b, col_c, col_d = st.columns(4)
-        col_a.metric("Retirada bruta", f"{fmt_eur(gross_withdrawal)}")
-        col_b.metric("IRPF ahorro retiro", f"{fmt_eur(ctx['annual_savings_tax_retirement'])}")
-        col_c.metric("Patrimonio + ISGF", f"{fmt_eur(ctx['annual_wealth_tax_retirement'])}")
-        col_d.metric("Total fiscal retiro", f"{fmt_eur(ctx['total_annual_tax_retirement'])}")
+        col_a.metric("Retirada bruta", fmt_eur(gross_withdrawal))
+        col_b.metric("IRPF ahorro retiro", fmt_eur(ctx['annual_savings_tax_retirement']))
+        col_c.metric("Patrimonio + ISGF", fmt_eur(ctx['annual_wealth_tax_retirement']))
+        col_d.metric("Total fiscal retiro", fmt_eur(ctx['total_annual_tax_retirement']))
 
         with st.expander("Ver detalle técnico (jubilación)", expanded=False):
             st.write(
@@ -5562,10 +5789,10 @@ def render_tax_trace(params: Dict, tax_pack: Optional[Dict]) -> None:
     total_tax = savings_detail["tax"] + wealth_detail["total_wealth_tax"]
 
     col_a, col_b, col_c, col_d = st.columns(4)
-    col_a.metric("Base ahorro", f"{fmt_eur(assumed_growth)}")
-    col_b.metric("IRPF ahorro", f"{fmt_eur(savings_detail['tax'])}")
-    col_c.metric("Patrimonio + ISGF", f"{fmt_eur(wealth_detail['total_wealth_tax'])}")
-    col_d.metric("Total fiscal estimado", f"{fmt_eur(total_tax)}")
+    col_a.metric("Base ahorro", fmt_eur(assumed_growth))
+    col_b.metric("IRPF ahorro", fmt_eur(savings_detail['tax']))
+    col_c.metric("Patrimonio + ISGF", fmt_eur(wealth_detail['total_wealth_tax']))
+    col_d.metric("Total fiscal estimado", fmt_eur(total_tax))
 
     st.markdown(
         f"- Región: **{savings_detail['region']}**  \n"
@@ -5824,7 +6051,7 @@ def render_main_chart(simulation_results: Dict, params: Dict) -> None:
         seq_col1, seq_col2, seq_col3 = st.columns(3)
         seq_col1.metric(
             "🧨 Riesgo de secuencia (brecha final real)",
-            f"{fmt_eur(seq_spread_real)}",
+            fmt_eur(seq_spread_real),
             delta="Mejor ventana - peor ventana",
             delta_color="off",
         )
@@ -5961,6 +6188,7 @@ def render_sensitivity_analysis(simulation_results: Dict, params: Dict) -> None:
     fiscal_priority_mode = params.get("fiscal_priority")
     use_accumulation_taxes = fiscal_priority_mode in ("Acumulación", "Mixta (acumulación + jubilación)")
     tax_pack_for_sensitivity = None
+    tax_pack_key = ""
     if (
         use_accumulation_taxes
         and params.get("fiscal_mode", FISCAL_MODE_ES_TAXPACK) == FISCAL_MODE_ES_TAXPACK
@@ -5968,9 +6196,10 @@ def render_sensitivity_analysis(simulation_results: Dict, params: Dict) -> None:
         and params.get("region")
     ):
         try:
-            tax_pack_for_sensitivity = load_tax_pack(int(params["tax_year"]), "es")
+            tax_pack_for_sensitivity, tax_pack_key = load_cached_tax_pack(int(params["tax_year"]))
         except Exception:
             tax_pack_for_sensitivity = None
+            tax_pack_key = ""
 
     accumulation_sale_enabled = bool(
         params.get("property_sale_enabled", False)
@@ -5986,35 +6215,50 @@ def render_sensitivity_analysis(simulation_results: Dict, params: Dict) -> None:
     accumulation_rental_drop_annual = float(params.get("property_sale_rental_drop_annual", 0.0))
     annual_spending_for_target = float(params.get("annual_spending_for_target", params.get("gasto_anual_neto_cartera", params["gastos_anuales"])))
 
+    # The center cell is anchored to the active simulation below, so it is not re-simulated.
+    center_i = inflation_offsets.index(0)
+    center_j = return_offsets.index(0)
+    # Only return and inflation vary across the grid; the rest is shared by every cell.
+    shared_cell_kwargs = dict(
+        initial_wealth=base_portfolio,
+        monthly_contribution=float(params.get("aportacion_mensual_efectiva", params["aportacion_mensual"])),
+        years=years_horizon,
+        volatility=float(params["volatilidad"]),
+        annual_spending=annual_spending_for_target,
+        safe_withdrawal_rate=float(params["safe_withdrawal_rate"]),
+        contribution_growth_rate=contribution_growth_rate,
+        property_sale_enabled=accumulation_sale_enabled,
+        property_sale_year=accumulation_sale_year,
+        property_sale_amount=accumulation_sale_amount_net,
+        rental_drop_enabled=accumulation_rental_drop_enabled,
+        rental_drop_year=accumulation_rental_drop_year,
+        rental_drop_annual_amount=accumulation_rental_drop_annual,
+        tax_pack_key=tax_pack_key,
+        _tax_pack=tax_pack_for_sensitivity,
+        region=params.get("region"),
+    )
+    cell_key_suffix = (
+        f"{params['volatilidad']}_{params['safe_withdrawal_rate']}_{annual_spending_for_target}_"
+        f"{params.get('contribution_growth_rate', 0.0)}_{params.get('fiscal_priority')}_{params.get('fiscal_mode')}_{params.get('region')}_{params.get('tax_year')}_"
+        f"{accumulation_sale_enabled}_{accumulation_sale_year}_{accumulation_sale_amount_net}_{accumulation_rental_drop_enabled}_{accumulation_rental_drop_annual}"
+    )
     for i, inf_offset in enumerate(inflation_offsets):
         for j, ret_offset in enumerate(return_offsets):
+            if (i, j) == (center_i, center_j):
+                continue
             test_return = (base_return + ret_offset) / 100
             test_inflation = (base_inflation + inf_offset) / 100
             cell_key = (
                 f"sens_mc_{params.get('patrimonio_base_simulacion')}_{params.get('aportacion_mensual_efectiva')}_{years_horizon}_"
-                f"{test_return}_{test_inflation}_{params['volatilidad']}_{params['safe_withdrawal_rate']}_{annual_spending_for_target}_"
-                f"{params.get('contribution_growth_rate', 0.0)}_{params.get('fiscal_priority')}_{params.get('fiscal_mode')}_{params.get('region')}_{params.get('tax_year')}_"
-                f"{accumulation_sale_enabled}_{accumulation_sale_year}_{accumulation_sale_amount_net}_{accumulation_rental_drop_enabled}_{accumulation_rental_drop_annual}"
+                f"{test_return}_{test_inflation}_{cell_key_suffix}"
             )
             cell_result = run_cached_sensitivity_cell(
-                params_key=cell_key,
-                initial_wealth=base_portfolio,
-                monthly_contribution=float(params.get("aportacion_mensual_efectiva", params["aportacion_mensual"])),
-                years=years_horizon,
-                mean_return=test_return,
-                volatility=float(params["volatilidad"]),
-                inflation_rate=test_inflation,
-                annual_spending=annual_spending_for_target,
-                safe_withdrawal_rate=float(params["safe_withdrawal_rate"]),
-                contribution_growth_rate=contribution_growth_rate,
-                property_sale_enabled=accumulation_sale_enabled,
-                property_sale_year=accumulation_sale_year,
-                property_sale_amount=accumulation_sale_amount_net,
-                rental_drop_enabled=accumulation_rental_drop_enabled,
-                rental_drop_year=accumulation_rental_drop_year,
-                rental_drop_annual_amount=accumulation_rental_drop_annual,
-                tax_pack=tax_pack_for_sensitivity,
-                region=params.get("region"),
+                **dict(
+                    shared_cell_kwargs,
+                    params_key=cell_key,
+                    mean_return=test_return,
+                    inflation_rate=test_inflation,
+                )
             )
             years_to_target = find_years_to_fire(
                 np.asarray(cell_result.get("real_percentile_50", []), dtype=float),
@@ -6026,8 +6270,6 @@ def render_sensitivity_analysis(simulation_results: Dict, params: Dict) -> None:
 
     # Anchor the center cell to the active simulation (P50 real path) to avoid contradictions
     # between matrix banner and the main scenario shown above.
-    center_i = inflation_offsets.index(0)
-    center_j = return_offsets.index(0)
     base_years_to_fire_sim = find_years_to_fire(
         np.asarray(simulation_results.get("real_percentile_50", []), dtype=float),
         float(fire_target),
@@ -6274,7 +6516,7 @@ def render_accumulation_box(simulation_results: Dict, params: Dict) -> None:
         delta_label = f"{years_value} años hasta FIRE" if years_value is not None else "No alcanza FIRE"
         col.metric(
             f"{label} capital final",
-            f"{fmt_eur(float(accumulation_df[f'{label} nominal (€)'].iloc[-1]))}",
+            fmt_eur(float(accumulation_df[f'{label} nominal (€)'].iloc[-1])),
             delta=delta_label,
             delta_color="normal" if years_value is not None else "off",
         )
@@ -6342,7 +6584,7 @@ def render_export_options(simulation_results: Dict, params: Dict) -> None:
                 "success_rate_final": float(simulation_results.get("success_rate_final", 0.0)),
                 "final_median_nominal": float(simulation_results.get("final_median", 0.0)),
                 "final_median_real": float(simulation_results.get("final_median_real", 0.0)),
-                "fire_target_display": float(fire_target),
+                "fire_target_display": fire_target,
             },
         )
         st.download_button(
@@ -6568,15 +6810,17 @@ def main():
         }
 
         tax_pack_for_run = None
+        tax_pack_run_key = ""
         if (
             params.get("fiscal_mode", FISCAL_MODE_ES_TAXPACK) == FISCAL_MODE_ES_TAXPACK
             and params.get("tax_year") is not None
             and params.get("region")
         ):
             try:
-                tax_pack_for_run = load_tax_pack(int(params["tax_year"]), "es")
+                tax_pack_for_run, tax_pack_run_key = load_cached_tax_pack(int(params["tax_year"]))
             except Exception:
                 tax_pack_for_run = None
+                tax_pack_run_key = ""
 
         fiscal_priority_mode = params.get("fiscal_priority")
         use_retirement_focus = fiscal_priority_mode in ("Jubilación", "Mixta (acumulación + jubilación)")
@@ -6616,6 +6860,7 @@ def main():
             tax_pack_accumulation = tax_pack_for_run if use_accumulation_taxes else None
 
         params["annual_spending_for_target"] = annual_spending_for_target
+        tax_pack_accumulation_key = tax_pack_run_key if tax_pack_accumulation is not None else ""
 
         accumulation_sale_enabled = bool(
             params.get("property_sale_enabled", False)
@@ -6631,8 +6876,56 @@ def main():
         accumulation_rental_drop_year = accumulation_sale_year
         accumulation_rental_drop_annual = float(params.get("property_sale_rental_drop_annual", 0.0))
 
+        # Everything except the model and historical strategy is shared by every run below.
+        shared_key_prefix = (
+            f"{params['patrimonio_inicial']}_{params.get('patrimonio_base_simulacion')}_{params['aportacion_mensual']}_"
+            f"{params.get('aportacion_mensual_efectiva')}_{params.get('renta_neta_alquiler_anual_efectiva')}_"
+            f"{params.get('cuota_total_hipotecas_mensual_efectiva')}_{params.get('cuota_post_fire_hipotecas_mensual_efectiva')}_"
+            f"{params.get('ahorro_vivienda_habitual_anual_efectivo')}_"
+            f"{params['rentabilidad_esperada']}_{params['volatilidad']}_{params['inflacion']}_"
+            f"{params.get('contribution_growth_rate')}_"
+            f"{params['gastos_anuales']}_{params.get('gasto_anual_neto_cartera')}_{params['regimen_fiscal']}_{params['include_optimización']}_"
+            f"{params.get('fiscal_mode')}_{params.get('intl_tax_rates')}_"
+            f"{params['safe_withdrawal_rate']}_{params.get('fiscal_priority')}_{params.get('taxable_withdrawal_ratio_effective')}_"
+            f"{accumulation_sale_enabled}_{accumulation_sale_year}_{accumulation_sale_amount_net}_"
+            f"{accumulation_rental_drop_enabled}_{accumulation_rental_drop_year}_{accumulation_rental_drop_annual}_"
+        )
+        shared_sim_kwargs = dict(
+            initial_wealth=params.get("patrimonio_base_simulacion", params["patrimonio_inicial"]),
+            monthly_contribution=params.get("aportacion_mensual_efectiva", params["aportacion_mensual"]),
+            years=params["edad_objetivo"] - params["edad_actual"],
+            mean_return=mean_return_for_sim,
+            volatility=params["volatilidad"],
+            inflation_rate=params["inflacion"],
+            annual_spending=annual_spending_for_target,
+            safe_withdrawal_rate=params["safe_withdrawal_rate"],
+            contribution_growth_rate=params.get("contribution_growth_rate", 0.0),
+            property_sale_enabled=accumulation_sale_enabled,
+            property_sale_year=accumulation_sale_year,
+            property_sale_amount=accumulation_sale_amount_net,
+            rental_drop_enabled=accumulation_rental_drop_enabled,
+            rental_drop_year=accumulation_rental_drop_year,
+            rental_drop_annual_amount=accumulation_rental_drop_annual,
+            tax_pack_key=tax_pack_accumulation_key,
+            _tax_pack=tax_pack_accumulation,
+            region=params.get("region"),
+        )
+
+        def _run_model(model_type: str, historical_strategy: str) -> Dict:
+            return run_cached_simulation(
+                params_key=(
+                    f"{shared_key_prefix}{model_type}_{historical_strategy}_"
+                    f"{params.get('tax_year')}_{params.get('region')}"
+                ),
+                model_type=model_type,
+                historical_strategy=historical_strategy,
+                **shared_sim_kwargs,
+            )
+
         simulation_results_by_model: Dict[str, Dict] = {}
-        for model_label, model_type in model_map.items():
+        # Cache hits finish instantly; on a cold run each model reports as soon as it is done.
+        models_progress = st.progress(0.0, text=f"Simulando {next(iter(model_map))}...")
+        for done, (model_label, model_type) in enumerate(model_map.items(), start=1):
             if model_type == "bootstrap":
                 historical_strategy_label = st.session_state["bootstrap_historical_strategy_label"]
             elif model_type == "backtest":
@@ -6640,45 +6933,14 @@ def main():
             else:
                 historical_strategy_label = default_strategy_label
             historical_strategy = strategy_map[historical_strategy_label]
-
-            params_key = (
-                f"{params['patrimonio_inicial']}_{params.get('patrimonio_base_simulacion')}_{params['aportacion_mensual']}_"
-                f"{params.get('aportacion_mensual_efectiva')}_{params.get('renta_neta_alquiler_anual_efectiva')}_"
-                f"{params.get('cuota_total_hipotecas_mensual_efectiva')}_{params.get('cuota_post_fire_hipotecas_mensual_efectiva')}_"
-                f"{params.get('ahorro_vivienda_habitual_anual_efectivo')}_"
-                f"{params['rentabilidad_esperada']}_{params['volatilidad']}_{params['inflacion']}_"
-                f"{params.get('contribution_growth_rate')}_"
-                f"{params['gastos_anuales']}_{params.get('gasto_anual_neto_cartera')}_{params['regimen_fiscal']}_{params['include_optimización']}_"
-                f"{params.get('fiscal_mode')}_{params.get('intl_tax_rates')}_"
-                f"{params['safe_withdrawal_rate']}_{params.get('fiscal_priority')}_{params.get('taxable_withdrawal_ratio_effective')}_"
-                f"{accumulation_sale_enabled}_{accumulation_sale_year}_{accumulation_sale_amount_net}_"
-                f"{accumulation_rental_drop_enabled}_{accumulation_rental_drop_year}_{accumulation_rental_drop_annual}_"
-                f"{model_type}_{historical_strategy}_{params.get('tax_year')}_{params.get('region')}"
-            )
-            simulation_results_by_model[model_label] = run_cached_simulation(
-                params_key=params_key,
-                initial_wealth=params.get("patrimonio_base_simulacion", params["patrimonio_inicial"]),
-                monthly_contribution=params.get("aportacion_mensual_efectiva", params["aportacion_mensual"]),
-                years=params["edad_objetivo"] - params["edad_actual"],
-                mean_return=mean_return_for_sim,
-                volatility=params["volatilidad"],
-                inflation_rate=params["inflacion"],
-                annual_spending=annual_spending_for_target,
-                safe_withdrawal_rate=params["safe_withdrawal_rate"],
-                contribution_growth_rate=params.get("contribution_growth_rate", 0.0),
-                model_type=model_type,
-                historical_strategy=historical_strategy,
-                property_sale_enabled=accumulation_sale_enabled,
-                property_sale_year=accumulation_sale_year,
-                property_sale_amount=accumulation_sale_amount_net,
-                rental_drop_enabled=accumulation_rental_drop_enabled,
-                rental_drop_year=accumulation_rental_drop_year,
-                rental_drop_annual_amount=accumulation_rental_drop_annual,
-                tax_pack=tax_pack_accumulation,
-                region=params.get("region"),
-            )
+            simulation_results_by_model[model_label] = _run_model(model_type, historical_strategy)
             simulation_results_by_model[model_label]["historical_strategy_label"] = historical_strategy_label
             simulation_results_by_model[model_label]["historical_strategy"] = historical_strategy
+            models_progress.progress(
+                done / len(model_map),
+                text=f"{done}/{len(model_map)} modelos simulados ({model_label}).",
+            )
+        models_progress.empty()
 
     tab_labels = list(simulation_results_by_model.keys())
     tabs = st.tabs(tab_labels)
@@ -6703,42 +6965,7 @@ def main():
                 chosen_strategy = strategy_map[chosen_label]
                 if simulation_results_by_model[label].get("historical_strategy") != chosen_strategy:
                     model_type = "bootstrap" if label == "Monte Carlo (Bootstrap histórico)" else "backtest"
-                    params_key = (
-                        f"{params['patrimonio_inicial']}_{params.get('patrimonio_base_simulacion')}_{params['aportacion_mensual']}_"
-                        f"{params.get('aportacion_mensual_efectiva')}_{params.get('renta_neta_alquiler_anual_efectiva')}_"
-                        f"{params.get('cuota_total_hipotecas_mensual_efectiva')}_{params.get('cuota_post_fire_hipotecas_mensual_efectiva')}_"
-                        f"{params.get('ahorro_vivienda_habitual_anual_efectivo')}_"
-                        f"{params['rentabilidad_esperada']}_{params['volatilidad']}_{params['inflacion']}_"
-                        f"{params.get('contribution_growth_rate')}_"
-                        f"{params['gastos_anuales']}_{params.get('gasto_anual_neto_cartera')}_{params['regimen_fiscal']}_{params['include_optimización']}_"
-                        f"{params.get('fiscal_mode')}_{params.get('intl_tax_rates')}_"
-                        f"{params['safe_withdrawal_rate']}_{params.get('fiscal_priority')}_{params.get('taxable_withdrawal_ratio_effective')}_"
-                        f"{accumulation_sale_enabled}_{accumulation_sale_year}_{accumulation_sale_amount_net}_"
-                        f"{accumulation_rental_drop_enabled}_{accumulation_rental_drop_year}_{accumulation_rental_drop_annual}_"
-                        f"{model_type}_{chosen_strategy}_{params.get('tax_year')}_{params.get('region')}"
-                    )
-                    simulation_results_by_model[label] = run_cached_simulation(
-                        params_key=params_key,
-                        initial_wealth=params.get("patrimonio_base_simulacion", params["patrimonio_inicial"]),
-                        monthly_contribution=params.get("aportacion_mensual_efectiva", params["aportacion_mensual"]),
-                        years=params["edad_objetivo"] - params["edad_actual"],
-                        mean_return=mean_return_for_sim,
-                        volatility=params["volatilidad"],
-                        inflation_rate=params["inflacion"],
-                        annual_spending=annual_spending_for_target,
-                        safe_withdrawal_rate=params["safe_withdrawal_rate"],
-                        contribution_growth_rate=params.get("contribution_growth_rate", 0.0),
-                        model_type=model_type,
-                        historical_strategy=chosen_strategy,
-                        property_sale_enabled=accumulation_sale_enabled,
-                        property_sale_year=accumulation_sale_year,
-                        property_sale_amount=accumulation_sale_amount_net,
-                        rental_drop_enabled=accumulation_rental_drop_enabled,
-                        rental_drop_year=accumulation_rental_drop_year,
-                        rental_drop_annual_amount=accumulation_rental_drop_annual,
-                        tax_pack=tax_pack_accumulation,
-                        region=params.get("region"),
-                    )
+                    simulation_results_by_model[label] = _run_model(model_type, chosen_strategy)
                     simulation_results_by_model[label]["historical_strategy_label"] = chosen_label
                     simulation_results_by_model[label]["historical_strategy"] = chosen_strategy
 
@@ -293,15 +293,13 @@ def project_retirement(
     """Project portfolio during retirement (decumulation phase)."""
     portfolio = portfolio_at_retirement
     results: Dict[int, Dict[str, float]] = {}
-    inflation_factor = 1.0
     
     for year in range(1, years_in_retirement + 1):
-        inflation_adjusted_spending = annual_spending * inflation_factor
+        inflation_adjusted_spending = annual_spending * math.pow(1 + inflation_rate, year - 1)
         growth = portfolio * expected_return
         tax_on_growth = growth * tax_rate_on_gains
         net_growth = growth - tax_on_growth
         portfolio = portfolio + net_growth - inflation_adjusted_spending
-        inflation_factor *= (1 + inflation_rate)
         
         results[year] = {
             "portfolio_value": max(portfolio, 0),
@@ -2,6 +2,8 @@
 
 from typing import Dict, Optional, Any, Iterable, Mapping
 
+import numpy as np
+
 from src.tax_engine import (
     calculate_savings_tax_with_details,
     calculate_wealth_taxes_with_details,
@@ -10,6 +12,9 @@ from src.tax_engine import (
 
 DECUM_BACKTEST_PERCENTILES = ("P5", "P25", "P50", "P75", "P95")
 
+# Categories of the decumulation `Tramo` column; builders store its int8 code.
+DECUM_TRAMO_LABELS = ("Pre-pensión", "Post-pensión")
+
 DECUM_BACKTEST_WINDOW_TEMPLATES: Dict[str, Dict[str, Any]] = {
     "Choque temprano (estilo 1929)": {
         "description": "Arranca en tramo histórico duro y mejora progresivamente.",
@@ -220,10 +225,82 @@ def estimate_auto_taxable_withdrawal_ratio(
     return min(1.0, gains / portfolio)
 
 
-def build_decumulation_table_two_stage_schedule(
+def build_padded_schedule(schedule: Optional[Any], length: int, dtype: Any = np.float64) -> np.ndarray:
+    """Non-negative per-year values of an optional schedule, zero-filled to `length`.
+
+    Pass dtype=np.int64 for integer schedules (values truncate before clamping).
+    """
+    values = np.zeros(max(0, int(length)), dtype=dtype)
+    if schedule is not None and len(schedule) > 0 and len(values) > 0:
+        n = min(len(schedule), len(values))
+        values[:n] = np.asarray(schedule[:n]).astype(dtype)
+    return np.maximum(values, 0, out=values)
+
+
+def build_inflation_factors(inflation_rate: float, length: int) -> np.ndarray:
+    """Cumulative inflation multipliers [1, (1+i), (1+i)^2, ...] for `length` years.
+
+    Built as a running product, so each factor equals the year-by-year
+    compounding of the decumulation tables.
+    """
+    factors = np.empty(max(0, int(length)), dtype=np.float64)
+    if len(factors) > 0:
+        factors[0] = 1.0
+        np.cumprod(np.full(len(factors) - 1, 1 + inflation_rate, dtype=np.float64), out=factors[1:])
+    return factors
+
+
+def build_property_sale_column(
+    property_sale_enabled: bool,
+    property_sale_year: int,
+    property_sale_amount: float,
+    inflation_factors: np.ndarray,
+) -> np.ndarray:
+    """Nominal property-sale inflow per retirement year (single non-zero entry at most)."""
+    sale_col = np.zeros(len(inflation_factors), dtype=np.float64)
+    sale_year = int(property_sale_year)
+    if property_sale_enabled and 1 <= sale_year <= len(sale_col):
+        sale_col[sale_year - 1] = max(0.0, float(property_sale_amount)) * inflation_factors[sale_year - 1]
+    return sale_col
+
+
+def simulate_capital_paths(
+    starting_portfolios: Any,
+    annual_returns: Any,
+    withdrawals: Any,
+    inflows: Any,
+    tax_rate_on_gains: float,
+) -> tuple:
+    """Year-by-year capital carry for a batch of portfolios sharing one schedule.
+
+    `annual_returns` has shape (..., years) and `starting_portfolios` broadcasts
+    against its leading axes; withdrawals and inflows are per-year vectors.
+    Returns (capital_inicial, crecimiento_neto, capital_final) arrays of the
+    broadcast shape. This is the only capital loop of the decumulation tables.
+    """
+    annual_returns = np.asarray(annual_returns, dtype=np.float64)
+    withdrawals = np.asarray(withdrawals, dtype=np.float64)
+    inflows = np.asarray(inflows, dtype=np.float64)
+    tax_rate = max(0.0, float(tax_rate_on_gains))
+    portfolio = np.maximum(np.asarray(starting_portfolios, dtype=np.float64), 0.0)
+    shape = np.broadcast_shapes(portfolio.shape + (len(withdrawals),), annual_returns.shape)
+    capital_inicial = np.empty(shape, dtype=np.float64)
+    growth_net = np.empty(shape, dtype=np.float64)
+    capital_final = np.empty(shape, dtype=np.float64)
+    for year_idx in range(shape[-1]):
+        start_of_year = portfolio + inflows[year_idx]
+        growth_gross = start_of_year * annual_returns[..., year_idx]
+        growth = growth_gross - np.maximum(growth_gross, 0.0) * tax_rate
+        portfolio = np.maximum(start_of_year + growth - withdrawals[year_idx], 0.0)
+        capital_inicial[..., year_idx] = start_of_year
+        growth_net[..., year_idx] = growth
+        capital_final[..., year_idx] = portfolio
+    return capital_inicial, growth_net, capital_final
+
+
+def simulate_two_stage_columns(
     starting_portfolio: float,
     fire_age: int,
-    years_in_retirement: int,
     annual_spending_base: float,
     pension_public_start_age: int,
     pension_public_net_annual: float,
@@ -232,7 +309,7 @@ def build_decumulation_table_two_stage_schedule(
     plan_private_net_annual: float,
     other_income_post_pension_annual: float,
     pre_pension_extra_cost_annual: float,
-    expected_return: float,
+    annual_returns_sequence: Any,
     inflation_rate: float,
     tax_rate_on_gains: float,
     annual_mortgage_schedule: Optional[list] = None,
@@ -241,84 +318,137 @@ def build_decumulation_table_two_stage_schedule(
     property_sale_year: int = 0,
     property_sale_amount: float = 0.0,
     annual_extra_withdrawal_schedule: Optional[list] = None,
-) -> Any:
-    """Two-stage decumulation with explicit public/private pension schedule."""
-    rows = []
-    portfolio = float(max(0.0, starting_portfolio))
-    inflation_factor = 1.0
-    plan_private_end_age = plan_private_start_age + max(0, plan_private_duration_years) - 1
+) -> Dict[str, np.ndarray]:
+    """Two-stage decumulation columns for one yearly return path.
 
-    for year in range(1, years_in_retirement + 1):
-        age = fire_age + year - 1
-        tramo = "Pre-pensión" if age < pension_public_start_age else "Post-pensión"
-
-        income_public = pension_public_net_annual if age >= pension_public_start_age else 0.0
-        income_private = (
-            plan_private_net_annual
-            if plan_private_duration_years > 0 and plan_private_start_age <= age <= plan_private_end_age
-            else 0.0
+    Shared by the fixed-return table and the backtesting variant; `Tramo`
+    holds post-pension flags for build_decumulation_frame.
+    """
+    annual_returns = np.asarray(annual_returns_sequence, dtype=np.float64)
+    years_in_retirement = len(annual_returns)
+    plan_private_end_age = plan_private_start_age + max(0, plan_private_duration_years) - 1
+    inflation = build_inflation_factors(inflation_rate, years_in_retirement)
+    sale_col = build_property_sale_column(property_sale_enabled, property_sale_year, property_sale_amount, inflation)
+    mortgage_col = build_padded_schedule(annual_mortgage_schedule, years_in_retirement)
+    extra_withdrawal_col = build_padded_schedule(annual_extra_withdrawal_schedule, years_in_retirement)
+    pending_col = build_padded_schedule(pending_installments_end_schedule, years_in_retirement, np.int64)
+
+    years = np.arange(1, years_in_retirement + 1, dtype=np.int64)
+    ages = years + (fire_age - 1)
+    post_pension = ages >= pension_public_start_age
+    private_active = (
+        (ages >= plan_private_start_age) & (ages <= plan_private_end_age)
+        if plan_private_duration_years > 0
+        else np.zeros(years_in_retirement, dtype=bool)
+    )
+    income_public = np.where(post_pension, float(pension_public_net_annual), 0.0)
+    income_private = np.where(private_active, float(plan_private_net_annual), 0.0)
+    income_other = np.where(post_pension, float(other_income_post_pension_annual), 0.0)
+    extra_cost = np.where(post_pension, 0.0, float(pre_pension_extra_cost_annual))
+    annual_need_from_portfolio = np.maximum(
+        annual_spending_base + extra_cost - income_public - income_private - income_other,
+        0.0,
+    )
+    retirada_col = (annual_need_from_portfolio * inflation) + mortgage_col + extra_withdrawal_col
+
+    capital_inicial_col, growth_net_col, capital_final_col = (
+        path[0]
+        for path in simulate_capital_paths(
+            [starting_portfolio],
+            annual_returns[None, :],
+            retirada_col,
+            sale_col,
+            tax_rate_on_gains,
         )
-        income_other = other_income_post_pension_annual if age >= pension_public_start_age else 0.0
-        extra_cost = pre_pension_extra_cost_annual if age < pension_public_start_age else 0.0
+    )
+
+    return {
+        "Año jubilación": years,
+        "Edad": ages,
+        "Tramo": post_pension,
+        "Necesidad base cartera (€)": annual_spending_base * inflation,
+        "Ingreso pensión pública (€)": income_public * inflation,
+        "Ingreso plan privado (€)": income_private * inflation,
+        "Otras rentas (€)": income_other * inflation,
+        "Ingresos totales (€)": (income_public + income_private + income_other) * inflation,
+        "Coste extra pre-pensión (€)": extra_cost * inflation,
+        "Ajuste venta/alquiler (€)": extra_withdrawal_col,
+        "Venta inmueble (€)": sale_col,
+        "Cuota hipoteca pendiente (€)": mortgage_col,
+        "Cuotas pendientes fin año": pending_col,
+        "Capital inicial (€)": capital_inicial_col,
+        "Retirada anual (€)": retirada_col,
+        "Crecimiento neto (€)": growth_net_col,
+        "Capital final (€)": capital_final_col,
+        "Capital agotado": capital_final_col <= 0,
+    }
 
-        annual_need_from_portfolio = max(
-            0.0,
-            annual_spending_base + extra_cost - income_public - income_private - income_other,
-        )
-        annual_mortgage_cost = 0.0
-        if annual_mortgage_schedule and year - 1 < len(annual_mortgage_schedule):
-            annual_mortgage_cost = max(0.0, float(annual_mortgage_schedule[year - 1]))
-        annual_extra_withdrawal = 0.0
-        if annual_extra_withdrawal_schedule and year - 1 < len(annual_extra_withdrawal_schedule):
-            annual_extra_withdrawal = max(0.0, float(annual_extra_withdrawal_schedule[year - 1]))
-        pending_installments_end_year = 0
-        if pending_installments_end_schedule and year - 1 < len(pending_installments_end_schedule):
-            pending_installments_end_year = max(0, int(pending_installments_end_schedule[year - 1]))
-
-        sale_nominal = (
-            max(0.0, float(property_sale_amount)) * inflation_factor
-            if property_sale_enabled and int(property_sale_year) == year
-            else 0.0
-        )
-        capital_inicial = portfolio + sale_nominal
-        retirada = (annual_need_from_portfolio * inflation_factor) + annual_mortgage_cost + annual_extra_withdrawal
-        growth_gross = capital_inicial * expected_return
-        tax_growth = max(0.0, growth_gross) * max(0.0, tax_rate_on_gains)
-        growth_net = growth_gross - tax_growth
-        capital_final = max(0.0, capital_inicial + growth_net - retirada)
-
-        rows.append(
-            {
-                "Año jubilación": year,
-                "Edad": age,
-                "Tramo": tramo,
-                "Necesidad base cartera (€)": annual_spending_base * inflation_factor,
-                "Ingreso pensión pública (€)": income_public * inflation_factor,
-                "Ingreso plan privado (€)": income_private * inflation_factor,
-                "Otras rentas (€)": income_other * inflation_factor,
-                "Ingresos totales (€)": (income_public + income_private + income_other) * inflation_factor,
-                "Coste extra pre-pensión (€)": extra_cost * inflation_factor,
-                "Ajuste venta/alquiler (€)": annual_extra_withdrawal,
-                "Venta inmueble (€)": sale_nominal,
-                "Cuota hipoteca pendiente (€)": annual_mortgage_cost,
-                "Cuotas pendientes fin año": pending_installments_end_year,
-                "Capital inicial (€)": capital_inicial,
-                "Retirada anual (€)": retirada,
-                "Crecimiento neto (€)": growth_net,
-                "Capital final (€)": capital_final,
-                "Capital agotado": capital_final <= 0,
-            }
-        )
 
-        portfolio = capital_final
-        inflation_factor *= (1 + inflation_rate)
+def build_decumulation_frame(columns: Dict[str, np.ndarray]) -> Any:
+    """Build the decumulation DataFrame in one call from per-column arrays.
 
+    `Tramo` arrives as post-pension flags and is stored as a categorical.
+    With no retirement years the table has no columns, as it always had.
+    """
     try:
         import pandas as pd  # type: ignore
     except ModuleNotFoundError as exc:
         raise RuntimeError("pandas is required to build decumulation tables.") from exc
 
-    return pd.DataFrame(rows)
+    if len(columns["Año jubilación"]) == 0:
+        return pd.DataFrame()
+    columns["Tramo"] = pd.Categorical.from_codes(
+        np.asarray(columns["Tramo"], dtype=np.int8),
+        categories=list(DECUM_TRAMO_LABELS),
+    )
+    return pd.DataFrame(columns)
+
+
+def build_decumulation_table_two_stage_schedule(
+    starting_portfolio: float,
+    fire_age: int,
+    years_in_retirement: int,
+    annual_spending_base: float,
+    pension_public_start_age: int,
+    pension_public_net_annual: float,
+    plan_private_start_age: int,
+    plan_private_duration_years: int,
+    plan_private_net_annual: float,
+    other_income_post_pension_annual: float,
+    pre_pension_extra_cost_annual: float,
+    expected_return: float,
+    inflation_rate: float,
+    tax_rate_on_gains: float,
+    annual_mortgage_schedule: Optional[list] = None,
+    pending_installments_end_schedule: Optional[list] = None,
+    property_sale_enabled: bool = False,
+    property_sale_year: int = 0,
+    property_sale_amount: float = 0.0,
+    annual_extra_withdrawal_schedule: Optional[list] = None,
+) -> Any:
+    """Two-stage decumulation with explicit public/private pension schedule."""
+    columns = simulate_two_stage_columns(
+        starting_portfolio=starting_portfolio,
+        fire_age=fire_age,
+        annual_spending_base=annual_spending_base,
+        pension_public_start_age=pension_public_start_age,
+        pension_public_net_annual=pension_public_net_annual,
+        plan_private_start_age=plan_private_start_age,
+        plan_private_duration_years=plan_private_duration_years,
+        plan_private_net_annual=plan_private_net_annual,
+        other_income_post_pension_annual=other_income_post_pension_annual,
+        pre_pension_extra_cost_annual=pre_pension_extra_cost_annual,
+        annual_returns_sequence=np.full(max(0, int(years_in_retirement)), expected_return, dtype=np.float64),
+        inflation_rate=inflation_rate,
+        tax_rate_on_gains=tax_rate_on_gains,
+        annual_mortgage_schedule=annual_mortgage_schedule,
+        pending_installments_end_schedule=pending_installments_end_schedule,
+        property_sale_enabled=property_sale_enabled,
+        property_sale_year=property_sale_year,
+        property_sale_amount=property_sale_amount,
+        annual_extra_withdrawal_schedule=annual_extra_withdrawal_schedule,
+    )
+    return build_decumulation_frame(columns)
 
 
 def build_decumulation_table_two_phase_net_withdrawal(
@@ -345,87 +475,64 @@ def build_decumulation_table_two_phase_net_withdrawal(
     This model is intentionally simple: user defines required net withdrawal from
     portfolio in stage 1 (pre-pension bridge) and stage 2 (post-pension).
     """
-    rows = []
-    portfolio = float(max(0.0, starting_portfolio))
-    inflation_factor = 1.0
-
-    for year in range(1, years_in_retirement + 1):
-        age = fire_age + year - 1
-        is_stage_2 = age >= int(phase2_start_age)
-        tramo = "Post-pensión" if is_stage_2 else "Pre-pensión"
-        if is_stage_2:
-            implied_non_portfolio_income_today = (
-                max(0.0, float(stage2_non_portfolio_income_annual))
-                if float(stage2_non_portfolio_income_annual) > 0.0
-                else max(0.0, float(stage1_net_withdrawal_annual) - float(stage2_net_withdrawal_annual))
-            )
-        else:
-            implied_non_portfolio_income_today = 0.0
-        base_today = (
-            max(0.0, float(stage2_net_withdrawal_annual))
-            if is_stage_2
-            else max(0.0, float(stage1_net_withdrawal_annual))
-        )
-
-        annual_return = (
-            float(annual_returns_sequence[year - 1])
-            if annual_returns_sequence is not None and year - 1 < len(annual_returns_sequence)
-            else float(expected_return or 0.0)
-        )
-
-        annual_mortgage_cost = 0.0
-        if annual_mortgage_schedule and year - 1 < len(annual_mortgage_schedule):
-            annual_mortgage_cost = max(0.0, float(annual_mortgage_schedule[year - 1]))
-        annual_extra_withdrawal = 0.0
-        if annual_extra_withdrawal_schedule and year - 1 < len(annual_extra_withdrawal_schedule):
-            annual_extra_withdrawal = max(0.0, float(annual_extra_withdrawal_schedule[year - 1]))
-        pending_installments_end_year = 0
-        if pending_installments_end_schedule and year - 1 < len(pending_installments_end_schedule):
-            pending_installments_end_year = max(0, int(pending_installments_end_schedule[year - 1]))
-
-        sale_nominal = (
-            max(0.0, float(property_sale_amount)) * inflation_factor
-            if property_sale_enabled and int(property_sale_year) == year
-            else 0.0
-        )
-        capital_inicial = portfolio + sale_nominal
-        retirada_base = base_today * inflation_factor
-        retirada = retirada_base + annual_mortgage_cost + annual_extra_withdrawal
-        growth_gross = capital_inicial * annual_return
-        tax_growth = max(0.0, growth_gross) * max(0.0, tax_rate_on_gains)
-        growth_net = growth_gross - tax_growth
-        capital_final = max(0.0, capital_inicial + growth_net - retirada)
-
-        rows.append(
-            {
-                "Año jubilación": year,
-                "Edad": age,
-                "Tramo": tramo,
-                "Necesidad base cartera (€)": retirada_base,
-                "Ingreso no cartera implícito (€)": implied_non_portfolio_income_today * inflation_factor,
-                "Ingreso pensión pública (€)": 0.0,
-                "Ingreso plan privado (€)": 0.0,
-                "Otras rentas (€)": 0.0,
-                "Ingresos totales (€)": 0.0,
-                "Coste extra pre-pensión (€)": 0.0,
-                "Ajuste venta/alquiler (€)": annual_extra_withdrawal,
-                "Venta inmueble (€)": sale_nominal,
-                "Cuota hipoteca pendiente (€)": annual_mortgage_cost,
-                "Cuotas pendientes fin año": pending_installments_end_year,
-                "Capital inicial (€)": capital_inicial,
-                "Retirada anual (€)": retirada,
-                "Crecimiento neto (€)": growth_net,
-                "Capital final (€)": capital_final,
-                "Capital agotado": capital_final <= 0,
-            }
+    n_years = max(0, int(years_in_retirement))
+    inflation = build_inflation_factors(inflation_rate, n_years)
+    mortgage_col = build_padded_schedule(annual_mortgage_schedule, n_years)
+    extra_withdrawal_col = build_padded_schedule(annual_extra_withdrawal_schedule, n_years)
+    pending_col = build_padded_schedule(pending_installments_end_schedule, n_years, np.int64)
+    sale_col = build_property_sale_column(property_sale_enabled, property_sale_year, property_sale_amount, inflation)
+
+    # Stage amounts are constant in today's euros; resolve them once.
+    stage1_today = max(0.0, float(stage1_net_withdrawal_annual))
+    stage2_today = max(0.0, float(stage2_net_withdrawal_annual))
+    stage2_income_today = (
+        max(0.0, float(stage2_non_portfolio_income_annual))
+        if float(stage2_non_portfolio_income_annual) > 0.0
+        else max(0.0, float(stage1_net_withdrawal_annual) - float(stage2_net_withdrawal_annual))
+    )
+    returns = np.full(n_years, float(expected_return or 0.0), dtype=np.float64)
+    if annual_returns_sequence is not None:
+        path_returns = np.asarray(annual_returns_sequence[:n_years], dtype=np.float64)
+        returns[: len(path_returns)] = path_returns
+
+    years = np.arange(1, n_years + 1, dtype=np.int64)
+    ages = years + (fire_age - 1)
+    stage_2_flags = ages >= int(phase2_start_age)
+    need_base_col = np.where(stage_2_flags, stage2_today, stage1_today) * inflation
+    retirada_col = need_base_col + mortgage_col + extra_withdrawal_col
+
+    capital_inicial_col, growth_net_col, capital_final_col = (
+        path[0]
+        for path in simulate_capital_paths(
+            [starting_portfolio],
+            returns[None, :],
+            retirada_col,
+            sale_col,
+            tax_rate_on_gains,
         )
+    )
 
-        portfolio = capital_final
-        inflation_factor *= (1 + inflation_rate)
-
-    try:
-        import pandas as pd  # type: ignore
-    except ModuleNotFoundError as exc:
-        raise RuntimeError("pandas is required to build decumulation tables.") from exc
-
-    return pd.DataFrame(rows)
+    zeros = np.zeros(n_years, dtype=np.float64)
+    return build_decumulation_frame(
+        {
+            "Año jubilación": years,
+            "Edad": ages,
+            "Tramo": stage_2_flags,
+            "Necesidad base cartera (€)": need_base_col,
+            "Ingreso no cartera implícito (€)": np.where(stage_2_flags, stage2_income_today, 0.0) * inflation,
+            "Ingreso pensión pública (€)": zeros,
+            "Ingreso plan privado (€)": zeros,
+            "Otras rentas (€)": zeros,
+            "Ingresos totales (€)": zeros,
+            "Coste extra pre-pensión (€)": zeros,
+            "Ajuste venta/alquiler (€)": extra_withdrawal_col,
+            "Venta inmueble (€)": sale_col,
+            "Cuota hipoteca pendiente (€)": mortgage_col,
+            "Cuotas pendientes fin año": pending_col,
+            "Capital inicial (€)": capital_inicial_col,
+            "Retirada anual (€)": retirada_col,
+            "Crecimiento neto (€)": growth_net_col,
+            "Capital final (€)": capital_final_col,
+            "Capital agotado": capital_final_col <= 0,
+        }
+    )
@@ -8,13 +8,20 @@ Supports:
 
 from __future__ import annotations
 
+import threading
+from collections import OrderedDict
+from functools import lru_cache
 from pathlib import Path
-from typing import Dict, Optional, Tuple
+from typing import Callable, Dict, Optional, Tuple
 
 import numpy as np
 import pandas as pd
 
-from src.tax_engine import calculate_savings_tax, calculate_wealth_taxes
+from src.tax_engine import (
+    compile_accumulation_tax_rules,
+    savings_tax_from_rules,
+    wealth_tax_total_from_rules,
+)
 
 
 MARKET_DATA_PATH = Path(__file__).resolve().parent.parent / "data" / "market_data" / "strategy_returns_1871.csv"
@@ -30,6 +37,12 @@ STRATEGY_COLUMN_MAP = {
     "conservative_40_60_synthetic": "conservative_40_60_synthetic",
 }
 
+# Percentile bands reported per year as `percentile_<q>` / `real_percentile_<q>`.
+PERCENTILE_BANDS = (5, 25, 50, 75, 95)
+
+# Paths drawn per batch when sampling stops adaptively on convergence.
+SAMPLING_BATCH_SIZE = 1_000
+
 
 def load_historical_annual_returns(strategy: str = "sp500_us_total_return") -> np.ndarray:
     """Load bundled historical annual returns as decimal values.
@@ -87,13 +100,91 @@ def load_historical_annual_series(
     return years, returns, months_observed
 
 
-def _simulate_from_return_matrix(
+NORMAL_DRAW_BANK_LIMIT = 8
+_normal_draw_banks: OrderedDict[Tuple[int, int], Tuple[np.random.Generator, np.ndarray]] = OrderedDict()
+_normal_draw_banks_lock = threading.Lock()
+
+
+def _standard_normal_rows(seed: int, years: int, rows: int) -> np.ndarray:
+    """First `rows` rows of the seeded (rows, years) standard-normal stream, read-only.
+
+    One bank per (seed, years) keeps its generator and every row drawn so far.
+    Asking for more rows only draws the missing ones: the generator continues
+    the same stream, so row k is identical whatever the requested size.
+    """
+    key = (seed, years)
+    with _normal_draw_banks_lock:
+        rng, bank = _normal_draw_banks.pop(key, (None, None))
+        if bank is None:
+            rng = np.random.default_rng(seed)
+            bank = np.empty((0, years))
+        if bank.shape[0] < rows:
+            extra = rng.standard_normal(size=(rows - bank.shape[0], years))
+            bank = np.concatenate([bank, extra])
+            bank.setflags(write=False)
+        _normal_draw_banks[key] = (rng, bank)
+        while len(_normal_draw_banks) > NORMAL_DRAW_BANK_LIMIT:
+            _normal_draw_banks.popitem(last=False)
+    return bank[:rows]
+
+
+def _standard_normal_draws(seed: int, num_simulations: int, years: int, antithetic: bool = False) -> np.ndarray:
+    """Read-only seeded standard-normal draws, shared by runs with the same seed and shape.
+
+    `rng.normal(mean, vol)` is exactly `mean + vol * standard_normal`, so every
+    mean/volatility combination can reuse one draw instead of reseeding a generator.
+    With `antithetic`, the second half of the paths mirrors the first (`-z`).
+    """
+    if not antithetic:
+        return _standard_normal_rows(seed, years, num_simulations)
+    half = _standard_normal_rows(seed, years, (num_simulations + 1) // 2)
+    draws = np.concatenate([half, -half])[:num_simulations]
+    draws.setflags(write=False)
+    return draws
+
+
+def normal_return_matrix(
+    mean_return: float,
+    volatility: float,
+    years: int,
+    num_simulations: int = 10_000,
+    seed: int = 42,
+    antithetic: bool = False,
+) -> np.ndarray:
+    """Seeded (num_simulations, years) matrix of normal annual returns (optionally antithetic)."""
+    return mean_return + volatility * _standard_normal_draws(seed, num_simulations, years, antithetic)
+
+
+@lru_cache(maxsize=64)
+def _contribution_schedule(
+    annual_contribution: float,
+    contribution_growth_rate: float,
+    years: int,
+    drop_annual: float,
+    drop_year: int,
+) -> Tuple[float, ...]:
+    """Net contribution for simulation years 1..years, after any post-sale rental drop."""
+    schedule = []
+    for year in range(1, years + 1):
+        amount = annual_contribution * ((1 + contribution_growth_rate) ** (year - 1))
+        if drop_annual > 0 and drop_year > 0 and year >= drop_year:
+            amount -= drop_annual * ((1 + contribution_growth_rate) ** (year - 1))
+        schedule.append(amount)
+    return tuple(schedule)
+
+
+@lru_cache(maxsize=64)
+def _inflation_deflators(inflation_rate: float, years: int) -> np.ndarray:
+    """Read-only cumulative inflation factors (1 + i) ** y for y in 0..years."""
+    factors = np.array([(1 + inflation_rate) ** y for y in range(years + 1)])
+    factors.setflags(write=False)
+    return factors
+
+
+def simulate_nominal_paths(
     initial_wealth: float,
     annual_contribution: float,
     contribution_growth_rate: float,
-    inflation_rate: float,
-    annual_spending: float,
-    safe_withdrawal_rate: float,
     annual_returns_matrix: np.ndarray,
     property_sale_enabled: bool = False,
     property_sale_year: int = 0,
@@ -103,11 +194,8 @@ def _simulate_from_return_matrix(
     rental_drop_annual_amount: float = 0.0,
     tax_pack: Optional[Dict] = None,
     region: Optional[str] = None,
-) -> Dict:
-    """Simulate all paths from a returns matrix with shape (n_sims, years)."""
-    if safe_withdrawal_rate <= 0:
-        raise ValueError("safe_withdrawal_rate must be > 0.")
-
+) -> np.ndarray:
+    """Nominal portfolio paths (n_sims, years + 1); independent of inflation and target."""
     n_sims, years = annual_returns_matrix.shape
     sale_year = int(property_sale_year)
     sale_amount = max(0.0, float(property_sale_amount)) if property_sale_enabled else 0.0
@@ -116,81 +204,228 @@ def _simulate_from_return_matrix(
     annual_paths = np.zeros((n_sims, years + 1))
     annual_paths[:, 0] = initial_wealth
 
-    for sim in range(n_sims):
-        portfolio = initial_wealth
-        for year in range(1, years + 1):
-            annual_return = annual_returns_matrix[sim, year - 1]
-            annual_contribution_year = annual_contribution * ((1 + contribution_growth_rate) ** (year - 1))
-            if drop_annual > 0 and drop_year > 0 and year >= drop_year:
-                annual_contribution_year -= drop_annual * ((1 + contribution_growth_rate) ** (year - 1))
-            gross_growth = portfolio * annual_return
-            portfolio_pre_tax = portfolio + gross_growth + annual_contribution_year
+    tax_rules = compile_accumulation_tax_rules(tax_pack, region) if tax_pack and region else None
+    # Year-major copy so each step reads one contiguous row; the carry and growth
+    # buffers are reused in place instead of allocating fresh (n_sims,) temporaries.
+    returns_by_year = np.ascontiguousarray(annual_returns_matrix.T, dtype=float)
+    portfolio = np.full(n_sims, float(initial_wealth))
+    gross_growth = np.empty(n_sims)
+    contributions = _contribution_schedule(
+        annual_contribution, contribution_growth_rate, years, drop_annual, drop_year
+    )
+    for year, annual_contribution_year in enumerate(contributions, start=1):
+        np.multiply(portfolio, returns_by_year[year - 1], out=gross_growth)
+        portfolio += gross_growth
+        portfolio += annual_contribution_year
+
+        if tax_rules is not None:
+            savings_tax = savings_tax_from_rules(gross_growth, tax_rules)
+            wealth_tax = wealth_tax_total_from_rules(portfolio, tax_rules)
+            portfolio -= savings_tax
+            portfolio -= wealth_tax
 
-            if tax_pack and region:
-                savings_base = max(0.0, gross_growth)
-                savings_tax = calculate_savings_tax(savings_base, tax_pack, region)
-                wealth_taxes = calculate_wealth_taxes(portfolio_pre_tax, tax_pack, region)
-                portfolio = portfolio_pre_tax - savings_tax - wealth_taxes["total_wealth_tax"]
-            else:
-                portfolio = portfolio_pre_tax
+        if sale_amount > 0 and sale_year == year:
+            portfolio += sale_amount
 
-            if sale_amount > 0 and sale_year == year:
-                portfolio += sale_amount
+        # The unclamped balance carries forward; only the reported path is floored at zero.
+        np.maximum(portfolio, 0.0, out=annual_paths[:, year])
 
-            annual_paths[sim, year] = max(0.0, portfolio)
+    return annual_paths
 
-    inflation_factors = np.array([(1 + inflation_rate) ** y for y in range(years + 1)])
-    real_paths = annual_paths / inflation_factors
+
+def summarize_simulation_paths(
+    annual_paths: np.ndarray,
+    annual_returns_matrix: np.ndarray,
+    inflation_rate: float,
+    annual_spending: float,
+    safe_withdrawal_rate: float,
+) -> Dict:
+    """Real paths, percentile bands and success metrics for simulated nominal paths."""
+    if safe_withdrawal_rate <= 0:
+        raise ValueError("safe_withdrawal_rate must be > 0.")
+
+    n_sims, years = annual_returns_matrix.shape
+    real_paths = annual_paths / _inflation_deflators(inflation_rate, years)
 
     fire_target_real = annual_spending / safe_withdrawal_rate if annual_spending > 0 else 0.0
     final_values = annual_paths[:, -1]
     final_values_real = real_paths[:, -1]
     percent_success = (final_values_real >= fire_target_real).sum() / n_sims * 100
 
-    yearly_success = np.array(
-        [(real_paths[:, y] >= fire_target_real).sum() / n_sims * 100 for y in range(years + 1)]
-    )
+    yearly_success = np.count_nonzero(real_paths >= fire_target_real, axis=0) / n_sims * 100
 
     # Path-level geometric annual returns from market return matrix (independent of contributions).
-    safe_returns = np.clip(annual_returns_matrix.astype(float), -0.99, None)
+    log_growth = np.clip(np.asarray(annual_returns_matrix, dtype=float), -0.99, None)
     with np.errstate(invalid="ignore"):
-        path_geom_returns = np.exp(np.mean(np.log1p(safe_returns), axis=1)) - 1.0
+        np.log1p(log_growth, out=log_growth)
+        path_geom_returns = np.exp(np.mean(log_growth, axis=1)) - 1.0
+
+    # One (bands, years + 1) block per series; each band row is a contiguous array.
+    nominal_bands = np.percentile(annual_paths, PERCENTILE_BANDS, axis=0)
+    real_bands = np.percentile(real_paths, PERCENTILE_BANDS, axis=0)
 
     return {
         "paths": annual_paths,
         "real_paths": real_paths,
-        "percentile_5": np.percentile(annual_paths, 5, axis=0),
-        "percentile_25": np.percentile(annual_paths, 25, axis=0),
-        "percentile_50": np.percentile(annual_paths, 50, axis=0),
-        "percentile_75": np.percentile(annual_paths, 75, axis=0),
-        "percentile_95": np.percentile(annual_paths, 95, axis=0),
-        "real_percentile_5": np.percentile(real_paths, 5, axis=0),
-        "real_percentile_25": np.percentile(real_paths, 25, axis=0),
-        "real_percentile_50": np.percentile(real_paths, 50, axis=0),
-        "real_percentile_75": np.percentile(real_paths, 75, axis=0),
-        "real_percentile_95": np.percentile(real_paths, 95, axis=0),
+        **{f"percentile_{q}": band for q, band in zip(PERCENTILE_BANDS, nominal_bands)},
+        **{f"real_percentile_{q}": band for q, band in zip(PERCENTILE_BANDS, real_bands)},
         "success_rate_final": percent_success,
         "yearly_success": yearly_success,
         "final_values": final_values,
         "final_values_real": final_values_real,
         "final_median": np.median(final_values),
         "final_median_real": np.median(final_values_real),
-        "final_percentile_95": np.percentile(final_values, 95),
+        "final_percentile_95": nominal_bands[PERCENTILE_BANDS.index(95), -1],
         "fire_target_real": fire_target_real,
         "fire_target": fire_target_real,
         "n_sims": n_sims,
         "years": years,
         "path_geom_returns": path_geom_returns,
         "path_return_percentiles": {
-            "P5": float(np.percentile(path_geom_returns, 5)),
-            "P25": float(np.percentile(path_geom_returns, 25)),
-            "P50": float(np.percentile(path_geom_returns, 50)),
-            "P75": float(np.percentile(path_geom_returns, 75)),
-            "P95": float(np.percentile(path_geom_returns, 95)),
+            f"P{q}": float(value)
+            for q, value in zip(PERCENTILE_BANDS, np.percentile(path_geom_returns, PERCENTILE_BANDS))
         },
     }
 
 
+def _simulate_from_return_matrix(
+    initial_wealth: float,
+    annual_contribution: float,
+    contribution_growth_rate: float,
+    inflation_rate: float,
+    annual_spending: float,
+    safe_withdrawal_rate: float,
+    annual_returns_matrix: np.ndarray,
+    property_sale_enabled: bool = False,
+    property_sale_year: int = 0,
+    property_sale_amount: float = 0.0,
+    rental_drop_enabled: bool = False,
+    rental_drop_year: int = 0,
+    rental_drop_annual_amount: float = 0.0,
+    tax_pack: Optional[Dict] = None,
+    region: Optional[str] = None,
+) -> Dict:
+    """Simulate all paths from a returns matrix with shape (n_sims, years)."""
+    if safe_withdrawal_rate <= 0:
+        raise ValueError("safe_withdrawal_rate must be > 0.")
+
+    annual_paths = simulate_nominal_paths(
+        initial_wealth=initial_wealth,
+        annual_contribution=annual_contribution,
+        contribution_growth_rate=contribution_growth_rate,
+        annual_returns_matrix=annual_returns_matrix,
+        property_sale_enabled=property_sale_enabled,
+        property_sale_year=property_sale_year,
+        property_sale_amount=property_sale_amount,
+        rental_drop_enabled=rental_drop_enabled,
+        rental_drop_year=rental_drop_year,
+        rental_drop_annual_amount=rental_drop_annual_amount,
+        tax_pack=tax_pack,
+        region=region,
+    )
+    return summarize_simulation_paths(
+        annual_paths=annual_paths,
+        annual_returns_matrix=annual_returns_matrix,
+        inflation_rate=inflation_rate,
+        annual_spending=annual_spending,
+        safe_withdrawal_rate=safe_withdrawal_rate,
+    )
+
+
+def _wilson_half_width(successes: int, n: int, z: float = 1.96) -> float:
+    """Half-width of the Wilson score interval for a success proportion."""
+    p = successes / n
+    z2 = z * z
+    return float(z * np.sqrt(p * (1.0 - p) / n + z2 / (4.0 * n * n)) / (1.0 + z2 / n))
+
+
+def _max_quantile_relative_half_width(values: np.ndarray, quantiles: Tuple[float, ...], z: float = 1.96) -> float:
+    """Largest distribution-free CI half-width among quantiles, relative to each estimate.
+
+    Only the needed order statistics are selected with one `np.partition` call.
+    """
+    n = values.size
+    ranks = []
+    for q in quantiles:
+        spread = z * np.sqrt(n * q * (1.0 - q))
+        ranks.append(
+            (
+                max(0, int(np.floor(n * q - spread))),
+                min(n - 1, int(n * q)),
+                min(n - 1, int(np.ceil(n * q + spread))),
+            )
+        )
+    selected = np.partition(values, sorted({rank for triple in ranks for rank in triple}))
+    return max(
+        float((selected[hi] - selected[lo]) / 2.0 / max(abs(selected[mid]), 1.0))
+        for lo, mid, hi in ranks
+    )
+
+
+def _simulate_sampled_returns(
+    draw_returns: Callable[[int], np.ndarray],
+    num_simulations: int,
+    convergence_tolerance: Optional[float],
+    inflation_rate: float,
+    annual_spending: float,
+    safe_withdrawal_rate: float,
+    **path_kwargs,
+) -> Dict:
+    """Simulate sampled return paths, optionally stopping early once estimates converge.
+
+    Without a tolerance every path is drawn at once. With one, paths are drawn in
+    batches from the same generator, so a run that never converges matches the
+    full draw exactly. Sampling stops when the Wilson half-width of the final
+    success rate is below `convergence_tolerance` percentage points and the
+    confidence half-widths of the final real P5/P50/P95 are below
+    `convergence_tolerance` percent of their estimates. `num_simulations` stays
+    the upper bound.
+    """
+    if convergence_tolerance is None or num_simulations <= SAMPLING_BATCH_SIZE:
+        return _simulate_from_return_matrix(
+            inflation_rate=inflation_rate,
+            annual_spending=annual_spending,
+            safe_withdrawal_rate=safe_withdrawal_rate,
+            annual_returns_matrix=draw_returns(num_simulations),
+            **path_kwargs,
+        )
+    if safe_withdrawal_rate <= 0:
+        raise ValueError("safe_withdrawal_rate must be > 0.")
+
+    fire_target_real = annual_spending / safe_withdrawal_rate if annual_spending > 0 else 0.0
+    returns_batches = []
+    path_batches = []
+    final_real_batches = []
+    successes = 0
+    drawn = 0
+    while drawn < num_simulations:
+        batch_returns = draw_returns(min(SAMPLING_BATCH_SIZE, num_simulations - drawn))
+        batch_paths = simulate_nominal_paths(annual_returns_matrix=batch_returns, **path_kwargs)
+        drawn += batch_returns.shape[0]
+        returns_batches.append(batch_returns)
+        path_batches.append(batch_paths)
+
+        final_real = batch_paths[:, -1] / _inflation_deflators(inflation_rate, batch_returns.shape[1])[-1]
+        final_real_batches.append(final_real)
+        successes += int(np.count_nonzero(final_real >= fire_target_real))
+
+        if _wilson_half_width(successes, drawn) * 100 < convergence_tolerance:
+            band_half_width = _max_quantile_relative_half_width(
+                np.concatenate(final_real_batches), (0.05, 0.5, 0.95)
+            )
+            if band_half_width * 100 < convergence_tolerance:
+                break
+
+    annual_returns = np.concatenate(returns_batches)
+    return summarize_simulation_paths(
+        annual_paths=np.concatenate(path_batches),
+        annual_returns_matrix=annual_returns,
+        inflation_rate=inflation_rate,
+        annual_spending=annual_spending,
+        safe_withdrawal_rate=safe_withdrawal_rate,
+    )
+
+
 def monte_carlo_normal(
     initial_wealth: float,
     monthly_contribution: float,
@@ -211,18 +446,28 @@ def monte_carlo_normal(
     rental_drop_annual_amount: float = 0.0,
     tax_pack: Optional[Dict] = None,
     region: Optional[str] = None,
+    convergence_tolerance: Optional[float] = None,
 ) -> Dict:
     """Monte Carlo simulation with normal annual returns."""
-    rng = np.random.default_rng(seed)
-    annual_returns = rng.normal(mean_return, volatility, size=(num_simulations, years))
-    return _simulate_from_return_matrix(
-        initial_wealth=initial_wealth,
-        annual_contribution=monthly_contribution * 12,
-        contribution_growth_rate=contribution_growth_rate,
+    drawn = 0
+
+    def draw_returns(n: int) -> np.ndarray:
+        nonlocal drawn
+        standard_draws = _standard_normal_rows(seed, years, drawn + n)
+        batch = mean_return + volatility * standard_draws[drawn:]
+        drawn += n
+        return batch
+
+    return _simulate_sampled_returns(
+        draw_returns=draw_returns,
+        num_simulations=num_simulations,
+        convergence_tolerance=convergence_tolerance,
         inflation_rate=inflation_rate,
         annual_spending=annual_spending,
         safe_withdrawal_rate=safe_withdrawal_rate,
-        annual_returns_matrix=annual_returns,
+        initial_wealth=initial_wealth,
+        annual_contribution=monthly_contribution * 12,
+        contribution_growth_rate=contribution_growth_rate,
         property_sale_enabled=property_sale_enabled,
         property_sale_year=property_sale_year,
         property_sale_amount=property_sale_amount,
@@ -253,18 +498,20 @@ def monte_carlo_bootstrap(
     rental_drop_annual_amount: float = 0.0,
     tax_pack: Optional[Dict] = None,
     region: Optional[str] = None,
+    convergence_tolerance: Optional[float] = None,
 ) -> Dict:
     """Monte Carlo simulation by sampling historical annual returns with replacement."""
     rng = np.random.default_rng(seed)
-    sampled = rng.choice(historical_returns, size=(num_simulations, years), replace=True)
-    return _simulate_from_return_matrix(
-        initial_wealth=initial_wealth,
-        annual_contribution=monthly_contribution * 12,
-        contribution_growth_rate=contribution_growth_rate,
+    return _simulate_sampled_returns(
+        draw_returns=lambda n: rng.choice(historical_returns, size=(n, years), replace=True),
+        num_simulations=num_simulations,
+        convergence_tolerance=convergence_tolerance,
         inflation_rate=inflation_rate,
         annual_spending=annual_spending,
         safe_withdrawal_rate=safe_withdrawal_rate,
-        annual_returns_matrix=sampled,
+        initial_wealth=initial_wealth,
+        annual_contribution=monthly_contribution * 12,
+        contribution_growth_rate=contribution_growth_rate,
         property_sale_enabled=property_sale_enabled,
         property_sale_year=property_sale_year,
         property_sale_amount=property_sale_amount,
@@ -302,10 +549,7 @@ def backtest_rolling_windows(
     if historical_returns.size < years + 1:
         raise ValueError("Not enough historical data for the selected horizon.")
 
-    windows = []
-    for start in range(0, historical_returns.size - years + 1):
-        windows.append(historical_returns[start : start + years])
-    return_matrix = np.vstack(windows)
+    return_matrix = np.lib.stride_tricks.sliding_window_view(historical_returns, years)
 
     result = _simulate_from_return_matrix(
         initial_wealth=initial_wealth,
@@ -12,6 +12,8 @@ from pathlib import Path
 from typing import Dict, List, Optional, Tuple, Any
 from datetime import datetime
 
+import numpy as np
+
 
 TAXPACK_DIR = Path(__file__).resolve().parent.parent / "data" / "taxpacks"
 
@@ -114,6 +116,36 @@ def _progressive_tax(base: float, brackets: List[Dict]) -> float:
     return max(0.0, tax)
 
 
+CompiledBrackets = Tuple[Tuple[float, Optional[float], float], ...]
+
+
+def _compile_brackets(brackets: List[Dict]) -> CompiledBrackets:
+    """Flatten [{upTo, rate}] brackets into (lower, upper, rate) float triples."""
+    compiled = []
+    lower = 0.0
+    for bracket in brackets:
+        upper = bracket.get("upTo")
+        rate = max(0.0, float(bracket.get("rate", 0.0)))
+        if upper is None:
+            compiled.append((lower, None, rate))
+            break
+        compiled.append((lower, float(upper), rate))
+        lower = float(upper)
+    return tuple(compiled)
+
+
+def _progressive_tax_array(bases: np.ndarray, brackets: CompiledBrackets) -> np.ndarray:
+    """Vectorized `_progressive_tax` over an array of taxable bases."""
+    taxable = np.maximum(np.asarray(bases, dtype=float), 0.0)
+    tax = np.zeros_like(taxable)
+    for lower, upper, rate in brackets:
+        if upper is None:
+            tax += np.maximum(taxable - lower, 0.0) * rate
+        else:
+            tax += np.maximum(np.minimum(taxable, upper) - lower, 0.0) * rate
+    return np.maximum(tax, 0.0)
+
+
 def _progressive_tax_with_breakdown(base: float, brackets: List[Dict[str, Any]]) -> Dict[str, Any]:
     """Compute progressive tax plus line-by-line bracket trace."""
     taxable = max(0.0, float(base))
@@ -177,6 +209,45 @@ def calculate_savings_tax(savings_base: float, tax_pack: Dict, region: str) -> f
     return _progressive_tax(savings_base, common_brackets)
 
 
+def compile_accumulation_tax_rules(tax_pack: Dict, region: str) -> Dict[str, Any]:
+    """Resolve the savings and wealth rules for a region into flat numeric form.
+
+    Simulations call this once and then evaluate many years and paths without
+    walking the tax pack dicts again.
+    """
+    foral = tax_pack.get("irpf", {}).get("foral", {})
+    savings_brackets = foral.get("savingsBracketsByRegion", {}).get(region)
+    if not savings_brackets:
+        savings_brackets = tax_pack.get("irpf", {}).get("savings", {}).get("brackets", [])
+
+    wealth_pack = tax_pack.get("wealth", {})
+    region_rules = wealth_pack.get("regions", {}).get(region)
+    wealth_rules = None
+    if region_rules:
+        bonus = region_rules.get("bonus", {}) or {}
+        ip_keep = None
+        if bonus.get("mode") == "fixedPct":
+            ip_keep = 1.0 - min(1.0, max(0.0, float(bonus.get("pct", 0.0))))
+        isgf = wealth_pack.get("isgf", {})
+        wealth_rules = {
+            "ip_min_exempt": float(region_rules.get("minExempt", 0.0)),
+            "ip_brackets": _compile_brackets(region_rules.get("brackets", [])),
+            "ip_keep": ip_keep,
+            "isgf_threshold": float(isgf.get("threshold", 0.0)),
+            "isgf_min_exempt": float(isgf.get("minExempt", 0.0)),
+            "isgf_brackets": _compile_brackets(isgf.get("brackets", [])),
+        }
+    return {
+        "savings_brackets": _compile_brackets(savings_brackets),
+        "wealth": wealth_rules,
+    }
+
+
+def savings_tax_from_rules(savings_bases: np.ndarray, rules: Dict[str, Any]) -> np.ndarray:
+    """Vectorized savings tax using rules from `compile_accumulation_tax_rules`."""
+    return _progressive_tax_array(savings_bases, rules["savings_brackets"])
+
+
 def calculate_savings_tax_with_details(savings_base: float, tax_pack: Dict, region: str) -> Dict[str, Any]:
     """Annual IRPF savings tax with bracket-level trace."""
     savings_base = max(0.0, savings_base)
@@ -304,6 +375,26 @@ def calculate_wealth_taxes(investable_wealth: float, tax_pack: Dict, region: str
     }
 
 
+def wealth_tax_total_from_rules(investable_wealth: np.ndarray, rules: Dict[str, Any]) -> np.ndarray:
+    """Vectorized total wealth tax using rules from `compile_accumulation_tax_rules`."""
+    wealth = np.maximum(np.asarray(investable_wealth, dtype=float), 0.0)
+    wealth_rules = rules["wealth"]
+    if wealth_rules is None:
+        return np.zeros_like(wealth)
+
+    ip_tax = _progressive_tax_array(wealth - wealth_rules["ip_min_exempt"], wealth_rules["ip_brackets"])
+    if wealth_rules["ip_keep"] is not None:
+        ip_tax = ip_tax * wealth_rules["ip_keep"]
+
+    gross_isgf = np.where(
+        wealth <= wealth_rules["isgf_threshold"],
+        0.0,
+        _progressive_tax_array(wealth - wealth_rules["isgf_min_exempt"], wealth_rules["isgf_brackets"]),
+    )
+    isgf_tax = np.maximum(gross_isgf - ip_tax, 0.0)
+    return np.maximum(ip_tax + isgf_tax, 0.0)
+
+
 def calculate_wealth_taxes_with_details(investable_wealth: float, tax_pack: Dict, region: str) -> Dict[str, Any]:
     """Approximate annual wealth taxes (IP + ISGF) with calculation trace."""
     wealth = max(0.0, investable_wealth)
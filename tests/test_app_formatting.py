@@ -0,0 +1,20 @@
+"""Tests for the Spanish number/currency formatters in app.py."""
+
+import pytest
+
+import app
+
+
+NEGATIVE_ZERO = (-0.0, "-0", "-0", "€-0")
+POSITIVE_ZERO = (0.0, "0", "+0", "€0")
+
+
+@pytest.mark.parametrize("order", [(NEGATIVE_ZERO, POSITIVE_ZERO), (POSITIVE_ZERO, NEGATIVE_ZERO)])
+def test_signed_zero_formatting_does_not_depend_on_call_order(order):
+    app._fmt_num_es_cached.cache_clear()
+    app._fmt_eur_cached.cache_clear()
+
+    for value, plain, signed, eur in order:
+        assert app.fmt_num_es(value) == plain
+        assert app.fmt_num_es(value, signed=True) == signed
+        assert app.fmt_eur(value) == eur
@@ -0,0 +1,320 @@
+"""Golden values for the decumulation builders.
+
+Expected columns were produced by the original row-by-row builders, before
+the array rewrite, so any drift in the shared capital kernel shows up here.
+"""
+
+import numpy as np
+import pytest
+
+import app
+from src.retirement_models import (
+    build_decumulation_table_two_phase_net_withdrawal,
+    build_decumulation_table_two_stage_schedule,
+)
+
+
+RETURN_PATH = np.array([0.05, -0.1, 0.07])
+SCHEDULES = {
+    "annual_mortgage_schedule": [3_000.0, 3_000.0],
+    "pending_installments_end_schedule": [12, 0],
+    "annual_extra_withdrawal_schedule": [0.0, 500.0, 500.0],
+}
+CASES = {
+    "sale_in_horizon": {"starting_portfolio": 200_000.0, "tax_rate_on_gains": 0.19, "sale_year": 2},
+    "sale_outside_horizon": {"starting_portfolio": 200_000.0, "tax_rate_on_gains": 0.19, "sale_year": 5},
+    "negative_tax": {"starting_portfolio": 200_000.0, "tax_rate_on_gains": -0.2, "sale_year": 0},
+    "depleted_portfolio": {"starting_portfolio": 25_000.0, "tax_rate_on_gains": 0.19, "sale_year": 0},
+}
+
+
+def _sale_kwargs(sale_year):
+    return {
+        "property_sale_enabled": sale_year > 0,
+        "property_sale_year": sale_year,
+        "property_sale_amount": 50_000.0,
+    }
+
+
+def _plain(case, years=3):
+    return app.build_decumulation_table(
+        starting_portfolio=case["starting_portfolio"],
+        annual_withdrawal_base=12_000.0,
+        years_in_retirement=years,
+        expected_return=0.05,
+        inflation_rate=0.02,
+        tax_rate_on_gains=case["tax_rate_on_gains"],
+        **SCHEDULES,
+        **_sale_kwargs(case["sale_year"]),
+    )
+
+
+def _plain_return_path(case, years=3):
+    return app.build_decumulation_table_with_return_path(
+        starting_portfolio=case["starting_portfolio"],
+        annual_withdrawal_base=12_000.0,
+        annual_returns_sequence=RETURN_PATH[:years],
+        inflation_rate=0.02,
+        tax_rate_on_gains=case["tax_rate_on_gains"],
+        **SCHEDULES,
+        **_sale_kwargs(case["sale_year"]),
+    )
+
+
+def _pension_schedule_kwargs(case):
+    return {
+        "starting_portfolio": case["starting_portfolio"],
+        "fire_age": 64,
+        "annual_spending_base": 20_000.0,
+        "pension_public_start_age": 65,
+        "pension_public_net_annual": 9_000.0,
+        "plan_private_start_age": 64,
+        "plan_private_duration_years": 2,
+        "plan_private_net_annual": 2_000.0,
+        "other_income_post_pension_annual": 1_000.0,
+        "pre_pension_extra_cost_annual": 1_500.0,
+        "inflation_rate": 0.02,
+        "tax_rate_on_gains": case["tax_rate_on_gains"],
+        **SCHEDULES,
+        **_sale_kwargs(case["sale_year"]),
+    }
+
+
+def _two_stage_schedule_return_path(case, years=3):
+    return app.build_decumulation_table_two_stage_schedule_with_return_path(
+        annual_returns_sequence=RETURN_PATH[:years],
+        **_pension_schedule_kwargs(case),
+    )
+
+
+def _two_stage(case, years=3):
+    return app.build_decumulation_table_two_stage(
+        starting_portfolio=case["starting_portfolio"],
+        annual_withdrawal_stage1=14_000.0,
+        annual_withdrawal_stage2=8_000.0,
+        stage1_years=1,
+        years_in_retirement=years,
+        expected_return=0.05,
+        inflation_rate=0.02,
+        tax_rate_on_gains=case["tax_rate_on_gains"],
+    )
+
+
+def _two_stage_schedule(case, years=3):
+    return build_decumulation_table_two_stage_schedule(
+        years_in_retirement=years,
+        expected_return=0.05,
+        **_pension_schedule_kwargs(case),
+    )
+
+
+def _two_phase_net_withdrawal(case, years=3):
+    return build_decumulation_table_two_phase_net_withdrawal(
+        starting_portfolio=case["starting_portfolio"],
+        fire_age=64,
+        years_in_retirement=years,
+        phase2_start_age=65,
+        stage1_net_withdrawal_annual=14_000.0,
+        stage2_net_withdrawal_annual=8_000.0,
+        inflation_rate=0.02,
+        tax_rate_on_gains=case["tax_rate_on_gains"],
+        annual_returns_sequence=RETURN_PATH,
+        **SCHEDULES,
+        **_sale_kwargs(case["sale_year"]),
+    )
+
+
+BUILDERS = {
+    "build_decumulation_table": _plain,
+    "build_decumulation_table_with_return_path": _plain_return_path,
+    "build_decumulation_table_two_stage_schedule_with_return_path": _two_stage_schedule_return_path,
+    "build_decumulation_table_two_stage": _two_stage,
+    "build_decumulation_table_two_stage_schedule": _two_stage_schedule,
+    "build_decumulation_table_two_phase_net_withdrawal": _two_phase_net_withdrawal,
+}
+
+GOLDEN_CAPITAL_COLUMNS = {
+    ("build_decumulation_table", "sale_in_horizon"): {
+        "Venta inmueble (€)": [0.0, 51000.0, 0.0],
+        "Retirada anual (€)": [15000.0, 15740.0, 12984.8],
+        "Capital inicial (€)": [200000.0, 244100.0, 238246.05],
+        "Crecimiento neto (€)": [8100.0, 9886.05, 9648.965025],
+        "Capital final (€)": [193100.0, 238246.05, 234910.215025],
+    },
+    ("build_decumulation_table", "sale_outside_horizon"): {
+        "Venta inmueble (€)": [0.0, 0.0, 0.0],
+        "Retirada anual (€)": [15000.0, 15740.0, 12984.8],
+        "Capital inicial (€)": [200000.0, 193100.0, 185180.55],
+        "Crecimiento neto (€)": [8100.0, 7820.55, 7499.812275],
+        "Capital final (€)": [193100.0, 185180.55, 179695.562275],
+    },
+    ("build_decumulation_table", "negative_tax"): {
+        "Venta inmueble (€)": [0.0, 0.0, 0.0],
+        "Retirada anual (€)": [15000.0, 15740.0, 12984.8],
+        "Capital inicial (€)": [200000.0, 195000.0, 189010.0],
+        "Crecimiento neto (€)": [10000.0, 9750.0, 9450.5],
+        "Capital final (€)": [195000.0, 189010.0, 185475.7],
+    },
+    ("build_decumulation_table", "depleted_portfolio"): {
+        "Venta inmueble (€)": [0.0, 0.0, 0.0],
+        "Retirada anual (€)": [15000.0, 15740.0, 12984.8],
+        "Capital inicial (€)": [25000.0, 11012.5, 0.0],
+        "Crecimiento neto (€)": [1012.5, 446.00625, 0.0],
+        "Capital final (€)": [11012.5, 0.0, 0.0],
+    },
+    ("build_decumulation_table_with_return_path", "sale_in_horizon"): {
+        "Venta inmueble (€)": [0.0, 51000.0, 0.0],
+        "Retirada anual (€)": [15000.0, 15740.0, 12984.8],
+        "Capital inicial (€)": [200000.0, 244100.0, 203950.0],
+        "Crecimiento neto (€)": [8100.0, -24410.0, 11563.965000000002],
+        "Capital final (€)": [193100.0, 203950.0, 202529.165],
+    },
+    ("build_decumulation_table_with_return_path", "sale_outside_horizon"): {
+        "Venta inmueble (€)": [0.0, 0.0, 0.0],
+        "Retirada anual (€)": [15000.0, 15740.0, 12984.8],
+        "Capital inicial (€)": [200000.0, 193100.0, 158050.0],
+        "Crecimiento neto (€)": [8100.0, -19310.0, 8961.435000000001],
+        "Capital final (€)": [193100.0, 158050.0, 154026.635],
+    },
+    ("build_decumulation_table_with_return_path", "negative_tax"): {
+        "Venta inmueble (€)": [0.0, 0.0, 0.0],
+        "Retirada anual (€)": [15000.0, 15740.0, 12984.8],
+        "Capital inicial (€)": [200000.0, 195000.0, 159760.0],
+        "Crecimiento neto (€)": [10000.0, -19500.0, 11183.2],
+        "Capital final (€)": [195000.0, 159760.0, 157958.40000000002],
+    },
+    ("build_decumulation_table_with_return_path", "depleted_portfolio"): {
+        "Venta inmueble (€)": [0.0, 0.0, 0.0],
+        "Retirada anual (€)": [15000.0, 15740.0, 12984.8],
+        "Capital inicial (€)": [25000.0, 11012.5, 0.0],
+        "Crecimiento neto (€)": [1012.5, -1101.25, 0.0],
+        "Capital final (€)": [11012.5, 0.0, 0.0],
+    },
+    ("build_decumulation_table_two_stage_schedule_with_return_path", "sale_in_horizon"): {
+        "Venta inmueble (€)": [0.0, 51000.0, 0.0],
+        "Retirada anual (€)": [22500.0, 11660.0, 10904.0],
+        "Capital inicial (€)": [200000.0, 236600.0, 201280.0],
+        "Crecimiento neto (€)": [8100.0, -23660.0, 11412.576000000001],
+        "Capital final (€)": [185600.0, 201280.0, 201788.576],
+    },
+    ("build_decumulation_table_two_stage_schedule_with_return_path", "sale_outside_horizon"): {
+        "Venta inmueble (€)": [0.0, 0.0, 0.0],
+        "Retirada anual (€)": [22500.0, 11660.0, 10904.0],
+        "Capital inicial (€)": [200000.0, 185600.0, 155380.0],
+        "Crecimiento neto (€)": [8100.0, -18560.0, 8810.046],
+        "Capital final (€)": [185600.0, 155380.0, 153286.046],
+    },
+    ("build_decumulation_table_two_stage_schedule_with_return_path", "negative_tax"): {
+        "Venta inmueble (€)": [0.0, 0.0, 0.0],
+        "Retirada anual (€)": [22500.0, 11660.0, 10904.0],
+        "Capital inicial (€)": [200000.0, 187500.0, 157090.0],
+        "Crecimiento neto (€)": [10000.0, -18750.0, 10996.300000000001],
+        "Capital final (€)": [187500.0, 157090.0, 157182.3],
+    },
+    ("build_decumulation_table_two_stage_schedule_with_return_path", "depleted_portfolio"): {
+        "Venta inmueble (€)": [0.0, 0.0, 0.0],
+        "Retirada anual (€)": [22500.0, 11660.0, 10904.0],
+        "Capital inicial (€)": [25000.0, 3512.5, 0.0],
+        "Crecimiento neto (€)": [1012.5, -351.25, 0.0],
+        "Capital final (€)": [3512.5, 0.0, 0.0],
+    },
+    ("build_decumulation_table_two_stage", "sale_in_horizon"): {
+        "Retirada anual (€)": [14000.0, 8160.0, 8323.2],
+        "Capital inicial (€)": [200000.0, 194100.0, 193801.05],
+        "Crecimiento neto (€)": [8100.0, 7861.05, 7848.9425249999995],
+        "Capital final (€)": [194100.0, 193801.05, 193326.79252499997],
+    },
+    ("build_decumulation_table_two_stage", "sale_outside_horizon"): {
+        "Retirada anual (€)": [14000.0, 8160.0, 8323.2],
+        "Capital inicial (€)": [200000.0, 194100.0, 193801.05],
+        "Crecimiento neto (€)": [8100.0, 7861.05, 7848.9425249999995],
+        "Capital final (€)": [194100.0, 193801.05, 193326.79252499997],
+    },
+    ("build_decumulation_table_two_stage", "negative_tax"): {
+        "Retirada anual (€)": [14000.0, 8160.0, 8323.2],
+        "Capital inicial (€)": [200000.0, 196000.0, 197640.0],
+        "Crecimiento neto (€)": [10000.0, 9800.0, 9882.0],
+        "Capital final (€)": [196000.0, 197640.0, 199198.8],
+    },
+    ("build_decumulation_table_two_stage", "depleted_portfolio"): {
+        "Retirada anual (€)": [14000.0, 8160.0, 8323.2],
+        "Capital inicial (€)": [25000.0, 12012.5, 4339.00625],
+        "Crecimiento neto (€)": [1012.5, 486.50625, 175.729753125],
+        "Capital final (€)": [12012.5, 4339.00625, 0.0],
+    },
+    ("build_decumulation_table_two_stage_schedule", "sale_in_horizon"): {
+        "Venta inmueble (€)": [0.0, 51000.0, 0.0],
+        "Retirada anual (€)": [22500.0, 11660.0, 10904.0],
+        "Capital inicial (€)": [200000.0, 236600.0, 234522.3],
+        "Crecimiento neto (€)": [8100.0, 9582.3, 9498.15315],
+        "Capital final (€)": [185600.0, 234522.3, 233116.45315],
+    },
+    ("build_decumulation_table_two_stage_schedule", "sale_outside_horizon"): {
+        "Venta inmueble (€)": [0.0, 0.0, 0.0],
+        "Retirada anual (€)": [22500.0, 11660.0, 10904.0],
+        "Capital inicial (€)": [200000.0, 185600.0, 181456.8],
+        "Crecimiento neto (€)": [8100.0, 7516.8, 7349.0004],
+        "Capital final (€)": [185600.0, 181456.8, 177901.80039999998],
+    },
+    ("build_decumulation_table_two_stage_schedule", "negative_tax"): {
+        "Venta inmueble (€)": [0.0, 0.0, 0.0],
+        "Retirada anual (€)": [22500.0, 11660.0, 10904.0],
+        "Capital inicial (€)": [200000.0, 187500.0, 185215.0],
+        "Crecimiento neto (€)": [10000.0, 9375.0, 9260.75],
+        "Capital final (€)": [187500.0, 185215.0, 183571.75],
+    },
+    ("build_decumulation_table_two_stage_schedule", "depleted_portfolio"): {
+        "Venta inmueble (€)": [0.0, 0.0, 0.0],
+        "Retirada anual (€)": [22500.0, 11660.0, 10904.0],
+        "Capital inicial (€)": [25000.0, 3512.5, 0.0],
+        "Crecimiento neto (€)": [1012.5, 142.25625, 0.0],
+        "Capital final (€)": [3512.5, 0.0, 0.0],
+    },
+    ("build_decumulation_table_two_phase_net_withdrawal", "sale_in_horizon"): {
+        "Venta inmueble (€)": [0.0, 51000.0, 0.0],
+        "Retirada anual (€)": [17000.0, 11660.0, 8823.2],
+        "Capital inicial (€)": [200000.0, 242100.0, 206230.0],
+        "Crecimiento neto (€)": [8100.0, -24210.0, 11693.241000000002],
+        "Capital final (€)": [191100.0, 206230.0, 209100.041],
+    },
+    ("build_decumulation_table_two_phase_net_withdrawal", "sale_outside_horizon"): {
+        "Venta inmueble (€)": [0.0, 0.0, 0.0],
+        "Retirada anual (€)": [17000.0, 11660.0, 8823.2],
+        "Capital inicial (€)": [200000.0, 191100.0, 160330.0],
+        "Crecimiento neto (€)": [8100.0, -19110.0, 9090.711],
+        "Capital final (€)": [191100.0, 160330.0, 160597.511],
+    },
+    ("build_decumulation_table_two_phase_net_withdrawal", "negative_tax"): {
+        "Venta inmueble (€)": [0.0, 0.0, 0.0],
+        "Retirada anual (€)": [17000.0, 11660.0, 8823.2],
+        "Capital inicial (€)": [200000.0, 193000.0, 162040.0],
+        "Crecimiento neto (€)": [10000.0, -19300.0, 11342.800000000001],
+        "Capital final (€)": [193000.0, 162040.0, 164559.59999999998],
+    },
+    ("build_decumulation_table_two_phase_net_withdrawal", "depleted_portfolio"): {
+        "Venta inmueble (€)": [0.0, 0.0, 0.0],
+        "Retirada anual (€)": [17000.0, 11660.0, 8823.2],
+        "Capital inicial (€)": [25000.0, 9012.5, 0.0],
+        "Crecimiento neto (€)": [1012.5, -901.25, 0.0],
+        "Capital final (€)": [9012.5, 0.0, 0.0],
+    },
+}
+
+
+@pytest.mark.parametrize("builder_name,case_name", sorted(GOLDEN_CAPITAL_COLUMNS))
+def test_decumulation_builder_matches_golden_values(builder_name, case_name):
+    table = BUILDERS[builder_name](CASES[case_name])
+    expected = GOLDEN_CAPITAL_COLUMNS[(builder_name, case_name)]
+
+    for column, values in expected.items():
+        assert table[column].tolist() == pytest.approx(values, rel=1e-12, abs=1e-9), column
+    assert table["Capital agotado"].tolist() == [value <= 0 for value in expected["Capital final (€)"]]
+    if "Tramo" in table:
+        assert table["Tramo"].astype(str).tolist() == ["Pre-pensión", "Post-pensión", "Post-pensión"]
+
+
+@pytest.mark.parametrize("builder_name", sorted(BUILDERS))
+def test_decumulation_builder_without_years_returns_columnless_frame(builder_name):
+    table = BUILDERS[builder_name](CASES["sale_in_horizon"], years=0)
+
+    assert table.shape == (0, 0)
@@ -8,6 +8,9 @@ from src.simulation_models import (
     backtest_rolling_windows,
     load_historical_annual_returns,
     load_historical_annual_series,
+    normal_return_matrix,
+    simulate_nominal_paths,
+    summarize_simulation_paths,
 )
 
 
@@ -309,3 +312,75 @@ def test_sensitivity_matrix_monotonic_dominance_invariants():
     contradiction_ratio = contradictions / total_pairs
     # Monte Carlo noise can introduce tiny irregularities, but should be very rare.
     assert contradiction_ratio <= 0.005
+
+
+def test_nominal_paths_are_shared_across_inflation_scenarios():
+    returns = normal_return_matrix(0.06, 0.15, years=15, num_simulations=400, seed=7)
+    paths = simulate_nominal_paths(
+        initial_wealth=150_000,
+        annual_contribution=12_000,
+        contribution_growth_rate=0.01,
+        annual_returns_matrix=returns,
+    )
+    for inflation in (0.0, 0.02, 0.04):
+        summary = summarize_simulation_paths(
+            annual_paths=paths,
+            annual_returns_matrix=returns,
+            inflation_rate=inflation,
+            annual_spending=30_000,
+            safe_withdrawal_rate=0.04,
+        )
+        full = monte_carlo_normal(
+            initial_wealth=150_000,
+            monthly_contribution=1_000,
+            years=15,
+            mean_return=0.06,
+            volatility=0.15,
+            inflation_rate=inflation,
+            annual_spending=30_000,
+            safe_withdrawal_rate=0.04,
+            contribution_growth_rate=0.01,
+            num_simulations=400,
+            seed=7,
+        )
+        assert np.array_equal(summary["real_percentile_50"], full["real_percentile_50"])
+        assert np.array_equal(summary["yearly_success"], full["yearly_success"])
+
+
+def test_adaptive_sampling_matches_full_run_or_stops_on_batch_boundary():
+    kwargs = dict(
+        initial_wealth=300_000,
+        monthly_contribution=2_000,
+        years=20,
+        mean_return=0.06,
+        volatility=0.05,
+        inflation_rate=0.02,
+        annual_spending=30_000,
+        safe_withdrawal_rate=0.04,
+        num_simulations=5_000,
+        seed=11,
+    )
+    full = monte_carlo_normal(**kwargs)
+    never_converges = monte_carlo_normal(convergence_tolerance=0.0, **kwargs)
+    assert never_converges["n_sims"] == 5_000
+    assert np.array_equal(never_converges["percentile_50"], full["percentile_50"])
+
+    early = monte_carlo_normal(convergence_tolerance=5.0, **kwargs)
+    assert early["n_sims"] < 5_000
+    assert early["n_sims"] % 1_000 == 0
+    assert np.array_equal(early["paths"], full["paths"][: early["n_sims"]])
+
+
+def test_antithetic_return_matrix_mirrors_draws_around_the_mean():
+    returns = normal_return_matrix(0.05, 0.2, years=10, num_simulations=600, seed=3, antithetic=True)
+    assert returns.shape == (600, 10)
+    assert np.allclose(returns[:300] + returns[300:], 0.1)
+    assert np.allclose(returns.mean(axis=0), 0.05)
+
+
+def test_growing_num_simulations_extends_the_same_draw_stream():
+    small = normal_return_matrix(0.05, 0.2, years=12, num_simulations=300, seed=11)
+    large = normal_return_matrix(0.05, 0.2, years=12, num_simulations=900, seed=11)
+    fresh = 0.05 + 0.2 * np.random.default_rng(11).standard_normal(size=(900, 12))
+    assert np.array_equal(large, fresh)
+    assert np.array_equal(small, large[:300])
@@ -1,7 +1,11 @@
+import numpy as np
 import pytest
 
 from src.tax_engine import (
     load_tax_pack,
+    compile_accumulation_tax_rules,
+    savings_tax_from_rules,
+    wealth_tax_total_from_rules,
     calculate_general_tax_with_details,
     calculate_savings_tax,
     calculate_savings_tax_with_details,
@@ -93,3 +97,15 @@ def test_savings_tax_marginal_rate_is_28_above_300k():
     tax_300k = calculate_savings_tax(300_000.0, pack, region)
     tax_350k = calculate_savings_tax(350_000.0, pack, region)
     assert (tax_350k - tax_300k) == pytest.approx(50_000.0 * 0.28)
+
+
+@pytest.mark.parametrize("region", ["madrid", "cataluna", "navarra", "pais-vasco-bizkaia"])
+def test_compiled_tax_rules_match_scalar_versions(region):
+    pack = load_tax_pack(2026, "es")
+    rules = compile_accumulation_tax_rules(pack, region)
+    bases = np.array([-5_000.0, 0.0, 6_000.0, 50_000.0, 250_000.0, 700_000.0, 1_500_000.0, 3_200_000.0, 12_000_000.0])
+    savings = savings_tax_from_rules(bases, rules)
+    wealth = wealth_tax_total_from_rules(bases, rules)
+    for idx, base in enumerate(bases):
+        assert savings[idx] == calculate_savings_tax(base, pack, region)
+        assert wealth[idx] == calculate_wealth_taxes(base, pack, region)["total_wealth_tax"]